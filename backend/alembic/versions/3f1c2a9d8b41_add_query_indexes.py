@@ -0,0 +1,55 @@
+"""add composite and partial indexes for list and access-check queries
+
+Tables are created by init_db.py; this revision only adds indexes, built with
+CREATE INDEX CONCURRENTLY so writes are not blocked on a live database.
+
+Revision ID: 3f1c2a9d8b41
+Revises: 
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d8b41'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns); all partial on is_active
+INDEXES = [
+    ("ix_accounts_family_active", "accounts", ["family_id"]),
+    ("ix_family_members_user_family_active", "family_members", ["user_id", "family_id"]),
+    ("ix_family_members_family_active", "family_members", ["family_id"]),
+    ("ix_transactions_account_date_id", "transactions", ["account_id", "transaction_date", "id"]),
+    ("ix_transactions_date_id", "transactions", ["transaction_date", "id"]),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text("is_active"),
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
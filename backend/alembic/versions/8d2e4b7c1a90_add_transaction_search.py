@@ -0,0 +1,85 @@
+"""add full-text and trigram search over transaction descriptions and merchants
+
+Adds transactions.search_vector (nullable, so no table rewrite), the trigger that
+keeps it current, a batched backfill, and GIN indexes built concurrently.
+
+Revision ID: 8d2e4b7c1a90
+Revises: 3f1c2a9d8b41
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b7c1a90'
+down_revision: Union[str, None] = '3f1c2a9d8b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 50000
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({row}merchant_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("ALTER TABLE transactions ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION transactions_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR.format(row='NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS transactions_search_vector_trigger ON transactions")
+    op.execute("""
+        CREATE TRIGGER transactions_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF description, merchant_name ON transactions
+            FOR EACH ROW EXECUTE FUNCTION transactions_search_vector_update()
+    """)
+
+    with op.get_context().autocommit_block():
+        # Backfill existing rows in id ranges, one short transaction each
+        bind = op.get_bind()
+        max_id = bind.execute(sa.text("SELECT coalesce(max(id), 0) FROM transactions")).scalar()
+        for start in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            bind.execute(
+                sa.text(f"""
+                    UPDATE transactions SET search_vector = {SEARCH_VECTOR.format(row='')}
+                    WHERE id >= :start AND id < :end AND search_vector IS NULL
+                """),
+                {"start": start, "end": start + BACKFILL_BATCH_SIZE}
+            )
+
+        op.create_index(
+            "ix_transactions_search_vector", "transactions", ["search_vector"],
+            postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_transactions_merchant_trgm", "transactions", ["merchant_name"],
+            postgresql_using="gin", postgresql_ops={"merchant_name": "gin_trgm_ops"},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_transactions_description_trgm", "transactions", ["description"],
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in ("ix_transactions_description_trgm", "ix_transactions_merchant_trgm", "ix_transactions_search_vector"):
+            op.drop_index(name, table_name="transactions", postgresql_concurrently=True, if_exists=True)
+
+    op.execute("DROP TRIGGER IF EXISTS transactions_search_vector_trigger ON transactions")
+    op.execute("DROP FUNCTION IF EXISTS transactions_search_vector_update()")
+    op.execute("ALTER TABLE transactions DROP COLUMN IF EXISTS search_vector")
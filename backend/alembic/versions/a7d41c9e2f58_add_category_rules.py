@@ -0,0 +1,47 @@
+"""add category_rules for per-family auto-categorization
+
+The table may already exist (empty) if init_db.py ran before this migration.
+
+Revision ID: a7d41c9e2f58
+Revises: f2c9a4d7e813
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d41c9e2f58'
+down_revision: Union[str, None] = 'f2c9a4d7e813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Reuse the enum type created with the transactions table
+    category = postgresql.ENUM(name="transactioncategory", create_type=False)
+
+    op.create_table(
+        "category_rules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("family_id", sa.Integer(), nullable=False),
+        sa.Column("keyword", sa.String(length=100), nullable=False),
+        sa.Column("category", category, nullable=False),
+        sa.Column("created_by", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["family_id"], ["families.id"]),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("family_id", "keyword", name="uq_category_rules_family_keyword"),
+        if_not_exists=True
+    )
+    op.create_index("ix_category_rules_id", "category_rules", ["id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_category_rules_id", table_name="category_rules")
+    op.drop_table("category_rules")
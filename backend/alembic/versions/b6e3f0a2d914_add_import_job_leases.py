@@ -0,0 +1,36 @@
+"""add worker_id / heartbeat_at leases to import_jobs
+
+import_jobs is created by init_db.py, so it may not exist yet; create_all adds
+it with these columns in that case.
+
+Revision ID: b6e3f0a2d914
+Revises: a7d41c9e2f58
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e3f0a2d914'
+down_revision: Union[str, None] = 'a7d41c9e2f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("import_jobs"):
+        return
+
+    op.execute("ALTER TABLE import_jobs ADD COLUMN IF NOT EXISTS worker_id VARCHAR(255)")
+    op.execute("ALTER TABLE import_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP WITHOUT TIME ZONE")
+    op.create_index("ix_import_jobs_status_heartbeat", "import_jobs", ["status", "heartbeat_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_jobs_status_heartbeat", table_name="import_jobs")
+    op.drop_column("import_jobs", "heartbeat_at")
+    op.drop_column("import_jobs", "worker_id")
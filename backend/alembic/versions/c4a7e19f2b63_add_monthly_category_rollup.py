@@ -0,0 +1,64 @@
+"""add monthly_category_rollup for grouped spend summaries
+
+Creates the rollup table and fills it from the existing active transactions.
+The table may already exist (empty) if init_db.py ran before this migration.
+
+Revision ID: c4a7e19f2b63
+Revises: 8d2e4b7c1a90
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e19f2b63'
+down_revision: Union[str, None] = '8d2e4b7c1a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Reuse the enum types created with the transactions table
+    category = postgresql.ENUM(name="transactioncategory", create_type=False)
+    transaction_type = postgresql.ENUM(name="transactiontype", create_type=False)
+
+    op.create_table(
+        "monthly_category_rollup",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("category", category, nullable=False),
+        sa.Column("transaction_type", transaction_type, nullable=False),
+        sa.Column("total", sa.Numeric(15, 2), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("account_id", "month", "category", "transaction_type", name="uq_monthly_category_rollup_key"),
+        if_not_exists=True
+    )
+    op.create_index("ix_monthly_category_rollup_id", "monthly_category_rollup", ["id"], if_not_exists=True)
+
+    op.execute("""
+        INSERT INTO monthly_category_rollup (account_id, month, category, transaction_type, total, count)
+        SELECT
+            account_id,
+            date_trunc('month', transaction_date)::date,
+            coalesce(category, 'OTHER'),
+            transaction_type,
+            sum(amount),
+            count(*)
+        FROM transactions
+        WHERE is_active
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (account_id, month, category, transaction_type) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_monthly_category_rollup_id", table_name="monthly_category_rollup")
+    op.drop_table("monthly_category_rollup")
@@ -0,0 +1,57 @@
+"""make net_worth_history rows unique per family / member and day
+
+Removes duplicates left by overlapping snapshot runs (keeping the newest) and
+replaces the series index with two partial unique indexes, one for family
+totals (user_id NULL) and one for members. net_worth_history is created by
+init_db.py, so it may not exist yet; create_all adds it with these indexes then.
+
+Revision ID: d8a5c2f7e360
+Revises: b6e3f0a2d914
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a5c2f7e360'
+down_revision: Union[str, None] = 'b6e3f0a2d914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("net_worth_history"):
+        return
+
+    op.execute("""
+        DELETE FROM net_worth_history older
+        USING net_worth_history newer
+        WHERE older.family_id = newer.family_id
+          AND older.user_id IS NOT DISTINCT FROM newer.user_id
+          AND older.snapshot_date = newer.snapshot_date
+          AND older.id < newer.id
+    """)
+
+    op.create_index(
+        "uq_net_worth_history_member", "net_worth_history", ["family_id", "user_id", "snapshot_date"],
+        unique=True,
+        postgresql_where=sa.text("user_id IS NOT NULL"),
+        if_not_exists=True
+    )
+    op.create_index(
+        "uq_net_worth_history_family", "net_worth_history", ["family_id", "snapshot_date"],
+        unique=True,
+        postgresql_where=sa.text("user_id IS NULL"),
+        if_not_exists=True
+    )
+    op.drop_index("ix_net_worth_history_series", table_name="net_worth_history", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_net_worth_history_series", "net_worth_history", ["family_id", "user_id", "snapshot_date"])
+    op.drop_index("uq_net_worth_history_family", table_name="net_worth_history")
+    op.drop_index("uq_net_worth_history_member", table_name="net_worth_history")
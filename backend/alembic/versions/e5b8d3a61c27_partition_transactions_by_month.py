@@ -0,0 +1,156 @@
+"""partition transactions by month on transaction_date
+
+Rebuilds transactions as a RANGE-partitioned table with one partition per month
+(plus a default partition as a safety net) and copies the existing rows across.
+Runs in a single transaction, so writes to transactions wait until it commits;
+run it during a deploy window.
+
+transaction_id uniqueness moves to transaction_keys, since a unique index on a
+partitioned table must include the partition key. transaction_keys may already
+exist (empty) if init_db.py ran before this migration.
+
+Revision ID: e5b8d3a61c27
+Revises: c4a7e19f2b63
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8d3a61c27'
+down_revision: Union[str, None] = 'c4a7e19f2b63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITION_MONTHS_AHEAD = 3
+
+PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_transactions_partition(month date) RETURNS void AS $$
+DECLARE
+    start_date date := date_trunc('month', month)::date;
+    end_date date := (date_trunc('month', month) + interval '1 month')::date;
+    partition_name text := 'transactions_' || to_char(start_date, 'YYYY_MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+
+    -- One creator at a time; re-check once the lock is held
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_transactions_partition'));
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE transactions INCLUDING DEFAULTS)', partition_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM transactions_default WHERE transaction_date >= %L AND transaction_date < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        start_date, end_date, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE transactions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, start_date, end_date
+    );
+END
+$$ LANGUAGE plpgsql
+"""
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER transactions_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF description, merchant_name ON transactions
+    FOR EACH ROW EXECUTE FUNCTION transactions_search_vector_update()
+"""
+
+
+def create_indexes(unique_transaction_id: bool) -> None:
+    """Indexes transactions has in both layouts, built after the rows are copied"""
+    op.create_index("ix_transactions_id", "transactions", ["id"])
+    op.create_index("ix_transactions_transaction_id", "transactions", ["transaction_id"], unique=unique_transaction_id)
+    op.create_index("ix_transactions_transaction_date", "transactions", ["transaction_date"])
+    op.create_index(
+        "ix_transactions_account_date_id", "transactions", ["account_id", "transaction_date", "id"],
+        postgresql_where=sa.text("is_active")
+    )
+    op.create_index(
+        "ix_transactions_date_id", "transactions", ["transaction_date", "id"],
+        postgresql_where=sa.text("is_active")
+    )
+    op.create_index("ix_transactions_search_vector", "transactions", ["search_vector"], postgresql_using="gin")
+    op.create_index(
+        "ix_transactions_merchant_trgm", "transactions", ["merchant_name"],
+        postgresql_using="gin", postgresql_ops={"merchant_name": "gin_trgm_ops"}
+    )
+    op.create_index(
+        "ix_transactions_description_trgm", "transactions", ["description"],
+        postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transaction_keys",
+        sa.Column("transaction_id", sa.String(length=255), nullable=False),
+        sa.Column("transaction_date", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("transaction_id"),
+        if_not_exists=True
+    )
+    op.execute("""
+        INSERT INTO transaction_keys (transaction_id, transaction_date)
+        SELECT transaction_id, transaction_date FROM transactions
+        ON CONFLICT (transaction_id) DO NOTHING
+    """)
+
+    # Swap in an empty partitioned table with the same columns and defaults
+    op.execute("ALTER TABLE transactions RENAME TO transactions_unpartitioned")
+    op.execute("ALTER INDEX transactions_pkey RENAME TO transactions_unpartitioned_pkey")
+    op.execute("""
+        CREATE TABLE transactions (LIKE transactions_unpartitioned INCLUDING DEFAULTS)
+        PARTITION BY RANGE (transaction_date)
+    """)
+    op.execute("ALTER TABLE transactions ADD CONSTRAINT transactions_pkey PRIMARY KEY (id, transaction_date)")
+    op.execute("""
+        ALTER TABLE transactions ADD CONSTRAINT transactions_account_id_fkey
+        FOREIGN KEY (account_id) REFERENCES accounts (id)
+    """)
+
+    op.execute(PARTITION_FUNCTION)
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+    op.execute(f"""
+        SELECT ensure_transactions_partition(month::date)
+        FROM generate_series(
+            date_trunc('month', (SELECT coalesce(min(transaction_date), now()) FROM transactions_unpartitioned)),
+            date_trunc('month', now()) + interval '{PARTITION_MONTHS_AHEAD} months',
+            interval '1 month'
+        ) AS month
+    """)
+
+    op.execute("INSERT INTO transactions SELECT * FROM transactions_unpartitioned")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    op.execute("DROP TABLE transactions_unpartitioned")
+
+    create_indexes(unique_transaction_id=False)
+    op.execute(SEARCH_VECTOR_TRIGGER)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE transactions RENAME TO transactions_partitioned")
+    op.execute("ALTER INDEX transactions_pkey RENAME TO transactions_partitioned_pkey")
+    op.execute("CREATE TABLE transactions (LIKE transactions_partitioned INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO transactions SELECT * FROM transactions_partitioned")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    op.execute("DROP TABLE transactions_partitioned CASCADE")
+
+    op.execute("ALTER TABLE transactions ADD CONSTRAINT transactions_pkey PRIMARY KEY (id)")
+    op.execute("""
+        ALTER TABLE transactions ADD CONSTRAINT transactions_account_id_fkey
+        FOREIGN KEY (account_id) REFERENCES accounts (id)
+    """)
+    create_indexes(unique_transaction_id=True)
+    op.execute(SEARCH_VECTOR_TRIGGER)
+
+    op.execute("DROP FUNCTION IF EXISTS ensure_transactions_partition(date)")
+    op.drop_table("transaction_keys")
@@ -0,0 +1,71 @@
+"""add transactions.family_id for family-scoped queries without an account join
+
+Adds the column, backfills it from accounts in id-range batches, then builds the
+(family_id, transaction_date, id) index one partition at a time.
+
+Revision ID: f2c9a4d7e813
+Revises: e5b8d3a61c27
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c9a4d7e813'
+down_revision: Union[str, None] = 'e5b8d3a61c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 50000
+
+INDEX_NAME = "ix_transactions_family_date_id"
+INDEX_COLUMNS = "(family_id, transaction_date, id) WHERE is_active"
+
+
+def upgrade() -> None:
+    op.add_column("transactions", sa.Column("family_id", sa.Integer(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        max_id = bind.execute(sa.text("SELECT coalesce(max(id), 0) FROM transactions")).scalar()
+        for start in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            bind.execute(
+                sa.text("""
+                    UPDATE transactions SET family_id = accounts.family_id
+                    FROM accounts
+                    WHERE accounts.id = transactions.account_id
+                      AND transactions.family_id IS NULL
+                      AND transactions.id >= :start AND transactions.id < :end
+                """),
+                {"start": start, "end": start + BACKFILL_BATCH_SIZE}
+            )
+
+        # A partitioned index can't be built CONCURRENTLY; create it on the parent
+        # only, build each partition's index concurrently and attach it
+        op.execute(f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON ONLY transactions {INDEX_COLUMNS}")
+        partitions = bind.execute(sa.text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = 'transactions'::regclass
+            ORDER BY child.relname
+        """)).scalars().all()
+        for partition in partitions:
+            partition_index = f"{partition}_family_date_id_idx"
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} {INDEX_COLUMNS}")
+            op.execute(f"ALTER INDEX {INDEX_NAME} ATTACH PARTITION {partition_index}")
+
+    op.alter_column("transactions", "family_id", nullable=False)
+    op.create_foreign_key(
+        "transactions_family_id_fkey", "transactions", "families", ["family_id"], ["id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("transactions_family_id_fkey", "transactions", type_="foreignkey")
+    op.drop_index(INDEX_NAME, table_name="transactions")
+    op.drop_column("transactions", "family_id")
@@ -4,7 +4,7 @@ API v1 router
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, users, families, accounts, transactions, dashboard, exports, messages
+from app.api.v1.endpoints import auth, users, families, accounts, transactions, dashboard, exports, messages, alerts, imports
 
 api_router = APIRouter()
 
@@ -14,6 +14,7 @@ api_router.include_router(families.router, prefix="/families", tags=["families"]
 api_router.include_router(accounts.router, prefix="/accounts", tags=["accounts"])
 api_router.include_router(transactions.router, prefix="/transactions", tags=["transactions"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(alerts.router, prefix="/alerts", tags=["alerts"])
 api_router.include_router(exports.router, prefix="/exports", tags=["exports"])
 api_router.include_router(messages.router, prefix="/messages", tags=["messages"])
-
+api_router.include_router(imports.router, prefix="/imports", tags=["imports"])
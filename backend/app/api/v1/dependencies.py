@@ -2,7 +2,8 @@
 API dependencies
 """
 
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, status, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
@@ -11,6 +12,7 @@ from app.core.security import verify_token
 from app.models.user import User
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 def get_current_user(
@@ -18,7 +20,30 @@ def get_current_user(
     db: Session = Depends(get_db)
 ) -> User:
     """Get current authenticated user"""
-    token = credentials.credentials
+    return _get_user_for_token(credentials.credentials, db)
+
+
+def get_current_user_for_stream(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    token: Optional[str] = Query(None, description="Access token, for EventSource clients that cannot set headers"),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get current authenticated user from the Authorization header or a `token` query parameter"""
+    if credentials:
+        token = credentials.credentials
+    
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return _get_user_for_token(token, db)
+
+
+def _get_user_for_token(token: str, db: Session) -> User:
+    """Resolve an access token to an active user"""
     payload = verify_token(token, token_type="access")
     
     if not payload:
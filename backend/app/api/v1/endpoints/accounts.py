@@ -4,17 +4,20 @@ Account management endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-import csv
-import io
 
 from app.core.database import get_db
+from app.core.cache import cache
 from app.api.v1.dependencies import get_current_user
 from app.schemas.account import AccountCreate, AccountUpdate, AccountResponse
 from app.models.user import User
-from app.models.account import Account, AccountStatus, AccountProvider, AccountType
+from app.models.account import Account, AccountStatus
 from app.models.family import FamilyMember, FamilyRole
+from app.services.net_worth import NetWorthService
+from app.services.account_events import AccountEventService
+from app.services.dashboard_events import DashboardEventService
+from app.services.account_import import AccountImportService
 
 router = APIRouter()
 
@@ -60,8 +63,12 @@ async def create_account(
     )
     
     db.add(account)
+    NetWorthService.record_change(db, None, NetWorthService.snapshot(account))
+    AccountEventService.sync_account(db, account)
     db.commit()
     db.refresh(account)
+    cache.bump_family_version(account.family_id)
+    DashboardEventService.publish_changes(db)
     
     return account
 
@@ -174,11 +181,16 @@ async def update_account(
     # Map metadata to account_metadata
     if 'metadata' in update_data:
         update_data['account_metadata'] = update_data.pop('metadata')
+    before = NetWorthService.snapshot(account)
     for field, value in update_data.items():
         setattr(account, field, value)
+    NetWorthService.record_change(db, before, NetWorthService.snapshot(account))
+    AccountEventService.sync_account(db, account)
     
     db.commit()
     db.refresh(account)
+    cache.bump_family_version(account.family_id)
+    DashboardEventService.publish_changes(db)
     
     return account
 
@@ -213,8 +225,13 @@ async def delete_account(
                 detail="Only account owner or family owner can delete accounts"
             )
     
+    before = NetWorthService.snapshot(account)
     account.is_active = False
+    NetWorthService.record_change(db, before, None)
+    AccountEventService.sync_account(db, account)
     db.commit()
+    cache.bump_family_version(account.family_id)
+    DashboardEventService.publish_changes(db)
     
     return None
 
@@ -249,23 +266,20 @@ async def sync_account(
     
     # TODO: Implement actual sync logic based on provider
     # For now, just update last_synced_at
+    before = NetWorthService.snapshot(account)
     account.last_synced_at = datetime.utcnow()
     account.status = AccountStatus.LINKED
+    NetWorthService.record_change(db, before, NetWorthService.snapshot(account))
     db.commit()
     db.refresh(account)
+    cache.bump_family_version(account.family_id)
+    DashboardEventService.publish_changes(db)
     
     return account
 
 
-@router.post("/import/csv", response_model=List[AccountResponse], status_code=status.HTTP_201_CREATED)
-async def import_accounts_csv(
-    file: UploadFile = File(...),
-    family_id: int = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Import accounts from CSV file"""
-    # Check if user has access to family
+def get_import_family_id(db: Session, current_user: User, family_id: Optional[int]) -> int:
+    """Family an account import goes into; the user must be allowed to create accounts there"""
     if family_id:
         member = db.query(FamilyMember).filter(
             FamilyMember.family_id == family_id,
@@ -284,90 +298,48 @@ async def import_accounts_csv(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to create accounts"
             )
-    else:
-        # Get first family user is member of
-        member = db.query(FamilyMember).filter(
-            FamilyMember.user_id == current_user.id,
-            FamilyMember.is_active == True
-        ).first()
-        
-        if not member:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Please specify a family_id or join a family first"
-            )
         
-        family_id = member.family_id
-    
-    # Read CSV file
-    contents = await file.read()
-    csv_file = io.StringIO(contents.decode('utf-8'))
-    reader = csv.DictReader(csv_file)
-    
-    created_accounts = []
-    errors = []
-    
-    for row_num, row in enumerate(reader, start=2):  # Start at 2 (1 is header)
-        try:
-            # Parse CSV row
-            name = row.get('name', '').strip()
-            account_type_str = row.get('account_type', 'savings').strip().lower()
-            balance_str = row.get('balance', '0').strip()
-            account_number_last_4 = row.get('account_number_last_4', '').strip()
-            
-            if not name:
-                errors.append(f"Row {row_num}: Missing account name")
-                continue
-            
-            # Validate account type
-            try:
-                account_type = AccountType(account_type_str)
-            except ValueError:
-                errors.append(f"Row {row_num}: Invalid account type '{account_type_str}'")
-                continue
-            
-            # Parse balance
-            try:
-                balance = float(balance_str) if balance_str else 0.0
-            except ValueError:
-                errors.append(f"Row {row_num}: Invalid balance '{balance_str}'")
-                continue
-            
-            # Create account
-            account = Account(
-                family_id=family_id,
-                owner_id=current_user.id,
-                name=name,
-                account_type=account_type,
-                provider=AccountProvider.CSV_IMPORT,
-                account_number_last_4=account_number_last_4 if account_number_last_4 else None,
-                current_balance=balance,
-                currency="INR",
-                status=AccountStatus.LINKED
-            )
-            
-            db.add(account)
-            created_accounts.append(account)
-        except Exception as e:
-            errors.append(f"Row {row_num}: {str(e)}")
+        return family_id
+    
+    # Get first family user is member of
+    member = db.query(FamilyMember).filter(
+        FamilyMember.user_id == current_user.id,
+        FamilyMember.is_active == True
+    ).first()
     
-    if errors:
+    if not member:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Please specify a family_id or join a family first"
+        )
+    
+    return member.family_id
+
+
+@router.post("/import/csv", response_model=List[AccountResponse], status_code=status.HTTP_201_CREATED)
+def import_accounts_csv(
+    file: UploadFile = File(...),
+    family_id: int = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Import accounts from CSV file (use POST /imports for large files)"""
+    family_id = get_import_family_id(db, current_user, family_id)
+    
+    result = AccountImportService.import_csv(db, file.file, current_user, family_id)
+    created_accounts = result.accounts
+    for account in created_accounts:
+        db.refresh(account)
+    
+    if result.errors:
         # Still commit successful accounts, but return errors
-        db.commit()
-        for account in created_accounts:
-            db.refresh(account)
         raise HTTPException(
             status_code=status.HTTP_207_MULTI_STATUS,
             detail={
-                "message": f"Imported {len(created_accounts)} accounts with {len(errors)} errors",
-                "errors": errors,
+                "message": f"Imported {len(created_accounts)} accounts with {len(result.errors)} errors",
+                "errors": result.errors,
                 "accounts": [AccountResponse.from_orm(acc).dict() for acc in created_accounts]
             }
         )
     
-    db.commit()
-    for account in created_accounts:
-        db.refresh(account)
-    
     return created_accounts
-
@@ -0,0 +1,54 @@
+"""
+Alert endpoints
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List
+
+from app.core.database import get_db
+from app.api.v1.dependencies import get_current_user
+from app.schemas.dashboard import Alert
+from app.models.user import User
+from app.models.family import FamilyMember
+from app.services.account_events import AccountEventService
+
+router = APIRouter()
+
+
+@router.get("", response_model=List[Alert])
+async def get_alerts(
+    family_id: int = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get credit card due and FD maturity alerts, soonest first"""
+    if family_id:
+        member = db.query(FamilyMember).filter(
+            FamilyMember.family_id == family_id,
+            FamilyMember.user_id == current_user.id,
+            FamilyMember.is_active == True
+        ).first()
+        
+        if not member:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have access to this family"
+            )
+        
+        family_ids = [family_id]
+    else:
+        family_ids = db.query(FamilyMember.family_id).filter(
+            FamilyMember.user_id == current_user.id,
+            FamilyMember.is_active == True
+        ).all()
+        family_ids = [f[0] for f in family_ids]
+    
+    if not family_ids:
+        return []
+    
+    rows = AccountEventService.upcoming_query(db, family_ids).offset(offset).limit(limit).all()
+    
+    return [AccountEventService.to_alert(event, account) for event, account in rows]
@@ -2,40 +2,39 @@
 Dashboard endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import List
-from datetime import datetime, timedelta
-from decimal import Decimal
+from typing import List, Optional
+from datetime import timedelta, date
+import asyncio
+import json
 
 from app.core.database import get_db
-from app.api.v1.dependencies import get_current_user
+from app.core.config import settings
+from app.core.cache import cache
+from app.core.events import event_broker
+from app.api.v1.dependencies import get_current_user, get_current_user_for_stream
 from app.schemas.dashboard import (
     DashboardResponse,
     NetWorthResponse,
     AssetAllocationResponse,
-    AssetAllocationItem,
     MemberNetWorth,
     TopMover,
-    Alert
+    Alert,
+    NetWorthHistoryPoint,
+    NetWorthHistoryResponse
 )
 from app.models.user import User
-from app.models.account import Account, AccountType, AccountStatus
 from app.models.family import FamilyMember
-from app.models.transaction import Transaction, TransactionType
+from app.services.dashboard import DashboardService, DASHBOARD_SECTIONS
+from app.services.net_worth_history import NetWorthHistoryService
 
 router = APIRouter()
 
 
-@router.get("", response_model=DashboardResponse)
-async def get_dashboard(
-    family_id: int = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Get dashboard data"""
-    # Get accessible families
+def _get_family_ids(db: Session, current_user: User, family_id: Optional[int]) -> List[int]:
+    """Families the dashboard covers: the requested one, or all the user belongs to"""
     if family_id:
         member = db.query(FamilyMember).filter(
             FamilyMember.family_id == family_id,
@@ -49,199 +48,223 @@ async def get_dashboard(
                 detail="You don't have access to this family"
             )
         
-        family_ids = [family_id]
-    else:
-        # Get all families user is member of
-        members = db.query(FamilyMember).filter(
-            FamilyMember.user_id == current_user.id,
-            FamilyMember.is_active == True
-        ).all()
-        family_ids = [m.family_id for m in members]
+        return [family_id]
+    
+    # Get all families user is member of
+    family_ids = db.query(FamilyMember.family_id).filter(
+        FamilyMember.user_id == current_user.id,
+        FamilyMember.is_active == True
+    ).all()
+    return [f[0] for f in family_ids]
+
+
+def _parse_sections(sections: Optional[str]) -> List[str]:
+    """Parse a comma-separated sections parameter; all sections when omitted"""
+    if not sections:
+        return list(DASHBOARD_SECTIONS)
+    
+    requested = [s.strip() for s in sections.split(',') if s.strip()]
+    unknown = [s for s in requested if s not in DASHBOARD_SECTIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown dashboard sections: {', '.join(unknown)}. Valid sections: {', '.join(DASHBOARD_SECTIONS)}"
+        )
+    
+    return [s for s in DASHBOARD_SECTIONS if s in requested]
+
+
+def _build_dashboard(
+    db: Session,
+    current_user: User,
+    family_id: Optional[int],
+    sections: List[str]
+) -> DashboardResponse:
+    """Build (or fetch from cache) the requested dashboard sections"""
+    family_ids = _get_family_ids(db, current_user, family_id)
     
     if not family_ids:
         # Return empty dashboard
-        return DashboardResponse(
-            net_worth=NetWorthResponse(
-                total_net_worth=Decimal("0"),
-                total_assets=Decimal("0"),
-                total_liabilities=Decimal("0"),
-                last_updated=datetime.utcnow()
-            ),
-            asset_allocation=AssetAllocationResponse(allocation=[]),
-            member_net_worth=[],
-            top_movers=[],
-            alerts=[],
-            last_synced=None
+        return DashboardService.build(db, [], sections)
+    
+    cache_key = DashboardService.cache_key(current_user.id, family_ids, sections)
+    cached = cache.get(cache_key)
+    if cached:
+        return DashboardResponse.model_validate_json(cached)
+    
+    response = DashboardService.build(db, family_ids, sections)
+    
+    cache.set(cache_key, response.model_dump_json(), settings.DASHBOARD_CACHE_TTL_SECONDS)
+    
+    return response
+
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    family_id: int = None,
+    sections: Optional[str] = Query(
+        None,
+        description="Comma-separated subset of: net_worth, allocation, members, movers, alerts"
+    ),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get dashboard data, computing only the requested sections"""
+    return _build_dashboard(db, current_user, family_id, _parse_sections(sections))
+
+
+@router.get("/net-worth", response_model=NetWorthResponse)
+async def get_dashboard_net_worth(
+    family_id: int = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the net worth section"""
+    return _build_dashboard(db, current_user, family_id, ["net_worth"]).net_worth
+
+
+@router.get("/allocation", response_model=AssetAllocationResponse)
+async def get_dashboard_allocation(
+    family_id: int = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the asset allocation section"""
+    return _build_dashboard(db, current_user, family_id, ["allocation"]).asset_allocation
+
+
+@router.get("/members", response_model=List[MemberNetWorth])
+async def get_dashboard_members(
+    family_id: int = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the per-member net worth section"""
+    return _build_dashboard(db, current_user, family_id, ["members"]).member_net_worth
+
+
+@router.get("/movers", response_model=List[TopMover])
+async def get_dashboard_movers(
+    family_id: int = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the top movers section"""
+    return _build_dashboard(db, current_user, family_id, ["movers"]).top_movers
+
+
+@router.get("/alerts", response_model=List[Alert])
+async def get_dashboard_alerts(
+    family_id: int = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the alerts section"""
+    return _build_dashboard(db, current_user, family_id, ["alerts"]).alerts
+
+
+@router.get("/history", response_model=NetWorthHistoryResponse)
+async def get_net_worth_history(
+    family_id: int,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    points: int = Query(365, ge=3, le=2000),
+    user_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get daily net worth history for a family (or one member), downsampled to at most `points` points"""
+    member = db.query(FamilyMember).filter(
+        FamilyMember.family_id == family_id,
+        FamilyMember.user_id == current_user.id,
+        FamilyMember.is_active == True
+    ).first()
+    
+    if not member:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this family"
         )
     
-    # Get all accounts (include both LINKED and PENDING - manually created accounts are immediately available)
-    accounts = db.query(Account).filter(
-        Account.family_id.in_(family_ids),
-        Account.is_active == True,
-        Account.status.in_([AccountStatus.LINKED, AccountStatus.PENDING])
-    ).all()
+    end_date = to_date or date.today()
+    start_date = from_date or end_date - timedelta(days=365)
     
-    # Calculate net worth
-    total_assets = Decimal("0")
-    total_liabilities = Decimal("0")
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must be on or before 'to'"
+        )
     
-    asset_breakdown = {}
-    for account in accounts:
-        balance = account.current_balance or Decimal("0")
-        
-        # Categorize as asset or liability
-        if account.account_type in [AccountType.CREDIT_CARD, AccountType.DEBT]:
-            total_liabilities += abs(balance)
-        else:
-            total_assets += balance
-        
-        # Asset allocation
-        account_type_str = account.account_type.value
-        if account_type_str not in asset_breakdown:
-            asset_breakdown[account_type_str] = Decimal("0")
-        asset_breakdown[account_type_str] += balance if balance > 0 else Decimal("0")
-    
-    total_net_worth = total_assets - total_liabilities
-    
-    # Asset allocation
-    total_allocation = sum(asset_breakdown.values()) if asset_breakdown else Decimal("1")
-    allocation_items = []
-    for account_type, amount in asset_breakdown.items():
-        percentage = float((amount / total_allocation * 100)) if total_allocation > 0 else 0.0
-        allocation_items.append(AssetAllocationItem(
-            account_type=account_type,
-            amount=amount,
-            percentage=percentage
-        ))
-    
-    # Member net worth
-    member_net_worth_list = []
-    for family_id in family_ids:
-        members = db.query(FamilyMember).filter(
-            FamilyMember.family_id == family_id,
-            FamilyMember.is_active == True
-        ).all()
-        
-        for member in members:
-            user_accounts = db.query(Account).filter(
-                Account.family_id == family_id,
-                Account.owner_id == member.user_id,
-                Account.is_active == True,
-                Account.status.in_([AccountStatus.LINKED, AccountStatus.PENDING])
-            ).all()
-            
-            member_total = sum(acc.current_balance or Decimal("0") for acc in user_accounts)
-            
-            member_net_worth_list.append(MemberNetWorth(
-                user_id=member.user_id,
-                user_name=member.user.full_name or member.user.email,
-                net_worth=member_total,
-                accounts_count=len(user_accounts)
-            ))
-    
-    # Top movers (accounts with largest changes in last 7 days)
-    top_movers = []
-    seven_days_ago = datetime.utcnow() - timedelta(days=7)
-    
-    for account in accounts:
-        # Get transactions in last 7 days
-        recent_transactions = db.query(Transaction).filter(
-            Transaction.account_id == account.id,
-            Transaction.transaction_date >= seven_days_ago,
-            Transaction.is_active == True
-        ).all()
-        
-        if recent_transactions:
-            change_amount = sum(
-                t.amount if t.transaction_type == TransactionType.CREDIT else -t.amount
-                for t in recent_transactions
+    rows = NetWorthHistoryService.get_series(
+        db,
+        family_id=family_id,
+        start_date=start_date,
+        end_date=end_date,
+        points=points,
+        user_id=user_id
+    )
+    
+    return NetWorthHistoryResponse(
+        family_id=family_id,
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+        points=[
+            NetWorthHistoryPoint(
+                date=snapshot_date,
+                net_worth=net_worth,
+                total_assets=total_assets,
+                total_liabilities=total_liabilities
             )
-            
-            if abs(change_amount) > 0:
-                current_balance = account.current_balance or Decimal("0")
-                change_percentage = float((change_amount / current_balance * 100)) if current_balance > 0 else 0.0
+            for snapshot_date, net_worth, total_assets, total_liabilities in rows
+        ]
+    )
+
+
+@router.get("/stream")
+async def stream_dashboard(
+    request: Request,
+    family_id: int = None,
+    current_user: User = Depends(get_current_user_for_stream),
+    db: Session = Depends(get_db)
+):
+    """
+    Server-sent events with dashboard deltas (net_worth, mover, alert)
+    
+    Clients should load GET /dashboard first and apply events on top. A `resync`
+    event means events were dropped and the dashboard should be refetched.
+    """
+    family_ids = _get_family_ids(db, current_user, family_id)
+    subscription = event_broker.subscribe(family_ids)
+    
+    async def events():
+        try:
+            yield f"retry: {settings.SSE_HEARTBEAT_SECONDS * 1000}\n\n"
+            while not await request.is_disconnected():
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    yield "event: resync\ndata: {}\n\n"
+                    continue
                 
-                top_movers.append(TopMover(
-                    account_id=account.id,
-                    account_name=account.name,
-                    change_amount=change_amount,
-                    change_percentage=change_percentage,
-                    change_type="increase" if change_amount > 0 else "decrease"
-                ))
-    
-    # Sort by absolute change
-    top_movers.sort(key=lambda x: abs(x.change_amount), reverse=True)
-    top_movers = top_movers[:5]
-    
-    # Alerts
-    alerts = []
-    
-    # Credit card due alerts
-    credit_cards = [acc for acc in accounts if acc.account_type == AccountType.CREDIT_CARD]
-    for card in credit_cards:
-        # TODO: Get due date from metadata
-        if card.account_metadata and card.account_metadata.get("due_date"):
-            due_date = datetime.fromisoformat(card.account_metadata["due_date"])
-            if due_date <= datetime.utcnow() + timedelta(days=7):
-                alerts.append(Alert(
-                    type="credit_card_due",
-                    title=f"Credit Card Payment Due",
-                    message=f"{card.name} payment due on {due_date.strftime('%Y-%m-%d')}",
-                    account_id=card.id,
-                    due_date=due_date,
-                    amount=card.current_balance
-                ))
-    
-    # FD maturity alerts
-    fds = [acc for acc in accounts if acc.account_type == AccountType.FIXED_DEPOSIT]
-    for fd in fds:
-        if fd.account_metadata and fd.account_metadata.get("maturity_date"):
-            maturity_date = datetime.fromisoformat(fd.account_metadata["maturity_date"])
-            if maturity_date <= datetime.utcnow() + timedelta(days=30):
-                alerts.append(Alert(
-                    type="fd_maturity",
-                    title="FD Maturity",
-                    message=f"{fd.name} matures on {maturity_date.strftime('%Y-%m-%d')}",
-                    account_id=fd.id,
-                    due_date=maturity_date,
-                    amount=fd.current_balance
-                ))
-    
-    # Large transaction alerts
-    large_transactions = db.query(Transaction).join(Account).filter(
-        Account.family_id.in_(family_ids),
-        Transaction.transaction_date >= datetime.utcnow() - timedelta(days=1),
-        Transaction.is_active == True,
-        func.abs(Transaction.amount) >= 50000  # Large transaction threshold
-    ).all()
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.queue.get(),
+                        timeout=settings.SSE_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                event_type = json.loads(message).get("type", "message")
+                yield f"event: {event_type}\ndata: {message}\n\n"
+        finally:
+            event_broker.unsubscribe(subscription)
     
-    for txn in large_transactions:
-        alerts.append(Alert(
-            type="large_transaction",
-            title="Large Transaction",
-            message=f"Large {txn.transaction_type.value} of ₹{abs(txn.amount):,.2f}",
-            account_id=txn.account_id,
-            amount=txn.amount
-        ))
-    
-    # Get last synced time
-    last_synced = None
-    if accounts:
-        synced_times = [acc.last_synced_at for acc in accounts if acc.last_synced_at]
-        if synced_times:
-            last_synced = max(synced_times)
-    
-    return DashboardResponse(
-        net_worth=NetWorthResponse(
-            total_net_worth=total_net_worth,
-            total_assets=total_assets,
-            total_liabilities=total_liabilities,
-            last_updated=datetime.utcnow()
-        ),
-        asset_allocation=AssetAllocationResponse(allocation=allocation_items),
-        member_net_worth=member_net_worth_list,
-        top_movers=top_movers,
-        alerts=alerts,
-        last_synced=last_synced
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-
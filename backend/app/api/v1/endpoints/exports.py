@@ -2,29 +2,79 @@
 Export and report endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import Response, StreamingResponse, FileResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from starlette.background import BackgroundTask
+from typing import Iterator, List, Tuple
 from datetime import datetime, date
 from decimal import Decimal
+import asyncio
 import io
 import csv
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
+import os
+import tempfile
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, SessionLocal
 from app.api.v1.dependencies import get_current_user
 from app.models.user import User
 from app.models.account import Account, AccountStatus
 from app.models.family import FamilyMember
-from app.models.transaction import Transaction
+from app.models.transaction import Transaction, TransactionType
+from app.services.ledger import LedgerService
+from app.services.export_cache import ExportCacheService
+from app.services.arrow_export import ArrowExportService
+from app.services.pdf_reports import (
+    PdfReportService,
+    PdfRenderBusy,
+    PdfRenderTimeout,
+    render_net_worth_pdf,
+    render_transactions_pdf
+)
 
 router = APIRouter()
 
 
+async def _render_pdf(renderer, *args, discard=None):
+    """Render a report in the PDF process pool, mapping overload to 503 and slowness to 504"""
+    try:
+        return await PdfReportService.render(renderer, *args, discard=discard)
+    except PdfRenderBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many reports are being generated. Please try again shortly.",
+            headers={"Retry-After": "10"}
+        )
+    except PdfRenderTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Report generation took too long. Try a shorter date range."
+        )
+
+
+def _cached_export(request: Request, cache_key: str, media_type: str, headers: dict):
+    """
+    Answer from the export cache: 304 when the client already has this version,
+    the cached file when there is one, otherwise None
+    """
+    if_none_match = request.headers.get("if-none-match", "")
+    if f'"{cache_key}"' in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(cache_key))
+    
+    path = ExportCacheService.get(cache_key)
+    if path:
+        return FileResponse(path, media_type=media_type, headers={**headers, **_cache_headers(cache_key)})
+    
+    return None
+
+
+def _cache_headers(cache_key: str) -> dict:
+    # Browsers keep the file but revalidate it with If-None-Match
+    return {"ETag": f'"{cache_key}"', "Cache-Control": "private, no-cache"}
+
+
 @router.get("/net-worth/csv")
 async def export_net_worth_csv(
     family_id: int = None,
@@ -107,11 +157,16 @@ async def export_net_worth_csv(
 
 @router.get("/net-worth/pdf")
 async def export_net_worth_pdf(
+    request: Request,
     family_id: int = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Export net worth report as PDF"""
+    """
+    Export net worth report as PDF
+    
+    Served from the export cache while the families' data is unchanged.
+    """
     # Check access
     if family_id:
         member = db.query(FamilyMember).filter(
@@ -132,27 +187,33 @@ async def export_net_worth_pdf(
                 detail="You don't have permission to export reports"
             )
     
-    # Get accounts
     if family_id:
-        accounts = db.query(Account).filter(
-            Account.family_id == family_id,
-            Account.is_active == True
-        ).all()
+        family_ids = [family_id]
     else:
         family_ids = db.query(FamilyMember.family_id).filter(
             FamilyMember.user_id == current_user.id,
             FamilyMember.is_active == True
         ).all()
         family_ids = [f[0] for f in family_ids]
-        
-        accounts = db.query(Account).filter(
-            Account.family_id.in_(family_ids),
-            Account.is_active == True
-        ).all()
+    
+    headers = {"Content-Disposition": f"attachment; filename=net_worth_{datetime.now().strftime('%Y%m%d')}.pdf"}
+    cache_key = ExportCacheService.key("net-worth/pdf", {"family_id": family_id}, family_ids)
+    if cache_key:
+        cached = _cached_export(request, cache_key, "application/pdf", headers)
+        if cached:
+            return cached
+        headers.update(_cache_headers(cache_key))
+    
+    # Get accounts
+    accounts = db.query(Account).filter(
+        Account.family_id.in_(family_ids),
+        Account.is_active == True
+    ).all()
     
     # Calculate totals
     total_assets = Decimal("0")
     total_liabilities = Decimal("0")
+    rows = []
     
     for account in accounts:
         balance = account.current_balance or Decimal("0")
@@ -161,100 +222,62 @@ async def export_net_worth_pdf(
             total_liabilities += abs(balance)
         else:
             total_assets += balance if balance > 0 else Decimal("0")
+        rows.append((account.name, account.account_type.value, balance, account.currency))
     
-    total_net_worth = total_assets - total_liabilities
-    
-    # Create PDF
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    # Title
-    title = Paragraph("Net Worth Report", styles['Title'])
-    elements.append(title)
-    elements.append(Spacer(1, 12))
-    
-    # Date
-    date_text = Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal'])
-    elements.append(date_text)
-    elements.append(Spacer(1, 20))
-    
-    # Summary section
-    summary_data = [
-        ["Total Assets", f"Rs. {total_assets:,.2f}"],
-        ["Total Liabilities", f"Rs. {total_liabilities:,.2f}"],
-        ["Net Worth", f"Rs. {total_net_worth:,.2f}"]
-    ]
-    summary_table = Table(summary_data, colWidths=[200, 200])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.lightblue),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgreen),
-    ]))
-    elements.append(summary_table)
-    elements.append(Spacer(1, 20))
-    
-    # Account details table
-    table_data = [["Account Name", "Account Type", "Balance", "Currency"]]
-    
-    for account in accounts:
-        balance = account.current_balance or Decimal("0")
-        table_data.append([
-            account.name,
-            account.account_type.value,
-            f"Rs. {balance:,.2f}",
-            account.currency
-        ])
+    pdf = await _render_pdf(
+        render_net_worth_pdf, rows, total_assets, total_liabilities,
+        datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    )
     
-    # Total row
-    table_data.append(["TOTAL", "", f"Rs. {total_assets + total_liabilities:,.2f}", "INR"])
-    
-    # Create table
-    table = Table(table_data)
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -2), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-    ]))
-    
-    elements.append(table)
-    
-    # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
+    if cache_key:
+        ExportCacheService.put(cache_key, pdf)
     
-    return StreamingResponse(
-        io.BytesIO(buffer.read()),
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=net_worth_{datetime.now().strftime('%Y%m%d')}.pdf"}
-    )
+    return Response(pdf, media_type="application/pdf", headers=headers)
 
 
-@router.get("/transactions/csv")
-async def export_transactions_csv(
+# Columns of the CSV and PDF exports
+EXPORT_COLUMNS = (
+    Transaction.transaction_date,
+    Account.name,
+    Transaction.transaction_type,
+    Transaction.amount,
+    Transaction.category,
+    Transaction.description,
+    Transaction.balance_after
+)
+
+# Columns of the Parquet and Arrow exports, in TRANSACTIONS_SCHEMA order
+ARROW_EXPORT_COLUMNS = (
+    Transaction.id,
+    Transaction.transaction_date,
+    Transaction.account_id,
+    Account.name,
+    Transaction.transaction_type,
+    Transaction.amount,
+    Transaction.currency,
+    Transaction.category,
+    Transaction.description,
+    Transaction.merchant_name,
+    Transaction.balance_after
+)
+
+
+def _transactions_export_query(
+    db: Session,
+    current_user: User,
     account_id: int = None,
     family_id: int = None,
     start_date: date = None,
     end_date: date = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    columns=EXPORT_COLUMNS
 ):
-    """Export transactions as CSV"""
-    # Check access
+    """
+    Check access and build the select of transaction export rows with account names
+    
+    Without an account or family, rows come from all of the user's families.
+    Also returns the ids of the families the rows come from.
+    """
+    family_ids = []
     if account_id:
         account = db.query(Account).filter(Account.id == account_id).first()
         if not account:
@@ -268,58 +291,195 @@ async def export_transactions_csv(
         
         if not member:
             raise HTTPException(status_code=403, detail="Access denied")
+        
+        family_ids = [account.family_id]
     
-    # Get transactions (reuse logic from transactions endpoint)
-    query = db.query(Transaction).filter(Transaction.is_active == True)
+    query = select(*columns).join(Account, Account.id == Transaction.account_id).where(Transaction.is_active == True)
     
     if account_id:
-        query = query.filter(Transaction.account_id == account_id)
+        query = query.where(Transaction.account_id == account_id)
     elif family_id:
-        account_ids = db.query(Account.id).filter(
-            Account.family_id == family_id,
-            Account.is_active == True
+        member = db.query(FamilyMember).filter(
+            FamilyMember.family_id == family_id,
+            FamilyMember.user_id == current_user.id,
+            FamilyMember.is_active == True
+        ).first()
+        
+        if not member:
+            raise HTTPException(status_code=403, detail="Access denied")
+        
+        query = query.where(LedgerService.family_filter(family_id))
+        family_ids = [family_id]
+    else:
+        # Every family the user is an active member of
+        family_ids = db.query(FamilyMember.family_id).filter(
+            FamilyMember.user_id == current_user.id,
+            FamilyMember.is_active == True
         ).all()
-        account_ids = [a[0] for a in account_ids]
-        query = query.filter(Transaction.account_id.in_(account_ids))
+        family_ids = [f[0] for f in family_ids]
+        
+        query = query.where(Transaction.family_id.in_(family_ids), Account.is_active == True)
     
     if start_date:
-        query = query.filter(Transaction.transaction_date >= start_date)
+        query = query.where(Transaction.transaction_date >= start_date)
     if end_date:
-        query = query.filter(Transaction.transaction_date <= end_date)
+        query = query.where(Transaction.transaction_date <= end_date)
     
-    transactions = query.order_by(Transaction.transaction_date.desc()).all()
-    
-    # Create CSV
+    return query.order_by(Transaction.transaction_date.desc(), Transaction.id.desc()), family_ids
+
+
+def _stream_transactions_csv(query, cache_key: str = None) -> Iterator[str]:
+    """
+    Yield the CSV in chunks while rows are read from a server-side cursor
+    
+    Uses its own session, since the request's session is closed once the
+    response starts. The header goes out before the query runs. With a
+    `cache_key`, the chunks are also written to the export cache, and the file
+    is kept only if the whole export was sent.
+    """
+    chunks = _transactions_csv_chunks(query)
+    return _tee_to_cache(chunks, cache_key, "w") if cache_key else chunks
+
+
+def _tee_to_cache(chunks: Iterator, cache_key: str, mode: str) -> Iterator:
+    """Pass chunks through, publishing them as the cache entry once all were sent"""
+    spool = ExportCacheService.begin(mode)
+    try:
+        for chunk in chunks:
+            spool.write(chunk)
+            yield chunk
+    except BaseException:
+        ExportCacheService.abort(spool)
+        raise
+    
+    ExportCacheService.commit(cache_key, spool)
+
+
+def _stream_rows(query) -> Iterator[tuple]:
+    """Rows of `query` from a server-side cursor on a session of its own"""
+    db = SessionLocal()
+    try:
+        yield from db.execute(query.execution_options(yield_per=settings.EXPORT_FETCH_ROWS))
+    finally:
+        db.close()
+
+
+def _transactions_csv_chunks(query) -> Iterator[str]:
+    """The CSV header, then rows in chunks of about EXPORT_CSV_CHUNK_BYTES"""
     output = io.StringIO()
     writer = csv.writer(output)
-    
-    # Header
     writer.writerow(["Date", "Account", "Type", "Amount", "Category", "Description", "Balance After"])
+    yield output.getvalue()
+    output.seek(0)
+    output.truncate()
     
-    # Data
-    for txn in transactions:
-        account = db.query(Account).filter(Account.id == txn.account_id).first()
+    for transaction_date, account_name, transaction_type, amount, category, description, balance_after in _stream_rows(query):
         writer.writerow([
-            txn.transaction_date.strftime("%Y-%m-%d"),
-            account.name if account else "Unknown",
-            txn.transaction_type.value,
-            str(txn.amount),
-            txn.category.value,
-            txn.description or "",
-            str(txn.balance_after) if txn.balance_after else ""
+            transaction_date.strftime("%Y-%m-%d"),
+            account_name,
+            transaction_type.value,
+            str(amount),
+            category.value,
+            description or "",
+            str(balance_after) if balance_after else ""
         ])
+        if output.tell() >= settings.EXPORT_CSV_CHUNK_BYTES:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
     
-    output.seek(0)
+    if output.tell():
+        yield output.getvalue()
+
+
+@router.get("/transactions/csv")
+async def export_transactions_csv(
+    request: Request,
+    account_id: int = None,
+    family_id: int = None,
+    start_date: date = None,
+    end_date: date = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Export transactions as CSV
+    
+    Rows are streamed from a server-side cursor and sent as they are written,
+    so memory use does not grow with the number of transactions. Repeat
+    downloads are served from the export cache while the data is unchanged.
+    """
+    query, family_ids = _transactions_export_query(db, current_user, account_id, family_id, start_date, end_date)
+    headers = {"Content-Disposition": f"attachment; filename=transactions_{datetime.now().strftime('%Y%m%d')}.csv"}
+    
+    cache_key = None
+    if family_ids:
+        cache_key = ExportCacheService.key(
+            "transactions/csv",
+            {"account_id": account_id, "family_id": family_id, "start_date": start_date, "end_date": end_date},
+            family_ids
+        )
+    
+    if cache_key:
+        cached = _cached_export(request, cache_key, "text/csv", headers)
+        if cached:
+            return cached
+        headers.update(_cache_headers(cache_key))
     
     return StreamingResponse(
-        iter([output.getvalue()]),
+        _stream_transactions_csv(query, cache_key),
         media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename=transactions_{datetime.now().strftime('%Y%m%d')}.csv"}
+        headers=headers
     )
 
 
-@router.get("/transactions/pdf")
-async def export_transactions_pdf(
+def _columnar_export(
+    request: Request,
+    db: Session,
+    current_user: User,
+    account_id: int,
+    family_id: int,
+    start_date: date,
+    end_date: date,
+    extension: str,
+    media_type: str
+):
+    """Stream transactions as Parquet or an Arrow IPC stream, through the export cache"""
+    query, family_ids = _transactions_export_query(
+        db, current_user, account_id, family_id, start_date, end_date, columns=ARROW_EXPORT_COLUMNS
+    )
+    headers = {"Content-Disposition": f"attachment; filename=transactions_{datetime.now().strftime('%Y%m%d')}.{extension}"}
+    
+    cache_key = None
+    if family_ids:
+        cache_key = ExportCacheService.key(
+            f"transactions/{extension}",
+            {"account_id": account_id, "family_id": family_id, "start_date": start_date, "end_date": end_date},
+            family_ids
+        )
+    
+    if cache_key:
+        cached = _cached_export(request, cache_key, media_type, headers)
+        if cached:
+            return cached
+        headers.update(_cache_headers(cache_key))
+    
+    rows = _stream_rows(query)
+    if extension == "parquet":
+        chunks = ArrowExportService.parquet_chunks(rows)
+    else:
+        chunks = ArrowExportService.ipc_stream_chunks(rows)
+    
+    return StreamingResponse(
+        _tee_to_cache(chunks, cache_key, "wb") if cache_key else chunks,
+        media_type=media_type,
+        headers=headers
+    )
+
+
+@router.get("/transactions/parquet")
+async def export_transactions_parquet(
+    request: Request,
     account_id: int = None,
     family_id: int = None,
     start_date: date = None,
@@ -327,133 +487,123 @@ async def export_transactions_pdf(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Export transactions as PDF"""
-    # Check access
-    if account_id:
-        account = db.query(Account).filter(Account.id == account_id).first()
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
-        
-        member = db.query(FamilyMember).filter(
-            FamilyMember.family_id == account.family_id,
-            FamilyMember.user_id == current_user.id,
-            FamilyMember.is_active == True
-        ).first()
-        
-        if not member:
-            raise HTTPException(status_code=403, detail="Access denied")
-    
-    # Get transactions
-    query = db.query(Transaction).filter(Transaction.is_active == True)
-    
-    if account_id:
-        query = query.filter(Transaction.account_id == account_id)
-    elif family_id:
-        account_ids = db.query(Account.id).filter(
-            Account.family_id == family_id,
-            Account.is_active == True
-        ).all()
-        account_ids = [a[0] for a in account_ids]
-        query = query.filter(Transaction.account_id.in_(account_ids))
-    
-    if start_date:
-        query = query.filter(Transaction.transaction_date >= start_date)
-    if end_date:
-        query = query.filter(Transaction.transaction_date <= end_date)
-    
-    transactions = query.order_by(Transaction.transaction_date.desc()).all()
-    
-    # Create PDF
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    # Title
-    title = Paragraph("Transactions Report", styles['Title'])
-    elements.append(title)
-    elements.append(Spacer(1, 12))
-    
-    # Date
-    date_text = Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal'])
-    elements.append(date_text)
-    elements.append(Spacer(1, 20))
-    
-    # Summary
+    """
+    Export transactions as a zstd-compressed Parquet file
+    
+    Columns keep their types (timestamps, decimal amounts, categorical account,
+    type and category), so the file loads directly with pandas.read_parquet.
+    Written one row group per record batch straight from a server-side cursor.
+    """
+    return _columnar_export(
+        request, db, current_user, account_id, family_id, start_date, end_date,
+        "parquet", "application/vnd.apache.parquet"
+    )
+
+
+@router.get("/transactions/arrow")
+async def export_transactions_arrow(
+    request: Request,
+    account_id: int = None,
+    family_id: int = None,
+    start_date: date = None,
+    end_date: date = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Export transactions as a zstd-compressed Arrow IPC stream
+    
+    Same columns as the Parquet export; read it with pyarrow.ipc.open_stream.
+    """
+    return _columnar_export(
+        request, db, current_user, account_id, family_id, start_date, end_date,
+        "arrow", "application/vnd.apache.arrow.stream"
+    )
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _spool_transaction_rows(query) -> Tuple[str, Decimal, Decimal]:
+    """
+    Write export rows to a temporary CSV file for the PDF renderer
+    
+    Rows come from a server-side cursor on a session of its own, so neither
+    side holds the whole report in memory. Returns the file path and the debit
+    and credit totals.
+    """
+    os.makedirs(settings.EXPORT_STORAGE_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=".csv", dir=settings.EXPORT_STORAGE_DIR)
     total_debit = Decimal("0")
     total_credit = Decimal("0")
-    for txn in transactions:
-        if txn.transaction_type.value == 'debit':
-            total_debit += txn.amount
-        elif txn.transaction_type.value == 'credit':
-            total_credit += txn.amount
-    
-    summary_data = [
-        ["Total Debits", f"Rs. {total_debit:,.2f}"],
-        ["Total Credits", f"Rs. {total_credit:,.2f}"],
-        ["Net Amount", f"Rs. {total_credit - total_debit:,.2f}"]
-    ]
-    summary_table = Table(summary_data, colWidths=[200, 200])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.lightblue),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgreen),
-    ]))
-    elements.append(summary_table)
-    elements.append(Spacer(1, 20))
-    
-    # Transactions table
-    table_data = [["Date", "Account", "Type", "Amount", "Category", "Description"]]
-    
-    for txn in transactions:
-        account = db.query(Account).filter(Account.id == txn.account_id).first()
-        account_name = account.name if account else "Unknown"
-        if len(account_name) > 20:
-            account_name = account_name[:17] + "..."
-        
-        description = txn.description or ""
-        if len(description) > 30:
-            description = description[:27] + "..."
-        
-        table_data.append([
-            txn.transaction_date.strftime("%Y-%m-%d"),
-            account_name,
-            txn.transaction_type.value.upper(),
-            f"Rs. {txn.amount:,.2f}",
-            txn.category.value.upper(),
-            description
-        ])
     
-    # Create table
-    table = Table(table_data, colWidths=[80, 100, 60, 100, 80, 150])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-    ]))
-    
-    elements.append(table)
-    
-    # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
-    
-    return StreamingResponse(
-        io.BytesIO(buffer.read()),
+    db = SessionLocal()
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            writer = csv.writer(f)
+            rows = db.execute(query.execution_options(yield_per=settings.EXPORT_FETCH_ROWS))
+            for transaction_date, account_name, transaction_type, amount, category, description, _ in rows:
+                if transaction_type == TransactionType.DEBIT:
+                    total_debit += amount
+                elif transaction_type == TransactionType.CREDIT:
+                    total_credit += amount
+                writer.writerow([
+                    transaction_date.strftime("%Y-%m-%d"),
+                    account_name,
+                    transaction_type.value,
+                    amount,
+                    category.value,
+                    description or ""
+                ])
+    except BaseException:
+        _remove_file(path)
+        raise
+    finally:
+        db.close()
+    
+    return path, total_debit, total_credit
+
+
+@router.get("/transactions/pdf")
+async def export_transactions_pdf(
+    account_id: int = None,
+    family_id: int = None,
+    start_date: date = None,
+    end_date: date = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Export transactions as PDF
+    
+    Rows are spooled to disk and the report is drawn a page at a time into a
+    temporary file, which is served from disk and deleted once sent, so memory
+    use does not grow with the size of the report.
+    """
+    query, _ = _transactions_export_query(db, current_user, account_id, family_id, start_date, end_date)
+    rows_path, total_debit, total_credit = await asyncio.to_thread(_spool_transaction_rows, query)
+    
+    fd, output_path = tempfile.mkstemp(suffix=".pdf", dir=settings.EXPORT_STORAGE_DIR)
+    os.close(fd)
+    try:
+        await _render_pdf(
+            render_transactions_pdf, rows_path, output_path, total_debit, total_credit,
+            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            discard=_remove_file
+        )
+    except BaseException:
+        _remove_file(output_path)
+        raise
+    finally:
+        _remove_file(rows_path)
+    
+    return FileResponse(
+        output_path,
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=transactions_{datetime.now().strftime('%Y%m%d')}.pdf"}
+        headers={"Content-Disposition": f"attachment; filename=transactions_{datetime.now().strftime('%Y%m%d')}.pdf"},
+        background=BackgroundTask(_remove_file, output_path)
     )
-
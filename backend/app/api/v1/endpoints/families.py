@@ -10,6 +10,7 @@ import string
 import logging
 
 from app.core.database import get_db
+from app.core.cache import cache
 from app.api.v1.dependencies import get_current_user
 from app.schemas.family import (
     FamilyCreate,
@@ -17,11 +18,16 @@ from app.schemas.family import (
     FamilyResponse,
     FamilyMemberCreate,
     FamilyMemberUpdate,
-    FamilyMemberResponse
+    FamilyMemberResponse,
+    CategoryRuleCreate,
+    CategoryRuleResponse
 )
 from app.schemas.user import UserResponse
 from app.models.user import User
 from app.models.family import Family, FamilyMember, FamilyRole
+from app.models.net_worth import FamilyNetWorth
+from app.models.category_rule import CategoryRule
+from app.services.categorization import normalize_keyword
 from app.core.security import get_password_hash, create_invitation_token
 from app.core.email import send_invitation_email
 from app.core.config import settings
@@ -58,6 +64,7 @@ async def create_family(
         joined_at=family.created_at
     )
     db.add(member)
+    db.add(FamilyNetWorth(family_id=family.id, allocation={}))
     db.commit()
     
     return family
@@ -142,6 +149,7 @@ async def update_family(
         setattr(family, field, value)
     
     db.commit()
+    cache.bump_family_version(family_id)
     db.refresh(family)
     
     return family
@@ -294,6 +302,7 @@ async def invite_member(
     )
     db.add(new_member)
     db.commit()
+    cache.bump_family_version(family_id)
     db.refresh(new_member)
     
     # Generate invitation token
@@ -379,6 +388,7 @@ async def update_member(
         setattr(target_member, field, value)
     
     db.commit()
+    cache.bump_family_version(family_id)
     db.refresh(target_member)
     
     return target_member
@@ -427,6 +437,124 @@ async def remove_member(
     # Soft delete by setting is_active to False
     target_member.is_active = False
     db.commit()
+    cache.bump_family_version(family_id)
     
     return None
 
+
+@router.get("/{family_id}/category-rules", response_model=List[CategoryRuleResponse])
+async def get_category_rules(
+    family_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the family's auto-categorization rules"""
+    member = db.query(FamilyMember).filter(
+        FamilyMember.family_id == family_id,
+        FamilyMember.user_id == current_user.id,
+        FamilyMember.is_active == True
+    ).first()
+    
+    if not member:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this family"
+        )
+    
+    return db.query(CategoryRule).filter(
+        CategoryRule.family_id == family_id
+    ).order_by(CategoryRule.keyword).all()
+
+
+@router.post("/{family_id}/category-rules", response_model=CategoryRuleResponse, status_code=status.HTTP_201_CREATED)
+async def create_category_rule(
+    family_id: int,
+    rule_data: CategoryRuleCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Add an auto-categorization rule (owner or editor)
+    
+    New transactions from imports and parsed messages whose merchant or description
+    contains the keyword get its category. Family rules take precedence over the
+    built-in ones; an existing rule for the same keyword is updated.
+    """
+    member = db.query(FamilyMember).filter(
+        FamilyMember.family_id == family_id,
+        FamilyMember.user_id == current_user.id,
+        FamilyMember.role.in_([FamilyRole.OWNER, FamilyRole.EDITOR]),
+        FamilyMember.is_active == True
+    ).first()
+    
+    if not member:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only family owners and editors can manage category rules"
+        )
+    
+    keyword = normalize_keyword(rule_data.keyword)
+    if not keyword:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Keyword cannot be blank"
+        )
+    
+    rule = db.query(CategoryRule).filter(
+        CategoryRule.family_id == family_id,
+        CategoryRule.keyword == keyword
+    ).first()
+    
+    if rule:
+        rule.category = rule_data.category
+    else:
+        rule = CategoryRule(
+            family_id=family_id,
+            keyword=keyword,
+            category=rule_data.category,
+            created_by=current_user.id
+        )
+        db.add(rule)
+    
+    db.commit()
+    db.refresh(rule)
+    
+    return rule
+
+
+@router.delete("/{family_id}/category-rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_category_rule(
+    family_id: int,
+    rule_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete an auto-categorization rule (owner or editor)"""
+    member = db.query(FamilyMember).filter(
+        FamilyMember.family_id == family_id,
+        FamilyMember.user_id == current_user.id,
+        FamilyMember.role.in_([FamilyRole.OWNER, FamilyRole.EDITOR]),
+        FamilyMember.is_active == True
+    ).first()
+    
+    if not member:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only family owners and editors can manage category rules"
+        )
+    
+    rule = db.query(CategoryRule).filter(
+        CategoryRule.id == rule_id,
+        CategoryRule.family_id == family_id
+    ).first()
+    
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Category rule not found"
+        )
+    
+    db.delete(rule)
+    db.commit()
+    
+    return None
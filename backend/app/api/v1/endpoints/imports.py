@@ -0,0 +1,147 @@
+"""
+Background import endpoints
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import asyncio
+
+from app.core.database import get_db, SessionLocal
+from app.core.config import settings
+from app.api.v1.dependencies import get_current_user, get_current_user_for_stream
+from app.api.v1.endpoints.accounts import get_import_family_id
+from app.schemas.import_job import ImportJobResponse
+from app.models.user import User
+from app.models.import_job import ImportJob, ImportKind, ImportStatus
+from app.services.import_jobs import ImportJobService
+
+router = APIRouter()
+
+FINISHED_STATUSES = (ImportStatus.COMPLETED, ImportStatus.FAILED)
+
+
+def _get_job(db: Session, current_user: User, job_id: int) -> ImportJob:
+    job = db.query(ImportJob).filter(
+        ImportJob.id == job_id,
+        ImportJob.user_id == current_user.id
+    ).first()
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import not found"
+        )
+    
+    return job
+
+
+@router.post("", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_import(
+    file: UploadFile = File(...),
+    kind: ImportKind = ImportKind.TRANSACTIONS,
+    account_id: Optional[int] = None,
+    family_id: Optional[int] = None,
+    use_copy: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue a CSV import and return its job at once
+    
+    The file is processed in the background; poll GET /imports/{id} or follow
+    GET /imports/{id}/stream for progress.
+    """
+    if kind == ImportKind.ACCOUNTS:
+        params = {"family_id": get_import_family_id(db, current_user, family_id)}
+    else:
+        if use_copy and db.get_bind().dialect.name != "postgresql":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="COPY import requires PostgreSQL"
+            )
+        params = {"account_id": account_id, "use_copy": use_copy}
+    
+    return ImportJobService.create(db, current_user, kind, file.file, file.filename, params)
+
+
+@router.get("", response_model=List[ImportJobResponse])
+async def get_imports(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the user's most recent imports"""
+    return db.query(ImportJob).filter(
+        ImportJob.user_id == current_user.id
+    ).order_by(ImportJob.created_at.desc(), ImportJob.id.desc()).limit(limit).all()
+
+
+@router.get("/{job_id}", response_model=ImportJobResponse)
+async def get_import(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get an import's status and progress"""
+    return _get_job(db, current_user, job_id)
+
+
+@router.get("/{job_id}/stream")
+async def stream_import(
+    job_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user_for_stream),
+    db: Session = Depends(get_db)
+):
+    """
+    Server-sent `progress` events until the import finishes, then a final `done` event
+    
+    If the job makes no progress for IMPORT_STREAM_MAX_IDLE_SECONDS, a `stalled`
+    event with its last state ends the stream; poll GET /imports/{id} after that.
+    """
+    _get_job(db, current_user, job_id)
+    
+    def load() -> str:
+        # Short-lived session per poll so an open stream holds no connection
+        session = SessionLocal()
+        try:
+            job = session.query(ImportJob).filter(ImportJob.id == job_id).first()
+            return ImportJobResponse.model_validate(job).model_dump_json()
+        finally:
+            session.close()
+    
+    async def events():
+        last = None
+        idle = 0.0
+        unchanged = 0.0
+        while not await request.is_disconnected():
+            payload = await asyncio.to_thread(load)
+            finished = ImportJobResponse.model_validate_json(payload).status in FINISHED_STATUSES
+            
+            if finished:
+                yield f"event: done\ndata: {payload}\n\n"
+                return
+            if payload != last:
+                yield f"event: progress\ndata: {payload}\n\n"
+                last = payload
+                idle = 0.0
+                unchanged = 0.0
+            elif unchanged >= settings.IMPORT_STREAM_MAX_IDLE_SECONDS:
+                # Not moving (e.g. its worker went away); stop holding the connection
+                yield f"event: stalled\ndata: {payload}\n\n"
+                return
+            elif idle >= settings.SSE_HEARTBEAT_SECONDS:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+            
+            await asyncio.sleep(settings.IMPORT_PROGRESS_POLL_SECONDS)
+            idle += settings.IMPORT_PROGRESS_POLL_SECONDS
+            unchanged += settings.IMPORT_PROGRESS_POLL_SECONDS
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
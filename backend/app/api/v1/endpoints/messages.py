@@ -10,12 +10,18 @@ from decimal import Decimal
 from pydantic import BaseModel
 
 from app.core.database import get_db
+from app.core.cache import cache
 from app.api.v1.dependencies import get_current_user
 from app.models.user import User
-from app.models.transaction import Transaction, TransactionType, TransactionCategory
+from app.models.transaction import Transaction, TransactionKey, TransactionType, TransactionCategory
 from app.models.account import Account, AccountType, AccountStatus, AccountProvider
 from app.models.family import FamilyMember, FamilyRole
 from app.services.message_parser import MessageParser
+from app.services.categorization import CategorizationService
+from app.services.ledger import LedgerService
+from app.services.dashboard_events import DashboardEventService
+from app.services.spend_summary import SpendSummaryService
+from app.services.partitions import TransactionPartitionService
 
 router = APIRouter()
 
@@ -43,6 +49,7 @@ async def parse_message(
     
     If account with matching last 4 digits exists, transaction is added to it.
     If account doesn't exist, a new account is created in the same family.
+    The category comes from the family's category rules and built-in merchant keywords.
     """
     parser = MessageParser()
     parsed_data = parser.parse(request.message)
@@ -135,30 +142,40 @@ async def parse_message(
     transaction_date = parsed_data.get('date', datetime.now())
     description = parsed_data.get('description', request.message[:200])
     
+    # Label from the family's category rules; the description is usually the merchant
+    matcher = CategorizationService.matcher(db, account.family_id)
+    category = matcher.categorize(description) or matcher.categorize(request.message) or TransactionCategory.OTHER
+    
     # Generate unique transaction ID
     transaction_id = f"msg_{int(datetime.now().timestamp())}_{account.id}_{hash(request.message) % 1000000}"
     
-    # Update account balance
-    if transaction_type == TransactionType.CREDIT:
-        account.current_balance += amount
-    elif transaction_type == TransactionType.DEBIT:
-        account.current_balance -= amount
-    
     transaction = Transaction(
         account_id=account.id,
+        family_id=account.family_id,
         transaction_id=transaction_id,
         transaction_date=transaction_date,
         amount=amount,
         transaction_type=transaction_type,
-        category=TransactionCategory.OTHER,
+        category=category,
         description=description,
         transaction_metadata=f'{{"source": "message_parser", "original_message": "{request.message[:500]}"}}'
     )
     
+    TransactionPartitionService.ensure(db, [transaction_date])
+    db.add(TransactionKey(transaction_id=transaction_id, transaction_date=transaction_date))
     db.add(transaction)
+    SpendSummaryService.record(db, [transaction])
+    db.flush()
+    
+    # Update account balance
+    LedgerService.apply_balance_change(db, account, LedgerService.balance_delta(transaction_type, amount))
+    LedgerService.update_balance_after(db, account.id, transaction_date)
+    
     db.commit()
+    cache.bump_family_version(family_id)
     db.refresh(transaction)
     db.refresh(account)
+    DashboardEventService.publish_changes(db, {account.id: family_id}, [transaction])
     
     return {
         "success": True,
@@ -2,25 +2,87 @@
 Transaction endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Response
+from sqlalchemy import tuple_, func, or_
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime, date
-import csv
-import io
+from typing import List, Optional, Union
+from datetime import date
+import re
 
 from app.core.database import get_db
+from app.core.cache import cache
+from app.core.pagination import encode_cursor, decode_cursor
 from app.api.v1.dependencies import get_current_user
-from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionResponse
+from app.schemas.transaction import (
+    TransactionCreate,
+    TransactionUpdate,
+    TransactionResponse,
+    TransactionPage,
+    TransactionImportResult,
+    TransactionBatchCreate,
+    TransactionBatchResult,
+    TransactionSummary,
+    TransactionSummaryRow
+)
 from app.models.user import User
-from app.models.transaction import Transaction, TransactionType
+from app.models.transaction import Transaction, SEARCH_CONFIG
 from app.models.account import Account
 from app.models.family import FamilyMember
+from app.services.ledger import LedgerService
+from app.services.transaction_import import TransactionImportService
+from app.services.dashboard_events import DashboardEventService
+from app.services.spend_summary import SpendSummaryService, GROUP_BY_FIELDS
 
 router = APIRouter()
 
+# Shortest query that also falls back to trigram (substring) matching
+MIN_TRIGRAM_QUERY_LENGTH = 3
 
-@router.get("", response_model=List[TransactionResponse])
+
+def _get_account_ids(db: Session, current_user: User, family_id: Optional[int], account_id: Optional[int]):
+    """
+    Subquery of the active account ids a user may read, optionally narrowed
+    to one family or one account (403 if the user has no access to it)
+    """
+    # Only accounts in families the user is an active member of
+    member_families = db.query(FamilyMember.family_id).filter(
+        FamilyMember.user_id == current_user.id,
+        FamilyMember.is_active == True
+    )
+    
+    if family_id:
+        member = member_families.filter(FamilyMember.family_id == family_id).first()
+        if not member:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have access to this family"
+            )
+        member_families = member_families.filter(FamilyMember.family_id == family_id)
+    
+    account_ids = db.query(Account.id).filter(
+        Account.family_id.in_(member_families),
+        Account.is_active == True
+    )
+    
+    if account_id:
+        account = db.query(Account).filter(Account.id == account_id).first()
+        if not account:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Account not found"
+            )
+        
+        if not account_ids.filter(Account.id == account_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have access to this account"
+            )
+        account_ids = account_ids.filter(Account.id == account_id)
+    
+    return account_ids
+
+
+@router.get("", response_model=Union[TransactionPage, List[TransactionResponse]])
 async def get_transactions(
     account_id: Optional[int] = None,
     family_id: Optional[int] = None,
@@ -29,10 +91,19 @@ async def get_transactions(
     category: Optional[str] = None,
     limit: int = Query(100, le=1000),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination: pass an empty value for the first page, then each page's next_cursor"
+    ),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get transactions"""
+    """
+    Get transactions, newest first
+    
+    Without `cursor` this returns a plain list paged by `offset`. With `cursor`
+    it returns {items, next_cursor}, which stays stable while new transactions arrive.
+    """
     query = db.query(Transaction).filter(Transaction.is_active == True)
     
     # Filter by account
@@ -73,14 +144,7 @@ async def get_transactions(
                 detail="You don't have access to this family"
             )
         
-        # Get account IDs for this family
-        account_ids = db.query(Account.id).filter(
-            Account.family_id == family_id,
-            Account.is_active == True
-        ).all()
-        account_ids = [a[0] for a in account_ids]
-        
-        query = query.filter(Transaction.account_id.in_(account_ids))
+        query = query.filter(LedgerService.family_filter(family_id))
     
     # Date filters
     if start_date:
@@ -92,13 +156,139 @@ async def get_transactions(
     if category:
         query = query.filter(Transaction.category == category)
     
-    # Order by date desc
-    query = query.order_by(Transaction.transaction_date.desc())
+    # Order by date desc, id desc so every row has a unique position
+    query = query.order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+    
+    if cursor is None:
+        # Offset pagination
+        return query.offset(offset).limit(limit).all()
+    
+    # Keyset pagination
+    if cursor:
+        try:
+            cursor_date, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.filter(
+            tuple_(Transaction.transaction_date, Transaction.id) < tuple_(cursor_date, cursor_id)
+        )
     
-    # Pagination
-    transactions = query.offset(offset).limit(limit).all()
+    # Fetch one extra row to know whether another page follows
+    transactions = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        last = transactions[-1]
+        next_cursor = encode_cursor(last.transaction_date, last.id)
     
-    return transactions
+    return TransactionPage(
+        items=[TransactionResponse.model_validate(t) for t in transactions],
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/search", response_model=List[TransactionResponse])
+async def search_transactions(
+    q: str = Query(..., min_length=1, max_length=200),
+    family_id: Optional[int] = None,
+    account_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Search transaction descriptions and merchant names, best matches first
+    
+    Every word is matched as a prefix ("swig" finds "Swiggy"); queries of three or
+    more characters also match anywhere inside a merchant name or description.
+    """
+    account_ids = _get_account_ids(db, current_user, family_id, account_id)
+    
+    # Strip tsquery operators so user input can't produce a syntax error
+    words = re.findall(r"\w+", q.lower())
+    if not words:
+        return []
+    
+    ts_query = func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{w}:*" for w in words))
+    matches = [Transaction.search_vector.op("@@")(ts_query)]
+    
+    term = q.strip()
+    if len(term) >= MIN_TRIGRAM_QUERY_LENGTH:
+        pattern = "%" + re.sub(r"([!%_])", r"!\1", term) + "%"
+        matches.append(Transaction.merchant_name.ilike(pattern, escape="!"))
+        matches.append(Transaction.description.ilike(pattern, escape="!"))
+    
+    rank = func.ts_rank_cd(Transaction.search_vector, ts_query)
+    
+    return db.query(Transaction).filter(
+        Transaction.is_active == True,
+        Transaction.account_id.in_(account_ids),
+        or_(*matches)
+    ).order_by(
+        rank.desc(),
+        Transaction.transaction_date.desc(),
+        Transaction.id.desc()
+    ).offset(offset).limit(limit).all()
+
+
+@router.get("/summary", response_model=TransactionSummary)
+async def get_transaction_summary(
+    group_by: str = Query(
+        "month,category",
+        description="Comma-separated subset of: month, category, account, member"
+    ),
+    family_id: Optional[int] = None,
+    account_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Debit and credit totals grouped in the database
+    
+    Whole months are read from the monthly category rollup, so the cost depends on
+    the number of months and groups rather than the number of transactions.
+    """
+    requested = [g.strip() for g in group_by.split(',') if g.strip()]
+    unknown = [g for g in requested if g not in GROUP_BY_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown group_by fields: {', '.join(unknown)}. Valid fields: {', '.join(GROUP_BY_FIELDS)}"
+        )
+    
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+    
+    fields = [g for g in GROUP_BY_FIELDS if g in requested]
+    account_ids = _get_account_ids(db, current_user, family_id, account_id)
+    rows = SpendSummaryService.summarize(db, account_ids, fields, start_date, end_date)
+    
+    return TransactionSummary(
+        group_by=fields,
+        start_date=start_date,
+        end_date=end_date,
+        rows=[
+            TransactionSummaryRow(
+                month=row.get("month"),
+                category=row.get("category"),
+                account_id=row.get("account"),
+                member_id=row.get("member"),
+                debit_total=row["debit_total"],
+                credit_total=row["credit_total"],
+                count=row["count"]
+            )
+            for row in rows
+        ]
+    )
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
@@ -176,11 +366,21 @@ async def update_transaction(
         )
     
     update_data = transaction_update.dict(exclude_unset=True)
+    
+    # Move the transaction between rollup rows (or out of them when soft-deleted)
+    rolled_up = "category" in update_data or "is_active" in update_data
+    if rolled_up:
+        SpendSummaryService.record(db, [transaction], sign=-1)
+    
     for field, value in update_data.items():
         setattr(transaction, field, value)
     
+    if rolled_up:
+        SpendSummaryService.record(db, [transaction])
+    
     db.commit()
     db.refresh(transaction)
+    cache.bump_family_version(account.family_id)
     
     return transaction
 
@@ -188,10 +388,17 @@ async def update_transaction(
 @router.post("", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
 async def create_transaction(
     transaction_data: TransactionCreate,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Create a new transaction"""
+    """
+    Create a new transaction
+    
+    Idempotent on transaction_id (a content fingerprint when none is given): posting
+    the same transaction again returns the existing row with 200 and changes nothing.
+    A transaction_id already used on another account is rejected with 409.
+    """
     # Check account access
     account = db.query(Account).filter(Account.id == transaction_data.account_id).first()
     if not account:
@@ -212,146 +419,106 @@ async def create_transaction(
             detail="You don't have access to this account"
         )
     
-    # Create transaction
-    transaction = Transaction(
-        account_id=transaction_data.account_id,
-        transaction_id=transaction_data.transaction_id,
-        transaction_date=transaction_data.transaction_date,
-        amount=transaction_data.amount,
-        transaction_type=transaction_data.transaction_type,
-        category=transaction_data.category,
-        description=transaction_data.description,
-        transaction_metadata=transaction_data.metadata
+    transaction_id = transaction_data.transaction_id or LedgerService.fingerprint(
+        transaction_data.account_id,
+        transaction_data.transaction_date,
+        transaction_data.amount,
+        transaction_data.transaction_type,
+        transaction_data.description
     )
     
-    db.add(transaction)
+    # Create transaction unless it already exists
+    inserted = LedgerService.insert_new(db, [{
+        "account_id": transaction_data.account_id,
+        "family_id": account.family_id,
+        "transaction_id": transaction_id,
+        "transaction_date": transaction_data.transaction_date,
+        "amount": transaction_data.amount,
+        "transaction_type": transaction_data.transaction_type,
+        "category": transaction_data.category,
+        "description": transaction_data.description,
+        "transaction_metadata": transaction_data.metadata,
+    }])
+    
+    transaction = db.query(Transaction).filter(
+        Transaction.transaction_id == transaction_id,
+        Transaction.account_id == transaction_data.account_id
+    ).first()
+    
+    if not inserted:
+        if not transaction:
+            # The id is taken by a transaction on another account
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="transaction_id already exists on another account"
+            )
+        response.status_code = status.HTTP_200_OK
+        return transaction
     
     # Update account balance if needed
-    if transaction_data.transaction_type == TransactionType.CREDIT:
-        account.current_balance += transaction_data.amount
-    elif transaction_data.transaction_type == TransactionType.DEBIT:
-        account.current_balance -= transaction_data.amount
+    LedgerService.apply_balance_change(
+        db,
+        account,
+        LedgerService.balance_delta(transaction_data.transaction_type, transaction_data.amount)
+    )
+    LedgerService.update_balance_after(db, account.id, transaction_data.transaction_date)
     
     db.commit()
     db.refresh(transaction)
+    cache.bump_family_version(account.family_id)
+    DashboardEventService.publish_changes(db, {account.id: account.family_id}, [transaction])
     
     return transaction
 
 
-@router.post("/import/csv", response_model=List[TransactionResponse], status_code=status.HTTP_201_CREATED)
-async def import_transactions_csv(
+@router.post("/batch", response_model=TransactionBatchResult)
+def create_transactions_batch(
+    batch: TransactionBatchCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create up to 5000 transactions in one request
+    
+    All items are inserted in one transaction with one balance update per account.
+    Returns a result per item, in request order: created, exists (already recorded,
+    so retries are safe) or error (e.g. no access to the account).
+    Declared sync so the batch runs in the threadpool, not the event loop.
+    """
+    return TransactionImportService.create_batch(db, current_user, batch.items)
+
+
+@router.post("/import/csv", response_model=TransactionImportResult, status_code=status.HTTP_201_CREATED)
+def import_transactions_csv(
+    response: Response,
     file: UploadFile = File(...),
     account_id: Optional[int] = None,
+    use_copy: bool = Query(False, description="Bulk-load with PostgreSQL COPY and commit once (for large backfills)"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Import transactions from CSV file"""
-    # Read CSV file
-    contents = await file.read()
-    csv_file = io.StringIO(contents.decode('utf-8'))
-    reader = csv.DictReader(csv_file)
+    """
+    Import transactions from CSV file
     
-    created_transactions = []
-    errors = []
-    
-    for row_num, row in enumerate(reader, start=2):  # Start at 2 (1 is header)
-        try:
-            # Parse CSV row
-            account_id_str = row.get('account_id', '').strip()
-            if account_id:
-                account_id_val = account_id
-            else:
-                account_id_val = int(account_id_str) if account_id_str else None
-            
-            if not account_id_val:
-                errors.append(f"Row {row_num}: Missing account_id")
-                continue
-            
-            # Check account access
-            account = db.query(Account).filter(Account.id == account_id_val).first()
-            if not account:
-                errors.append(f"Row {row_num}: Account not found")
-                continue
-            
-            member = db.query(FamilyMember).filter(
-                FamilyMember.family_id == account.family_id,
-                FamilyMember.user_id == current_user.id,
-                FamilyMember.is_active == True
-            ).first()
-            
-            if not member:
-                errors.append(f"Row {row_num}: You don't have access to this account")
-                continue
-            
-            # Parse transaction data
-            date_str = row.get('date', '').strip()
-            amount_str = row.get('amount', '0').strip()
-            transaction_type_str = row.get('type', 'debit').strip().lower()
-            category = row.get('category', 'other').strip()
-            description = row.get('description', '').strip()
-            transaction_id = row.get('transaction_id', f"csv_{int(datetime.now().timestamp())}_{row_num}").strip()
-            
-            try:
-                transaction_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except:
-                try:
-                    transaction_date = datetime.strptime(date_str, '%Y-%m-%d')
-                except:
-                    errors.append(f"Row {row_num}: Invalid date format '{date_str}'")
-                    continue
-            
-            try:
-                amount = float(amount_str)
-            except ValueError:
-                errors.append(f"Row {row_num}: Invalid amount '{amount_str}'")
-                continue
-            
-            try:
-                transaction_type = TransactionType(transaction_type_str)
-            except ValueError:
-                errors.append(f"Row {row_num}: Invalid transaction type '{transaction_type_str}'")
-                continue
-            
-            # Create transaction
-            transaction = Transaction(
-                account_id=account_id_val,
-                transaction_id=transaction_id,
-                transaction_date=transaction_date,
-                amount=amount,
-                transaction_type=transaction_type,
-                category=category,
-                description=description if description else None
-            )
-            
-            db.add(transaction)
-            created_transactions.append(transaction)
-            
-            # Update account balance
-            if transaction_type == TransactionType.CREDIT:
-                account.current_balance += amount
-            elif transaction_type == TransactionType.DEBIT:
-                account.current_balance -= amount
-            
-        except Exception as e:
-            errors.append(f"Row {row_num}: {str(e)}")
-    
-    if errors:
-        # Still commit successful transactions, but return errors
-        db.commit()
-        for transaction in created_transactions:
-            db.refresh(transaction)
+    Streams the upload in batches; returns 207 with row errors if some rows failed.
+    Declared sync so the long-running import runs in the threadpool, not the event loop.
+    """
+    try:
+        result = TransactionImportService.import_csv(
+            db,
+            file.file,
+            current_user,
+            account_id,
+            use_copy=use_copy
+        )
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_207_MULTI_STATUS,
-            detail={
-                "message": f"Imported {len(created_transactions)} transactions with {len(errors)} errors",
-                "errors": errors,
-                "transactions": [TransactionResponse.from_orm(t).dict() for t in created_transactions]
-            }
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
     
-    db.commit()
-    for transaction in created_transactions:
-        db.refresh(transaction)
+    if result.failed:
+        # Still commit successful transactions, but return errors
+        response.status_code = status.HTTP_207_MULTI_STATUS
     
-    return created_transactions
-
+    return result
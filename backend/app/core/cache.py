@@ -0,0 +1,221 @@
+"""
+Cache backend - Redis with an in-process LRU fallback, plus per-family data versions
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from collections import OrderedDict
+import logging
+import threading
+import time
+import uuid
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_EPOCH_KEY = "cache:epoch"
+FAMILY_VERSION_KEY = "family:{family_id}:version"
+
+
+def _token() -> str:
+    return uuid.uuid4().hex
+
+
+class FamilyVersions(NamedTuple):
+    """Data versions of some families; only comparable under the same epoch"""
+    epoch: str
+    versions: List[str]
+    shared: bool  # From Redis, so every process sees the same values
+
+
+class LocalLRUCache:
+    """Thread-safe in-process LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class Cache:
+    """
+    Redis-backed cache that degrades to a local LRU when Redis is unreachable
+
+    Cache keys carry the family versions and a global epoch. Moving a family's
+    version invalidates its entries; rotating the epoch invalidates every entry
+    in every process. The epoch is rotated when a process reaches Redis after
+    missing a bump, and when a process first reaches Redis, since bumps missed
+    by a process that has since restarted are unknown.
+
+    Family versions and the epoch are random tokens, created with SET NX when
+    missing, so a value never repeats: after Redis is reset or evicts one of
+    them, keys can't collide with entries cached before, such as export files
+    on disk. They are plain keys (no TTL) so that Redis' volatile-lru eviction
+    does not drop them; only cached payloads, which have a TTL, are evicted.
+
+    While Redis is down, payloads go to the local LRU, keyed by a local epoch
+    and versions that only this process moves. Other processes' writes don't
+    reach them, so entries are kept no longer than the Redis retry interval,
+    and the local epoch is renewed each time Redis is found down.
+    """
+
+    def __init__(self, url: str, local_max_entries: int, retry_after_seconds: int):
+        self._client = redis.Redis.from_url(
+            url,
+            socket_connect_timeout=0.25,
+            socket_timeout=0.25,
+            decode_responses=True
+        )
+        self._local = LocalLRUCache(local_max_entries)
+        self._local_epoch = uuid.uuid4().hex
+        self._local_versions: Dict[int, int] = {}
+        self._missed_bumps = True
+        self._retry_after_seconds = retry_after_seconds
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Optional[redis.Redis]:
+        """Redis client, or None while Redis is considered unavailable"""
+        if time.monotonic() < self._down_until:
+            return None
+        return self._client
+
+    def get(self, key: str) -> Optional[str]:
+        client = self.client
+        if client is not None:
+            try:
+                return client.get(key)
+            except redis.RedisError as e:
+                self.mark_down(e)
+        return self._local.get(key)
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        client = self.client
+        if client is not None:
+            try:
+                client.set(key, value, ex=ttl)
+                return
+            except redis.RedisError as e:
+                self.mark_down(e)
+        self._local.set(key, value, min(ttl, self._retry_after_seconds))
+
+    def get_family_versions(self, family_ids: Iterable[int]) -> FamilyVersions:
+        """Current data version of each family, in the order given, with the epoch they belong to"""
+        family_ids = list(family_ids)
+        client = self.client
+        if client is not None:
+            try:
+                epoch = self._epoch(client)
+                keys = [FAMILY_VERSION_KEY.format(family_id=f) for f in family_ids]
+                values = client.mget(keys)
+                missing = [key for key, value in zip(keys, values) if value is None]
+                if missing:
+                    pipe = client.pipeline(transaction=False)
+                    for key in missing:
+                        pipe.set(key, _token(), nx=True)
+                    pipe.execute()
+                    values = client.mget(keys)
+                return FamilyVersions(epoch, values, True)
+            except redis.RedisError as e:
+                self.mark_down(e)
+
+        with self._lock:
+            return FamilyVersions(
+                self._local_epoch,
+                [str(self._local_versions.get(f, 0)) for f in family_ids],
+                False
+            )
+
+    def bump_family_version(self, *family_ids: int) -> None:
+        """Invalidate everything cached for these families by moving their versions on"""
+        family_ids = sorted({f for f in family_ids if f})
+        if not family_ids:
+            return
+
+        with self._lock:
+            for family_id in family_ids:
+                self._local_versions[family_id] = self._local_versions.get(family_id, 0) + 1
+
+        client = self.client
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for family_id in family_ids:
+                    pipe.set(FAMILY_VERSION_KEY.format(family_id=family_id), _token())
+                pipe.execute()
+                return
+            except redis.RedisError as e:
+                self.mark_down(e)
+
+        # Redis missed this write; rotate the epoch once it is reachable again so
+        # no process serves entries cached there before the outage
+        with self._lock:
+            self._missed_bumps = True
+
+    def _epoch(self, client: redis.Redis) -> str:
+        """The shared epoch, rotated first if this process has missed bumps"""
+        with self._lock:
+            rotate, self._missed_bumps = self._missed_bumps, False
+
+        try:
+            if rotate:
+                epoch = _token()
+                client.set(CACHE_EPOCH_KEY, epoch)
+                return epoch
+
+            epoch = client.get(CACHE_EPOCH_KEY)
+            if epoch is None:
+                client.set(CACHE_EPOCH_KEY, _token(), nx=True)
+                epoch = client.get(CACHE_EPOCH_KEY)
+            return epoch
+        except redis.RedisError:
+            if rotate:
+                with self._lock:
+                    self._missed_bumps = True
+            raise
+
+    def mark_down(self, error: Exception) -> None:
+        """Stop using Redis for a while after an error"""
+        if time.monotonic() >= self._down_until:
+            logger.warning(f"Redis unavailable, using in-process cache for {self._retry_after_seconds}s: {error}")
+            # Writes by other processes since the last outage never moved the
+            # local versions, so drop what was cached under them
+            with self._lock:
+                self._local_epoch = uuid.uuid4().hex
+            self._local.clear()
+        self._down_until = time.monotonic() + self._retry_after_seconds
+
+
+cache = Cache(
+    settings.REDIS_URL,
+    local_max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+    retry_after_seconds=settings.CACHE_REDIS_RETRY_SECONDS
+)
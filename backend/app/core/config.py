@@ -49,6 +49,40 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Cache
+    DASHBOARD_CACHE_TTL_SECONDS: int = 300
+    CACHE_LOCAL_MAX_ENTRIES: int = 1024  # In-process LRU size used when Redis is down
+    CACHE_REDIS_RETRY_SECONDS: int = 30  # How long to skip Redis after a failure
+    
+    # Dashboard event stream (SSE)
+    SSE_HEARTBEAT_SECONDS: int = 15
+    SSE_QUEUE_SIZE: int = 100  # Events buffered per listener before it is told to resync
+    
+    # Transaction CSV import
+    TRANSACTION_IMPORT_BATCH_SIZE: int = 1000  # Rows inserted and committed together
+    TRANSACTION_IMPORT_MAX_ERRORS: int = 100  # Row errors listed in the response; the rest are only counted
+    TRANSACTION_IMPORT_COPY_SPOOL_BYTES: int = 8 * 1024 * 1024  # COPY mode buffers this much in memory before spilling to disk
+    
+    # Background import jobs
+    IMPORT_STORAGE_DIR: str = "/tmp/wealthometer/imports"  # Uploaded files wait here until processed
+    IMPORT_MAX_WORKERS: int = 2  # Imports processed concurrently per API process
+    IMPORT_PROGRESS_POLL_SECONDS: float = 1.0  # How often the progress stream checks the job
+    IMPORT_STREAM_MAX_IDLE_SECONDS: int = 600  # The progress stream gives up after this long without progress
+    IMPORT_JOB_HEARTBEAT_SECONDS: int = 30  # How often a process renews the leases on its import jobs
+    IMPORT_JOB_LEASE_SECONDS: int = 120  # Another process takes over a job whose lease is this old
+    
+    # Exports
+    EXPORT_FETCH_ROWS: int = 2000  # Rows fetched per server-side cursor round trip
+    EXPORT_CSV_CHUNK_BYTES: int = 64 * 1024  # CSV output is sent in chunks of about this size
+    EXPORT_ARROW_BATCH_ROWS: int = 65536  # Rows per Parquet row group / Arrow record batch
+    EXPORT_STORAGE_DIR: str = "/tmp/wealthometer/exports"  # Large reports are built here and served from disk
+    EXPORT_CACHE_DIR: str = "/tmp/wealthometer/export-cache"  # Generated exports kept for repeat downloads
+    EXPORT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # Least recently used exports are evicted past this
+    EXPORT_CACHE_TTL_SECONDS: int = 6 * 3600  # Upper bound on how long an export is reused
+    PDF_RENDER_WORKERS: int = 2  # Processes rendering PDF reports, per API process
+    PDF_RENDER_MAX_PENDING: int = 8  # Reports rendering or queued before new ones get 503
+    PDF_RENDER_TIMEOUT_SECONDS: float = 60.0  # Longer renders get 504
+    
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
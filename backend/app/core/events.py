@@ -0,0 +1,126 @@
+"""
+Event broker - fans dashboard events out to SSE listeners across workers via Redis pub/sub
+"""
+
+from typing import Dict, Iterable, Optional, Set
+import asyncio
+import json
+import logging
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "dashboard:events:"
+
+
+class Subscription:
+    """One listener's bounded event queue"""
+
+    def __init__(self, family_ids: Iterable[int], maxsize: int):
+        self.family_ids = set(family_ids)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def deliver(self, message: str) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Slow consumer; drop and tell it to refetch once it catches up
+            self.overflowed = True
+
+
+class EventBroker:
+    """
+    Publishes family events to Redis and relays them to this worker's listeners
+
+    Each worker holds a single pattern subscription, so an idle SSE connection
+    costs one small asyncio.Queue. When Redis is unavailable, events are only
+    delivered to listeners in the publishing worker.
+    """
+
+    def __init__(self, url: str, queue_size: int):
+        self._url = url
+        self._queue_size = queue_size
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[asyncio.Task] = None
+
+    def publish(self, family_id: int, event: dict) -> None:
+        """Publish an event to every listener of a family, in any worker"""
+        message = json.dumps({"family_id": family_id, **event}, default=str)
+
+        client = cache.client
+        if client is not None:
+            try:
+                client.publish(f"{CHANNEL_PREFIX}{family_id}", message)
+                return
+            except redis.RedisError as e:
+                cache.mark_down(e)
+
+        self._deliver_local(family_id, message)
+
+    def subscribe(self, family_ids: Iterable[int]) -> Subscription:
+        """Register a listener; must be called from the event loop"""
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(family_ids, self._queue_size)
+        for family_id in subscription.family_ids:
+            self._subscriptions.setdefault(family_id, set()).add(subscription)
+
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not self._loop:
+            self._listener = self._loop.create_task(self._listen())
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for family_id in subscription.family_ids:
+            listeners = self._subscriptions.get(family_id)
+            if listeners is not None:
+                listeners.discard(subscription)
+                if not listeners:
+                    del self._subscriptions[family_id]
+
+    def _deliver_local(self, family_id: int, message: str) -> None:
+        if self._loop is None or family_id not in self._subscriptions:
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self._loop:
+            self._dispatch(family_id, message)
+        else:
+            # Published from a worker thread (e.g. a background import)
+            self._loop.call_soon_threadsafe(self._dispatch, family_id, message)
+
+    def _dispatch(self, family_id: int, message: str) -> None:
+        for subscription in list(self._subscriptions.get(family_id, ())):
+            subscription.deliver(message)
+
+    async def _listen(self) -> None:
+        """Relay Redis pub/sub messages to local listeners, reconnecting while Redis is down"""
+        while True:
+            client = aioredis.from_url(self._url, decode_responses=True)
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    family_id = int(message["channel"][len(CHANNEL_PREFIX):])
+                    self._dispatch(family_id, message["data"])
+            except (redis.RedisError, OSError) as e:
+                logger.warning(f"Dashboard event subscription lost, retrying in {settings.CACHE_REDIS_RETRY_SECONDS}s: {e}")
+            finally:
+                await client.aclose()
+
+            await asyncio.sleep(settings.CACHE_REDIS_RETRY_SECONDS)
+
+
+event_broker = EventBroker(settings.REDIS_URL, queue_size=settings.SSE_QUEUE_SIZE)
@@ -4,19 +4,36 @@ Main FastAPI application
 """
 
 import os
+from contextlib import asynccontextmanager
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.services.import_jobs import ImportJobService
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Take over imports whose process stopped, and keep this process's leases alive
+    try:
+        ImportJobService.start()
+    except Exception:
+        logger.exception("Could not reclaim unfinished import jobs")
+    yield
+
 
 app = FastAPI(
     title="WealthoMeter API",
     description="Family Wealth Aggregator MVP",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware
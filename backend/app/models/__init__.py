@@ -4,9 +4,12 @@ Database models
 
 from app.models.user import User
 from app.models.family import Family, FamilyMember
-from app.models.account import Account, AccountType
-from app.models.transaction import Transaction
+from app.models.account import Account, AccountType, AccountEvent
+from app.models.transaction import Transaction, TransactionKey, MonthlyCategoryRollup
 from app.models.consent import ConsentLog
+from app.models.net_worth import FamilyNetWorth, NetWorthHistory
+from app.models.import_job import ImportJob
+from app.models.category_rule import CategoryRule
 
 __all__ = [
     "User",
@@ -14,7 +17,14 @@ __all__ = [
     "FamilyMember",
     "Account",
     "AccountType",
+    "AccountEvent",
     "Transaction",
+    "TransactionKey",
+    "MonthlyCategoryRollup",
     "ConsentLog",
+    "FamilyNetWorth",
+    "NetWorthHistory",
+    "ImportJob",
+    "CategoryRule",
 ]
 
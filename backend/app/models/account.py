@@ -2,7 +2,7 @@
 Account model - represents linked accounts (banks, credit cards, FDs, MFs, stocks)
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Numeric, Enum as SQLEnum, Text, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Numeric, Enum as SQLEnum, Text, JSON, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -43,6 +43,12 @@ class AccountProvider(str, enum.Enum):
     PDF_IMPORT = "pdf_import"
 
 
+class AccountEventType(str, enum.Enum):
+    """Dated account events that can raise alerts"""
+    CREDIT_CARD_DUE = "credit_card_due"
+    FD_MATURITY = "fd_maturity"
+
+
 class Account(Base):
     __tablename__ = "accounts"
 
@@ -85,4 +91,32 @@ class Account(Base):
     family = relationship("Family", back_populates="accounts")
     owner = relationship("User", back_populates="accounts")
     transactions = relationship("Transaction", back_populates="account", cascade="all, delete-orphan")
+    events = relationship("AccountEvent", back_populates="account", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Every listing filters on family_id IN (...) AND is_active
+        Index("ix_accounts_family_active", "family_id", postgresql_where=text("is_active")),
+    )
+
+
+class AccountEvent(Base):
+    __tablename__ = "account_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
+    family_id = Column(Integer, ForeignKey("families.id"), nullable=False)
+    
+    # Event details, promoted from account_metadata (due_date / maturity_date)
+    event_type = Column(SQLEnum(AccountEventType), nullable=False)
+    event_date = Column(DateTime, nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    account = relationship("Account", back_populates="events")
+    
+    __table_args__ = (
+        Index("ix_account_events_family_date", "family_id", "event_date"),
+    )
 
@@ -0,0 +1,25 @@
+"""
+Category rule model - per-family keywords for auto-categorizing transactions
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, Enum as SQLEnum
+from datetime import datetime
+
+from app.core.database import Base
+from app.models.transaction import TransactionCategory
+
+
+class CategoryRule(Base):
+    """A keyword that labels matching transaction descriptions with a category"""
+    __tablename__ = "category_rules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    family_id = Column(Integer, ForeignKey("families.id"), nullable=False)
+    keyword = Column(String(100), nullable=False)  # Lowercased; matched on word boundaries
+    category = Column(SQLEnum(TransactionCategory), nullable=False)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("family_id", "keyword", name="uq_category_rules_family_keyword"),
+    )
@@ -2,7 +2,7 @@
 Family and FamilyMember models
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, text, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -31,6 +31,7 @@ class Family(Base):
     # Relationships
     members = relationship("FamilyMember", back_populates="family", cascade="all, delete-orphan")
     accounts = relationship("Account", back_populates="family", cascade="all, delete-orphan")
+    net_worth = relationship("FamilyNetWorth", back_populates="family", uselist=False, cascade="all, delete-orphan")
 
 
 class FamilyMember(Base):
@@ -54,4 +55,11 @@ class FamilyMember(Base):
     # Relationships
     family = relationship("Family", back_populates="members")
     user = relationship("User", back_populates="families", foreign_keys=[user_id])
+    
+    __table_args__ = (
+        # Access checks: (family_id, user_id, is_active) and "my families" by user_id
+        Index("ix_family_members_user_family_active", "user_id", "family_id", postgresql_where=text("is_active")),
+        # Member listings by family
+        Index("ix_family_members_family_active", "family_id", postgresql_where=text("is_active")),
+    )
 
@@ -0,0 +1,63 @@
+"""
+Import job model - background CSV imports and their progress
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index, Enum as SQLEnum
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+
+from app.core.database import Base
+
+
+class ImportKind(str, enum.Enum):
+    """What an import file contains"""
+    TRANSACTIONS = "transactions"
+    ACCOUNTS = "accounts"
+
+
+class ImportStatus(str, enum.Enum):
+    """Import job lifecycle"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    kind = Column(SQLEnum(ImportKind), nullable=False)
+    status = Column(SQLEnum(ImportStatus), default=ImportStatus.QUEUED, nullable=False)
+
+    # Uploaded file, kept on local disk until the job finishes
+    filename = Column(String(255), nullable=True)
+    file_path = Column(String(1024), nullable=True)
+    params = Column(JSON, nullable=True)  # account_id / family_id / use_copy
+
+    # Progress
+    rows_done = Column(Integer, default=0, nullable=False)
+    rows_imported = Column(Integer, default=0, nullable=False)
+    rows_skipped = Column(Integer, default=0, nullable=False)
+    rows_failed = Column(Integer, default=0, nullable=False)
+    errors = Column(JSON, nullable=True)  # First row errors
+    error_message = Column(Text, nullable=True)  # Why the job as a whole failed
+
+    # Lease: the process handling the job ("host:pid:nonce") and when it last renewed it
+    worker_id = Column(String(255), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Relationships
+    user = relationship("User")
+
+    __table_args__ = (
+        Index("ix_import_jobs_user_created", "user_id", "created_at"),
+        Index("ix_import_jobs_status_heartbeat", "status", "heartbeat_at"),
+    )
@@ -0,0 +1,64 @@
+"""
+Net worth models - precomputed per-family totals and their daily history
+"""
+
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, Numeric, JSON, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class FamilyNetWorth(Base):
+    __tablename__ = "family_net_worth"
+
+    id = Column(Integer, primary_key=True, index=True)
+    family_id = Column(Integer, ForeignKey("families.id"), unique=True, index=True, nullable=False)
+
+    # Totals over active LINKED/PENDING accounts
+    total_assets = Column(Numeric(15, 2), nullable=False, default=0)
+    total_liabilities = Column(Numeric(15, 2), nullable=False, default=0)
+
+    # Positive balance per AccountType value, e.g. {"savings": "1200.00"}
+    allocation = Column(JSON, nullable=False, default=dict)
+
+    # Sync information
+    last_synced_at = Column(DateTime, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    family = relationship("Family", back_populates="net_worth")
+
+
+class NetWorthHistory(Base):
+    __tablename__ = "net_worth_history"
+
+    id = Column(Integer, primary_key=True, index=True)
+    family_id = Column(Integer, ForeignKey("families.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # NULL for the family total
+    snapshot_date = Column(Date, nullable=False)
+
+    # Totals at end of day
+    net_worth = Column(Numeric(15, 2), nullable=False)
+    total_assets = Column(Numeric(15, 2), nullable=False)
+    total_liabilities = Column(Numeric(15, 2), nullable=False)
+
+    # One row per family total and per member a day. Partial indexes, since
+    # NULL user_ids never conflict in a plain unique index
+    __table_args__ = (
+        Index(
+            "uq_net_worth_history_member", "family_id", "user_id", "snapshot_date",
+            unique=True,
+            postgresql_where=user_id.isnot(None),
+            sqlite_where=user_id.isnot(None)
+        ),
+        Index(
+            "uq_net_worth_history_family", "family_id", "snapshot_date",
+            unique=True,
+            postgresql_where=user_id.is_(None),
+            sqlite_where=user_id.is_(None)
+        ),
+    )
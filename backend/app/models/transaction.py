@@ -2,8 +2,9 @@
 Transaction model
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Numeric, Text, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Numeric, Text, Index, UniqueConstraint, DDL, event, text, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import enum
 
@@ -40,12 +41,17 @@ class TransactionCategory(str, enum.Enum):
 class Transaction(Base):
     __tablename__ = "transactions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # In PostgreSQL the table is range-partitioned by month on transaction_date, so
+    # the primary key has to include it; id alone still identifies a row
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    # The account's family, copied on insert so family-scoped queries need no account join
+    family_id = Column(Integer, ForeignKey("families.id"), nullable=False)
     
     # Transaction details
-    transaction_id = Column(String(255), unique=True, index=True, nullable=False)  # Provider transaction ID
-    transaction_date = Column(DateTime, nullable=False, index=True)
+    # Provider transaction ID; unique across partitions through transaction_keys
+    transaction_id = Column(String(255), index=True, nullable=False)
+    transaction_date = Column(DateTime, primary_key=True, nullable=False, index=True)
     amount = Column(Numeric(15, 2), nullable=False)
     currency = Column(String(3), default="INR")
     transaction_type = Column(SQLEnum(TransactionType), nullable=False)
@@ -62,6 +68,10 @@ class Transaction(Base):
     # Metadata
     transaction_metadata = Column(Text, nullable=True)  # JSON string for additional data
     
+    # Full-text search over merchant_name (weight A) and description (weight B),
+    # maintained by the transactions_search_vector_update trigger
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -70,3 +80,143 @@ class Transaction(Base):
     # Relationships
     account = relationship("Account", back_populates="transactions")
 
+    __table_args__ = (
+        # Keyset pagination: newest first, id breaks ties within a timestamp.
+        # Partial on is_active since soft-deleted rows are never listed.
+        Index("ix_transactions_account_date_id", "account_id", "transaction_date", "id", postgresql_where=text("is_active")),
+        Index("ix_transactions_date_id", "transaction_date", "id", postgresql_where=text("is_active")),
+        Index("ix_transactions_family_date_id", "family_id", "transaction_date", "id", postgresql_where=text("is_active")),
+        # Search: ranked full-text, plus trigram for partial words
+        Index("ix_transactions_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_transactions_merchant_trgm", "merchant_name",
+            postgresql_using="gin", postgresql_ops={"merchant_name": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_transactions_description_trgm", "description",
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}
+        ),
+        {"postgresql_partition_by": "RANGE (transaction_date)"},
+    )
+
+    __mapper_args__ = {"primary_key": [id]}
+
+
+class TransactionKey(Base):
+    """
+    One row per transaction_id ever inserted
+
+    A unique index on a partitioned table must include the partition key, so
+    transaction_id uniqueness (what makes imports idempotent) lives here.
+    Claim the key first and insert the transaction only if the claim succeeded.
+    """
+    __tablename__ = "transaction_keys"
+
+    transaction_id = Column(String(255), primary_key=True)
+    transaction_date = Column(DateTime, nullable=False)
+
+
+# Text search configuration for search_vector; 'simple' because merchant names
+# and bank narrations don't stem like English prose
+SEARCH_CONFIG = "simple"
+
+SEARCH_VECTOR_TRIGGER = f"""
+CREATE OR REPLACE FUNCTION transactions_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.merchant_name, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS transactions_search_vector_trigger ON transactions;
+CREATE TRIGGER transactions_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF description, merchant_name ON transactions
+    FOR EACH ROW EXECUTE FUNCTION transactions_search_vector_update();
+"""
+
+# create_all (init_db.py) path; existing databases get these from the Alembic migration
+event.listen(
+    Transaction.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+event.listen(
+    Transaction.__table__,
+    "after_create",
+    DDL(SEARCH_VECTOR_TRIGGER).execute_if(dialect="postgresql")
+)
+
+# Creates the monthly partition holding `month`, e.g. transactions_2026_01. Rows
+# that were routed to transactions_default in the meantime move into it.
+PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_transactions_partition(month date) RETURNS void AS $$
+DECLARE
+    start_date date := date_trunc('month', month)::date;
+    end_date date := (date_trunc('month', month) + interval '1 month')::date;
+    partition_name text := 'transactions_' || to_char(start_date, 'YYYY_MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+
+    -- One creator at a time; re-check once the lock is held
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_transactions_partition'));
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE transactions INCLUDING DEFAULTS)', partition_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM transactions_default WHERE transaction_date >= %L AND transaction_date < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        start_date, end_date, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE transactions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, start_date, end_date
+    );
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# Months after the current one that always have a partition ready
+PARTITION_MONTHS_AHEAD = 3
+
+event.listen(
+    Transaction.__table__,
+    "after_create",
+    DDL(PARTITION_FUNCTION).execute_if(dialect="postgresql")
+)
+event.listen(
+    Transaction.__table__,
+    "after_create",
+    DDL(f"""
+        CREATE TABLE IF NOT EXISTS transactions_default PARTITION OF transactions DEFAULT;
+        SELECT ensure_transactions_partition(month::date)
+        FROM generate_series(
+            date_trunc('month', now()),
+            date_trunc('month', now()) + interval '{PARTITION_MONTHS_AHEAD} months',
+            interval '1 month'
+        ) AS month;
+    """).execute_if(dialect="postgresql")
+)
+
+
+class MonthlyCategoryRollup(Base):
+    """Per account, month, category and type totals of active transactions"""
+    __tablename__ = "monthly_category_rollup"
+
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    month = Column(Date, nullable=False)  # First day of the month
+    category = Column(SQLEnum(TransactionCategory), nullable=False)
+    transaction_type = Column(SQLEnum(TransactionType), nullable=False)
+
+    total = Column(Numeric(15, 2), nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("account_id", "month", "category", "transaction_type", name="uq_monthly_category_rollup_key"),
+    )
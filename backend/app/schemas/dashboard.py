@@ -4,7 +4,7 @@ Dashboard schemas
 
 from pydantic import BaseModel
 from typing import List, Dict, Optional
-from datetime import datetime
+from datetime import datetime, date
 from decimal import Decimal
 
 
@@ -52,10 +52,27 @@ class Alert(BaseModel):
 
 
 class DashboardResponse(BaseModel):
-    net_worth: NetWorthResponse
-    asset_allocation: AssetAllocationResponse
-    member_net_worth: List[MemberNetWorth]
-    top_movers: List[TopMover]
-    alerts: List[Alert]
+    # Sections that were not requested are left as None
+    net_worth: Optional[NetWorthResponse] = None
+    asset_allocation: Optional[AssetAllocationResponse] = None
+    member_net_worth: Optional[List[MemberNetWorth]] = None
+    top_movers: Optional[List[TopMover]] = None
+    alerts: Optional[List[Alert]] = None
     last_synced: Optional[datetime] = None
 
+
+class NetWorthHistoryPoint(BaseModel):
+    date: date
+    net_worth: Decimal
+    total_assets: Decimal
+    total_liabilities: Decimal
+
+
+class NetWorthHistoryResponse(BaseModel):
+    family_id: int
+    user_id: Optional[int] = None
+    start_date: date
+    end_date: date
+    points: List[NetWorthHistoryPoint]
+    currency: str = "INR"
+
@@ -2,10 +2,11 @@
 Family schemas
 """
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
 from app.models.family import FamilyRole
+from app.models.transaction import TransactionCategory
 
 
 class FamilyBase(BaseModel):
@@ -67,3 +68,19 @@ class FamilyMemberResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class CategoryRuleCreate(BaseModel):
+    keyword: str = Field(..., min_length=1, max_length=100)  # Merchant name or keyword, matched case-insensitively
+    category: TransactionCategory
+
+
+class CategoryRuleResponse(BaseModel):
+    id: int
+    family_id: int
+    keyword: str
+    category: TransactionCategory
+    created_by: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,27 @@
+"""
+Import job schemas
+"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from app.models.import_job import ImportKind, ImportStatus
+
+
+class ImportJobResponse(BaseModel):
+    id: int
+    kind: ImportKind
+    status: ImportStatus
+    filename: Optional[str] = None
+    rows_done: int
+    rows_imported: int
+    rows_skipped: int
+    rows_failed: int
+    errors: Optional[List[str]] = None
+    error_message: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
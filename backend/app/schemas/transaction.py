@@ -2,9 +2,9 @@
 Transaction schemas
 """
 
-from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from datetime import date, datetime
 from decimal import Decimal
 from app.models.transaction import TransactionType, TransactionCategory
 
@@ -21,7 +21,7 @@ class TransactionBase(BaseModel):
 
 class TransactionCreate(TransactionBase):
     account_id: int
-    transaction_id: str  # Provider transaction ID
+    transaction_id: Optional[str] = None  # Provider transaction ID; a content fingerprint when omitted
     currency: str = "INR"
     balance_after: Optional[Decimal] = None
     metadata: Optional[str] = None
@@ -47,3 +47,60 @@ class TransactionResponse(TransactionBase):
     class Config:
         from_attributes = True
 
+
+class TransactionPage(BaseModel):
+    """One page of a cursor-paginated transaction listing"""
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class TransactionImportResult(BaseModel):
+    """Outcome of a CSV transaction import"""
+    rows: int
+    imported: int
+    skipped: int  # Already imported earlier, or repeated within the file
+    failed: int
+    errors: List[str]  # First TRANSACTION_IMPORT_MAX_ERRORS row errors
+    duration_seconds: float
+    rows_per_second: float
+
+
+# Largest batch accepted by POST /transactions/batch
+MAX_BATCH_ITEMS = 5000
+
+
+class TransactionBatchCreate(BaseModel):
+    items: List[TransactionCreate] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class TransactionBatchItemResult(BaseModel):
+    index: int  # Position in the request's items
+    status: Literal["created", "exists", "error"]
+    id: Optional[int] = None
+    transaction_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class TransactionBatchResult(BaseModel):
+    created: int
+    existing: int
+    failed: int
+    results: List[TransactionBatchItemResult]
+
+
+class TransactionSummaryRow(BaseModel):
+    """Totals for one group; only the fields named in group_by are set"""
+    month: Optional[date] = None  # First day of the month
+    category: Optional[TransactionCategory] = None
+    account_id: Optional[int] = None
+    member_id: Optional[int] = None  # Account owner
+    debit_total: Decimal
+    credit_total: Decimal
+    count: int
+
+
+class TransactionSummary(BaseModel):
+    group_by: List[str]
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    rows: List[TransactionSummaryRow]
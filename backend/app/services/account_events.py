@@ -0,0 +1,134 @@
+"""
+Account event service - typed, indexed due/maturity dates backing dashboard alerts
+"""
+
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.models.account import Account, AccountType, AccountEvent, AccountEventType
+from app.schemas.dashboard import Alert
+from app.services.net_worth import COUNTED_STATUSES
+
+# Which metadata key is promoted to an event for each account type
+EVENT_SOURCES = {
+    AccountType.CREDIT_CARD: ("due_date", AccountEventType.CREDIT_CARD_DUE),
+    AccountType.FIXED_DEPOSIT: ("maturity_date", AccountEventType.FD_MATURITY),
+}
+
+# How far ahead an event starts showing as an alert
+ALERT_WINDOWS = {
+    AccountEventType.CREDIT_CARD_DUE: timedelta(days=7),
+    AccountEventType.FD_MATURITY: timedelta(days=30),
+}
+
+
+class AccountEventService:
+    """Service for keeping account_events in step with account metadata"""
+
+    @staticmethod
+    def sync_account(db: Session, account: Account) -> None:
+        """Replace an account's events with those derived from its current metadata"""
+        if account.id is None:
+            db.flush()
+
+        db.query(AccountEvent).filter(
+            AccountEvent.account_id == account.id
+        ).delete(synchronize_session=False)
+
+        event = AccountEventService._event_for(account)
+        if event:
+            db.add(event)
+
+    @staticmethod
+    def rebuild_all(db: Session, batch_size: int = 1000) -> int:
+        """Backfill events for every account that has a due or maturity date"""
+        created = 0
+        accounts = db.query(Account).filter(
+            Account.account_type.in_(list(EVENT_SOURCES.keys()))
+        ).yield_per(batch_size)
+
+        db.query(AccountEvent).delete(synchronize_session=False)
+        for account in accounts:
+            event = AccountEventService._event_for(account)
+            if event:
+                db.add(event)
+                created += 1
+
+        db.commit()
+        return created
+
+    @staticmethod
+    def upcoming_query(db: Session, family_ids: List[int], now: Optional[datetime] = None):
+        """
+        Query of (AccountEvent, Account) pairs currently inside their alert window
+
+        A single range scan over (family_id, event_date); each event type has its
+        own window, so the bound is `event_date <= now + window` per type.
+        """
+        now = now or datetime.utcnow()
+        in_window = or_(*[
+            and_(AccountEvent.event_type == event_type, AccountEvent.event_date <= now + window)
+            for event_type, window in ALERT_WINDOWS.items()
+        ])
+
+        return db.query(AccountEvent, Account).join(
+            Account, AccountEvent.account_id == Account.id
+        ).filter(
+            AccountEvent.family_id.in_(family_ids),
+            in_window,
+            Account.is_active == True,
+            Account.status.in_(COUNTED_STATUSES)
+        ).order_by(AccountEvent.event_date, AccountEvent.id)
+
+    @staticmethod
+    def to_alert(event: AccountEvent, account: Account) -> Alert:
+        """Render an account event as a dashboard alert"""
+        if event.event_type == AccountEventType.CREDIT_CARD_DUE:
+            title = "Credit Card Payment Due"
+            message = f"{account.name} payment due on {event.event_date.strftime('%Y-%m-%d')}"
+        else:
+            title = "FD Maturity"
+            message = f"{account.name} matures on {event.event_date.strftime('%Y-%m-%d')}"
+
+        return Alert(
+            type=event.event_type.value,
+            title=title,
+            message=message,
+            account_id=account.id,
+            due_date=event.event_date,
+            amount=account.current_balance
+        )
+
+    @staticmethod
+    def _event_for(account: Account) -> Optional[AccountEvent]:
+        source = EVENT_SOURCES.get(account.account_type)
+        if not source or account.is_active is False or not account.account_metadata:
+            return None
+
+        key, event_type = source
+        event_date = _parse_date(account.account_metadata.get(key))
+        if not event_date:
+            return None
+
+        return AccountEvent(
+            account_id=account.id,
+            family_id=account.family_id,
+            event_type=event_type,
+            event_date=event_date
+        )
+
+
+def _parse_date(value) -> Optional[datetime]:
+    """Parse an ISO date/datetime from metadata, ignoring anything unparseable"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    # Stored naive in UTC like every other DateTime column
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
@@ -0,0 +1,132 @@
+"""
+Account import service - creates accounts from CSV uploads
+"""
+
+from typing import BinaryIO, Callable, List, NamedTuple, Optional
+from decimal import Decimal, InvalidOperation
+import csv
+import io
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.models.account import Account, AccountType, AccountStatus, AccountProvider
+from app.models.user import User
+from app.services.account_events import AccountEventService
+from app.services.dashboard_events import DashboardEventService
+from app.services.net_worth import NetWorthService
+
+
+class AccountImportResult(NamedTuple):
+    accounts: List[Account]
+    rows: int
+    errors: List[str]
+
+
+class AccountImportService:
+    """Service for importing accounts from CSV"""
+
+    @staticmethod
+    def import_csv(
+        db: Session,
+        stream: BinaryIO,
+        user: User,
+        family_id: int,
+        progress: Optional[Callable[[int, int, List[str]], None]] = None
+    ) -> AccountImportResult:
+        """
+        Create an account per CSV row in `family_id`, committing in batches
+
+        The caller checks the user may create accounts in the family. `progress` is
+        called with (rows read, accounts created, errors) after every commit.
+        """
+        created_accounts: List[Account] = []
+        errors: List[str] = []
+        rows = 0
+        pending = 0
+
+        def commit():
+            db.commit()
+            cache.bump_family_version(family_id)
+            DashboardEventService.publish_changes(db)
+            if progress:
+                progress(rows, len(created_accounts), errors)
+
+        decoded = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        try:
+            for row_num, row in enumerate(csv.DictReader(decoded), start=2):  # Start at 2 (1 is header)
+                rows += 1
+                try:
+                    account = AccountImportService._create_account(db, user, family_id, row_num, row)
+                except ValueError as e:
+                    errors.append(f"Row {row_num}: {e}")
+                    continue
+
+                created_accounts.append(account)
+                pending += 1
+                if pending >= settings.TRANSACTION_IMPORT_BATCH_SIZE:
+                    commit()
+                    pending = 0
+
+            commit()
+        finally:
+            # Leave the underlying upload open for its owner to close
+            decoded.detach()
+
+        return AccountImportResult(accounts=created_accounts, rows=rows, errors=errors)
+
+    @staticmethod
+    def _create_account(db: Session, user: User, family_id: int, row_num: int, row: dict) -> Account:
+        # Parse CSV row
+        name = (row.get('name') or '').strip()
+        account_type_str = (row.get('account_type') or 'savings').strip().lower()
+        balance_str = (row.get('balance') or '0').strip()
+        account_number_last_4 = (row.get('account_number_last_4') or '').strip()
+        due_date = (row.get('due_date') or '').strip()
+        maturity_date = (row.get('maturity_date') or '').strip()
+
+        if not name:
+            raise ValueError("Missing account name")
+
+        # Validate account type
+        try:
+            account_type = AccountType(account_type_str)
+        except ValueError:
+            raise ValueError(f"Invalid account type '{account_type_str}'")
+
+        # Parse balance
+        try:
+            balance = Decimal(balance_str) if balance_str else Decimal("0")
+        except InvalidOperation:
+            raise ValueError(f"Invalid balance '{balance_str}'")
+        if not balance.is_finite():
+            raise ValueError(f"Invalid balance '{balance_str}'")
+
+        # Optional credit card due date / FD maturity date
+        metadata = {}
+        if due_date:
+            metadata['due_date'] = due_date
+        if maturity_date:
+            metadata['maturity_date'] = maturity_date
+
+        # Create account
+        account = Account(
+            family_id=family_id,
+            owner_id=user.id,
+            name=name,
+            account_type=account_type,
+            provider=AccountProvider.CSV_IMPORT,
+            account_number_last_4=account_number_last_4 if account_number_last_4 else None,
+            current_balance=balance,
+            currency="INR",
+            account_metadata=metadata or None,
+            status=AccountStatus.LINKED
+        )
+
+        db.add(account)
+        NetWorthService.record_change(db, None, NetWorthService.snapshot(account))
+        if metadata:
+            AccountEventService.sync_account(db, account)
+
+        return account
@@ -0,0 +1,212 @@
+"""
+Categorization service - labels transactions from merchant and keyword rules at ingest
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import re
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.models.category_rule import CategoryRule
+from app.models.transaction import TransactionCategory
+
+# Built-in merchant and keyword rules. When several keywords match, the category
+# listed first wins, so "NEFT SALARY ACME" is salary rather than a transfer.
+BUILTIN_RULES: Dict[TransactionCategory, Tuple[str, ...]] = {
+    TransactionCategory.SALARY: (
+        "salary", "payroll", "sal credit", "wages", "stipend",
+    ),
+    TransactionCategory.INVESTMENT: (
+        "zerodha", "groww", "upstox", "kuvera", "paytm money", "angel one", "smallcase",
+        "mutual fund", "sip", "nps", "ppf", "cams", "kfintech", "bse star mf", "fixed deposit",
+    ),
+    TransactionCategory.BILLS: (
+        "electricity", "bescom", "tneb", "msedcl", "tata power", "adani electricity",
+        "airtel", "jio", "vodafone", "vi postpaid", "bsnl", "act fibernet", "broadband",
+        "indane", "bharat gas", "hp gas", "mahanagar gas", "water bill", "rent",
+        "tata play", "dth", "recharge", "credit card bill", "emi", "lic", "insurance premium",
+    ),
+    TransactionCategory.EDUCATION: (
+        "school", "college", "university", "tuition", "byjus", "byju's", "unacademy",
+        "vedantu", "coursera", "udemy", "upgrad", "exam fee",
+    ),
+    TransactionCategory.HEALTHCARE: (
+        "apollo", "pharmeasy", "1mg", "netmeds", "medplus", "pharmacy", "chemist",
+        "hospital", "clinic", "diagnostics", "practo", "lal pathlabs", "dental",
+    ),
+    TransactionCategory.ENTERTAINMENT: (
+        "netflix", "hotstar", "disney", "prime video", "spotify", "youtube premium",
+        "sonyliv", "zee5", "jiocinema", "bookmyshow", "pvr", "inox", "steam",
+    ),
+    TransactionCategory.FOOD: (
+        "swiggy", "zomato", "eatsure", "dominos", "domino's", "mcdonalds", "mcdonald's",
+        "kfc", "pizza hut", "burger king", "subway", "starbucks", "cafe coffee day",
+        "chaayos", "haldiram", "restaurant", "cafe", "bakery", "dhaba",
+        "bigbasket", "blinkit", "zepto", "instamart", "grofers", "jiomart",
+    ),
+    TransactionCategory.TRANSPORT: (
+        "uber", "ola", "rapido", "blusmart", "meru", "irctc", "redbus", "metro",
+        "fastag", "petrol", "diesel", "fuel", "indian oil", "iocl", "hpcl", "bpcl",
+        "indigo", "air india", "vistara", "akasa", "spicejet", "makemytrip", "goibibo",
+        "cleartrip", "parking",
+    ),
+    TransactionCategory.SHOPPING: (
+        "amazon", "flipkart", "myntra", "ajio", "nykaa", "meesho", "tata cliq",
+        "snapdeal", "dmart", "reliance digital", "croma", "decathlon", "ikea",
+        "lifestyle", "pantaloons", "westside", "shoppers stop", "lenskart",
+    ),
+    TransactionCategory.TRANSFER: (
+        "neft", "imps", "rtgs", "self transfer", "fund transfer", "atm withdrawal", "cash withdrawal",
+    ),
+}
+
+# Compiled matchers by family rule set; families without rules share one
+MATCHER_CACHE_SIZE = 256
+_matchers: "OrderedDict[tuple, CategoryMatcher]" = OrderedDict()
+_lock = threading.Lock()
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Lowercase a keyword and collapse its whitespace"""
+    return " ".join(keyword.lower().split())
+
+
+def _trie_pattern(node: dict) -> str:
+    """
+    Regex for the keywords in a character trie, with shared prefixes factored out
+
+    The regex engine then walks the trie once per position instead of trying each
+    keyword in turn; longer keywords are tried before their prefixes.
+    """
+    branches = [
+        (r"\s+" if char == " " else re.escape(char)) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and "" not in node:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if "" in node else group
+
+
+class CategoryMatcher:
+    """All rules compiled into a single pattern; one scan labels a description"""
+
+    def __init__(self, rules: Sequence[Tuple[str, TransactionCategory, int]]):
+        """`rules` are (keyword, category, rank); the lowest rank wins when several match"""
+        self.rules: Dict[str, Tuple[int, TransactionCategory]] = {}
+        trie: dict = {}
+        for keyword, category, rank in rules:
+            keyword = normalize_keyword(keyword)
+            if not keyword or keyword in self.rules:
+                continue
+            self.rules[keyword] = (rank, category)
+
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        # A zero-width lookahead reports a keyword at every word start, so matches
+        # may overlap: "hp gas station" yields both "hp gas" and "gas station"
+        self.pattern = re.compile(
+            r"(?<![^\W_])(?=((?:" + _trie_pattern(trie) + r"))(?![^\W_]))"
+        ) if trie else None
+        self.top_rank = min((rank for rank, _ in self.rules.values()), default=0)
+
+        # The pattern reports the longest keyword at each position; shorter ones
+        # ending there at a word boundary match too ("paytm" in "paytm money")
+        self.matches: Dict[str, List[Tuple[int, TransactionCategory]]] = {
+            keyword: [rule] + [
+                self.rules[keyword[:end]]
+                for end in range(len(keyword) - 1, 0, -1)
+                if not keyword[end].isalnum() and keyword[:end] in self.rules
+            ]
+            for keyword, rule in self.rules.items()
+        }
+
+    def categorize(self, text: Optional[str]) -> Optional[TransactionCategory]:
+        """Category of the best-ranked keyword in `text`, or None when nothing matches"""
+        if not text or self.pattern is None:
+            return None
+
+        best = None
+        for match in self.pattern.finditer(text.lower()):
+            keyword = match.group(1)
+            for rule in self.matches.get(keyword) or self.matches[_WHITESPACE.sub(" ", keyword)]:
+                if best is None or rule[0] < best[0]:
+                    best = rule
+                    if rule[0] == self.top_rank:
+                        return best[1]
+        return best[1] if best else None
+
+    def categorize_many(self, texts: Iterable[Optional[str]]) -> List[Optional[TransactionCategory]]:
+        categorize = self.categorize
+        return [categorize(text) for text in texts]
+
+
+class CategorizationService:
+    """Service for auto-categorizing transactions from built-in and family rules"""
+
+    @staticmethod
+    def build_matcher(family_rules: Iterable[Tuple[str, TransactionCategory]] = ()) -> CategoryMatcher:
+        """Compile family rules (which take precedence) together with the built-in rules"""
+        rules = [(keyword, category, 0) for keyword, category in family_rules]
+        for rank, (category, keywords) in enumerate(BUILTIN_RULES.items(), start=1):
+            rules.extend((keyword, category, rank) for keyword in keywords)
+        return CategoryMatcher(rules)
+
+    @staticmethod
+    def matcher(db: Session, family_id: int) -> CategoryMatcher:
+        """The compiled matcher for a family, reused while its rules are unchanged"""
+        key = tuple(
+            (keyword, category)
+            for keyword, category in db.query(CategoryRule.keyword, CategoryRule.category).filter(
+                CategoryRule.family_id == family_id
+            ).order_by(CategoryRule.keyword)
+        )
+
+        with _lock:
+            matcher = _matchers.get(key)
+            if matcher is not None:
+                _matchers.move_to_end(key)
+                return matcher
+
+        matcher = CategorizationService.build_matcher(key)
+        with _lock:
+            _matchers[key] = matcher
+            while len(_matchers) > MATCHER_CACHE_SIZE:
+                _matchers.popitem(last=False)
+        return matcher
+
+    @staticmethod
+    def categorize_rows(db: Session, rows: List[dict], matchers: Optional[Dict[int, CategoryMatcher]] = None) -> None:
+        """
+        Fill in the category of transaction insert values that have none
+
+        Rows are labelled from their merchant name, then their description;
+        unmatched rows become OTHER. Pass the same `matchers` dict across calls to
+        load each family's rules once per import.
+        """
+        if matchers is None:
+            matchers = {}
+
+        for row in rows:
+            if row.get("category") is not None:
+                continue
+
+            family_id = row["family_id"]
+            if family_id not in matchers:
+                matchers[family_id] = CategorizationService.matcher(db, family_id)
+            matcher = matchers[family_id]
+
+            category = matcher.categorize(row.get("merchant_name"))
+            if category is None:
+                category = matcher.categorize(row.get("description"))
+            row["category"] = category or TransactionCategory.OTHER
@@ -0,0 +1,256 @@
+"""
+Dashboard aggregation service - set-based queries whose count doesn't grow with family size
+"""
+
+from typing import Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache
+from app.models.user import User
+from app.models.account import Account
+from app.models.family import FamilyMember
+from app.models.transaction import Transaction, TransactionType
+from app.schemas.dashboard import (
+    DashboardResponse,
+    NetWorthResponse,
+    AssetAllocationResponse,
+    AssetAllocationItem,
+    MemberNetWorth,
+    TopMover,
+    Alert
+)
+from app.services.net_worth import NetWorthService, COUNTED_STATUSES
+from app.services.account_events import AccountEventService
+
+# Sections a dashboard request can ask for, in response order
+DASHBOARD_SECTIONS = ("net_worth", "allocation", "members", "movers", "alerts")
+
+# Transactions at or above this amount raise a large transaction alert
+LARGE_TRANSACTION_THRESHOLD = 50000
+
+
+class DashboardService:
+    """Service for computing dashboard sections with a fixed number of queries"""
+
+    @staticmethod
+    def cache_key(user_id: int, family_ids: List[int], sections: Iterable[str]) -> str:
+        """
+        Cache key for a user's dashboard sections over a set of families
+
+        Includes the cache epoch and each family's data version, so any write
+        that bumps a version makes older entries unreachable; they then age out
+        by TTL/eviction.
+        """
+        family_ids = sorted(family_ids)
+        versions = cache.get_family_versions(family_ids)
+        scope = ",".join(f"{family_id}.{version}" for family_id, version in zip(family_ids, versions.versions))
+        return f"dashboard:{user_id}:{','.join(sorted(sections))}:{versions.epoch}:{scope}"
+
+    @staticmethod
+    def build(db: Session, family_ids: List[int], sections: Iterable[str]) -> DashboardResponse:
+        """Compute only the requested dashboard sections"""
+        sections = set(sections)
+        response = DashboardResponse()
+
+        if "net_worth" in sections or "allocation" in sections:
+            summaries = NetWorthService.get_summaries(db, family_ids) if family_ids else []
+            net_worth, allocation, last_synced = DashboardService.net_worth(summaries)
+            if "net_worth" in sections:
+                response.net_worth = net_worth
+            if "allocation" in sections:
+                response.asset_allocation = allocation
+            response.last_synced = last_synced
+
+        if "members" in sections:
+            response.member_net_worth = DashboardService.member_net_worth(db, family_ids) if family_ids else []
+
+        if "movers" in sections:
+            # Accounts with largest changes in last 7 days
+            seven_days_ago = datetime.utcnow() - timedelta(days=7)
+            response.top_movers = DashboardService.top_movers(db, family_ids, since=seven_days_ago) if family_ids else []
+
+        if "alerts" in sections:
+            response.alerts = DashboardService.alerts(db, family_ids) if family_ids else []
+
+        return response
+
+    @staticmethod
+    def net_worth(summaries: list) -> Tuple[NetWorthResponse, AssetAllocationResponse, Optional[datetime]]:
+        """Combine per-family summary rows into net worth, allocation and last sync time"""
+        total_assets = Decimal("0")
+        total_liabilities = Decimal("0")
+        asset_breakdown = {}
+        last_synced = None
+
+        for summary in summaries:
+            total_assets += summary.total_assets or Decimal("0")
+            total_liabilities += summary.total_liabilities or Decimal("0")
+
+            for account_type, amount in (summary.allocation or {}).items():
+                asset_breakdown[account_type] = asset_breakdown.get(account_type, Decimal("0")) + Decimal(amount)
+
+            if summary.last_synced_at and (last_synced is None or summary.last_synced_at > last_synced):
+                last_synced = summary.last_synced_at
+
+        total_allocation = sum(asset_breakdown.values()) if asset_breakdown else Decimal("1")
+        allocation_items = []
+        for account_type, amount in asset_breakdown.items():
+            percentage = float((amount / total_allocation * 100)) if total_allocation > 0 else 0.0
+            allocation_items.append(AssetAllocationItem(
+                account_type=account_type,
+                amount=amount,
+                percentage=percentage
+            ))
+
+        net_worth = NetWorthResponse(
+            total_net_worth=total_assets - total_liabilities,
+            total_assets=total_assets,
+            total_liabilities=total_liabilities,
+            last_updated=datetime.utcnow()
+        )
+
+        return net_worth, AssetAllocationResponse(allocation=allocation_items), last_synced
+
+    @staticmethod
+    def alerts(db: Session, family_ids: List[int]) -> List[Alert]:
+        """Due/maturity alerts from account_events plus large transactions in the last day"""
+        # Credit card due and FD maturity alerts from the indexed account_events table
+        alerts = [
+            AccountEventService.to_alert(event, account)
+            for event, account in AccountEventService.upcoming_query(db, family_ids).all()
+        ]
+
+        large_transactions = db.query(Transaction).filter(
+            Transaction.family_id.in_(family_ids),
+            Transaction.transaction_date >= datetime.utcnow() - timedelta(days=1),
+            Transaction.is_active == True,
+            func.abs(Transaction.amount) >= LARGE_TRANSACTION_THRESHOLD
+        ).all()
+
+        for txn in large_transactions:
+            alerts.append(DashboardService.large_transaction_alert(txn))
+
+        return alerts
+
+    @staticmethod
+    def large_transaction_alert(txn: Transaction) -> Alert:
+        """Render a large transaction as a dashboard alert"""
+        return Alert(
+            type="large_transaction",
+            title="Large Transaction",
+            message=f"Large {txn.transaction_type.value} of ₹{abs(txn.amount):,.2f}",
+            account_id=txn.account_id,
+            amount=txn.amount
+        )
+
+    @staticmethod
+    def member_net_worth(db: Session, family_ids: List[int]) -> List[MemberNetWorth]:
+        """
+        Net worth per active family member
+
+        Two queries regardless of family size: active members with their user names,
+        and account totals grouped by (family_id, owner_id).
+        """
+        members = db.query(
+            FamilyMember.family_id,
+            FamilyMember.user_id,
+            User.full_name,
+            User.email
+        ).join(
+            User, FamilyMember.user_id == User.id
+        ).filter(
+            FamilyMember.family_id.in_(family_ids),
+            FamilyMember.is_active == True
+        ).order_by(FamilyMember.id).all()
+
+        totals = db.query(
+            Account.family_id,
+            Account.owner_id,
+            func.sum(func.coalesce(Account.current_balance, 0)),
+            func.count(Account.id)
+        ).filter(
+            Account.family_id.in_(family_ids),
+            Account.is_active == True,
+            Account.status.in_(COUNTED_STATUSES)
+        ).group_by(Account.family_id, Account.owner_id).all()
+
+        totals_by_owner = {
+            (family_id, owner_id): (total, count)
+            for family_id, owner_id, total, count in totals
+        }
+
+        # Keep the caller's family order, members in join order within a family
+        family_order = {family_id: i for i, family_id in enumerate(family_ids)}
+        members = sorted(members, key=lambda m: family_order.get(m.family_id, len(family_order)))
+
+        result = []
+        for member in members:
+            total, count = totals_by_owner.get((member.family_id, member.user_id), (Decimal("0"), 0))
+            result.append(MemberNetWorth(
+                user_id=member.user_id,
+                user_name=member.full_name or member.email,
+                net_worth=total or Decimal("0"),
+                accounts_count=count
+            ))
+
+        return result
+
+    @staticmethod
+    def top_movers(
+        db: Session,
+        family_ids: List[int],
+        since: datetime,
+        limit: int = 5
+    ) -> List[TopMover]:
+        """
+        Accounts with the largest net change since a point in time
+
+        One query: the families' transactions grouped by account_id, joined to the
+        counted accounts for their name and balance, ranked and limited in the database.
+        """
+        change = func.sum(case(
+            (Transaction.transaction_type == TransactionType.CREDIT, Transaction.amount),
+            else_=-Transaction.amount
+        ))
+
+        movement = db.query(
+            Transaction.account_id.label("account_id"),
+            change.label("change_amount")
+        ).filter(
+            Transaction.family_id.in_(family_ids),
+            Transaction.transaction_date >= since,
+            Transaction.is_active == True
+        ).group_by(Transaction.account_id).subquery()
+
+        rows = db.query(
+            Account.id,
+            Account.name,
+            Account.current_balance,
+            movement.c.change_amount
+        ).join(
+            movement, movement.c.account_id == Account.id
+        ).filter(
+            Account.is_active == True,
+            Account.status.in_(COUNTED_STATUSES),
+            movement.c.change_amount != 0
+        ).order_by(
+            func.abs(movement.c.change_amount).desc()
+        ).limit(limit).all()
+
+        result = []
+        for account_id, account_name, current_balance, change_amount in rows:
+            current_balance = current_balance or Decimal("0")
+            change_percentage = float((change_amount / current_balance * 100)) if current_balance > 0 else 0.0
+
+            result.append(TopMover(
+                account_id=account_id,
+                account_name=account_name,
+                change_amount=change_amount,
+                change_percentage=change_percentage,
+                change_type="increase" if change_amount > 0 else "decrease"
+            ))
+
+        return result
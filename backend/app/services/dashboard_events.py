@@ -0,0 +1,56 @@
+"""
+Dashboard event service - turns committed changes into small deltas for SSE listeners
+"""
+
+from typing import Dict, Iterable, Tuple
+from decimal import Decimal
+from sqlalchemy.orm import Session
+
+from app.core.events import event_broker
+from app.models.transaction import Transaction
+from app.services.dashboard import DashboardService, LARGE_TRANSACTION_THRESHOLD
+from app.services.ledger import LedgerService
+
+
+class DashboardEventService:
+    """Service for publishing dashboard deltas after a commit"""
+
+    @staticmethod
+    def publish_changes(
+        db: Session,
+        account_families: Dict[int, int] = None,
+        transactions: Iterable[Transaction] = ()
+    ) -> None:
+        """
+        Publish net worth, mover and alert deltas for what this session just committed
+
+        Net worth changes are collected by NetWorthService.record_change on the
+        session; `account_families` maps the transactions' account ids to family ids.
+        """
+        for family_id, change in db.info.pop("net_worth_changes", {}).items():
+            if change:
+                event_broker.publish(family_id, {"type": "net_worth", "change": change})
+
+        account_families = account_families or {}
+        movements: Dict[Tuple[int, int], Decimal] = {}
+
+        for txn in transactions:
+            family_id = account_families.get(txn.account_id)
+            if family_id is None:
+                continue
+
+            key = (family_id, txn.account_id)
+            delta = LedgerService.balance_delta(txn.transaction_type, txn.amount)
+            movements[key] = movements.get(key, Decimal("0")) + delta
+
+            if abs(txn.amount) >= LARGE_TRANSACTION_THRESHOLD:
+                alert = DashboardService.large_transaction_alert(txn)
+                event_broker.publish(family_id, {"type": "alert", "alert": alert.model_dump(mode="json")})
+
+        for (family_id, account_id), change in movements.items():
+            if change:
+                event_broker.publish(family_id, {
+                    "type": "mover",
+                    "account_id": account_id,
+                    "change_amount": change
+                })
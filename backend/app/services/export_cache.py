@@ -0,0 +1,161 @@
+"""
+Export cache service - generated exports kept on local disk, keyed by their inputs
+"""
+
+from typing import IO, Iterable, Optional
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from app.core.cache import cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMP_PREFIX = ".tmp-"
+
+_lock = threading.Lock()
+
+
+class ExportCacheService:
+    """
+    Service for storing and serving generated export files
+
+    An entry's key is a hash of the endpoint, its filters, the cache epoch and
+    the data versions of the families it covers, so any write to those
+    families moves later requests to a new key. Entries also expire after EXPORT_CACHE_TTL_SECONDS,
+    and the least recently used are evicted past EXPORT_CACHE_MAX_BYTES.
+    """
+
+    @staticmethod
+    def key(endpoint: str, filters: dict, family_ids: Iterable[int]) -> Optional[str]:
+        """
+        Cache key for an export; also used as its ETag
+
+        The epoch and versions are tokens that never repeat, so entries on
+        disk can't be matched again after Redis is reset or evicts them.
+
+        None while Redis is down: entries outlive the outage, and versions kept
+        by one process miss other processes' writes. The export is then
+        generated fresh and sent without an ETag.
+        """
+        family_ids = sorted(set(family_ids))
+        versions = cache.get_family_versions(family_ids)
+        if not versions.shared:
+            return None
+        payload = json.dumps(
+            {
+                "endpoint": endpoint,
+                "filters": {name: str(value) if value is not None else None for name, value in filters.items()},
+                "epoch": versions.epoch,
+                "families": list(zip(family_ids, versions.versions)),
+            },
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def path(key: str) -> str:
+        """Where the entry for `key` is stored"""
+        return os.path.join(settings.EXPORT_CACHE_DIR, key)
+
+    @staticmethod
+    def get(key: str) -> Optional[str]:
+        """Path of a fresh cached file for `key`, marked as just used, or None"""
+        path = ExportCacheService.path(key)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        now = time.time()
+        if now - stat.st_mtime > settings.EXPORT_CACHE_TTL_SECONDS:
+            return None
+
+        # atime records the last use for eviction; mtime stays the creation time
+        try:
+            os.utime(path, (now, stat.st_mtime))
+        except FileNotFoundError:
+            return None
+        return path
+
+    @staticmethod
+    def begin(mode: str = "wb") -> IO:
+        """Open a temporary file in the cache directory to write a new entry into"""
+        os.makedirs(settings.EXPORT_CACHE_DIR, exist_ok=True)
+        kwargs = {"newline": "", "encoding": "utf-8"} if "b" not in mode else {}
+        return tempfile.NamedTemporaryFile(
+            mode, dir=settings.EXPORT_CACHE_DIR, prefix=TEMP_PREFIX, delete=False, **kwargs
+        )
+
+    @staticmethod
+    def commit(key: str, f: IO) -> str:
+        """Publish a file opened with begin() as the entry for `key`"""
+        f.close()
+        path = ExportCacheService.path(key)
+        os.replace(f.name, path)
+        ExportCacheService.evict()
+        return path
+
+    @staticmethod
+    def abort(f: IO) -> None:
+        """Discard a file opened with begin()"""
+        f.close()
+        try:
+            os.remove(f.name)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def put(key: str, data: bytes) -> str:
+        """Store an export that was generated in memory"""
+        f = ExportCacheService.begin()
+        try:
+            f.write(data)
+        except BaseException:
+            ExportCacheService.abort(f)
+            raise
+        return ExportCacheService.commit(key, f)
+
+    @staticmethod
+    def evict() -> None:
+        """Drop expired entries, then the least recently used until under the size limit"""
+        with _lock:
+            now = time.time()
+            entries = []
+            for entry in os.scandir(settings.EXPORT_CACHE_DIR):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                expired = now - stat.st_mtime > settings.EXPORT_CACHE_TTL_SECONDS
+                if entry.name.startswith(TEMP_PREFIX):
+                    # Still being written, unless it was abandoned long ago
+                    if expired:
+                        ExportCacheService._remove(entry.path)
+                    continue
+                if expired:
+                    ExportCacheService._remove(entry.path)
+                    continue
+                entries.append((stat.st_atime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= settings.EXPORT_CACHE_MAX_BYTES:
+                    break
+                ExportCacheService._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove cached export {path}: {e}")
@@ -0,0 +1,307 @@
+"""
+Import job service - runs CSV imports in background threads and records their progress
+"""
+
+from typing import BinaryIO, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.import_job import ImportJob, ImportKind, ImportStatus
+from app.models.user import User
+from app.schemas.transaction import TransactionImportResult
+from app.services.account_import import AccountImportService
+from app.services.transaction_import import TransactionImportService
+
+logger = logging.getLogger(__name__)
+
+# Shared by every request in this process; at most IMPORT_MAX_WORKERS imports run at once
+_executor = ThreadPoolExecutor(max_workers=settings.IMPORT_MAX_WORKERS, thread_name_prefix="import")
+
+# Owner id written on the jobs this process queues or reclaims. Uploads are kept
+# on local disk, so the host part says where a job's file is.
+HOST = socket.gethostname()
+WORKER_ID = f"{HOST}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_lease_thread: Optional[threading.Thread] = None
+_lease_lock = threading.Lock()
+
+ACTIVE_STATUSES = (ImportStatus.QUEUED, ImportStatus.RUNNING)
+
+
+class LeaseLost(Exception):
+    """Another process reclaimed a job this one was running"""
+
+
+def _same(column, value):
+    """Criterion for a column still holding a value read earlier, NULL included"""
+    return column.is_(None) if value is None else column == value
+
+
+def _host(worker_id: Optional[str]) -> Optional[str]:
+    return worker_id.split(":", 1)[0] if worker_id else None
+
+
+class ImportJobService:
+    """
+    Service for queueing and running background imports
+
+    Each queued or running job is owned by one process (worker_id), which keeps
+    a lease on it by refreshing heartbeat_at. Jobs whose lease has run out for
+    IMPORT_JOB_LEASE_SECONDS are taken over by another process.
+    """
+
+    @staticmethod
+    def create(
+        db: Session,
+        user: User,
+        kind: ImportKind,
+        upload: BinaryIO,
+        filename: Optional[str],
+        params: dict
+    ) -> ImportJob:
+        """Store an uploaded file on local disk, record a queued job and schedule it"""
+        os.makedirs(settings.IMPORT_STORAGE_DIR, exist_ok=True)
+        file_path = os.path.join(settings.IMPORT_STORAGE_DIR, f"{uuid.uuid4().hex}.csv")
+        with open(file_path, "wb") as f:
+            shutil.copyfileobj(upload, f)
+
+        job = ImportJob(
+            user_id=user.id,
+            kind=kind,
+            status=ImportStatus.QUEUED,
+            filename=filename,
+            file_path=file_path,
+            params=params,
+            errors=[],
+            worker_id=WORKER_ID,
+            heartbeat_at=datetime.utcnow()
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        _executor.submit(ImportJobService.run, job.id)
+        return job
+
+    @staticmethod
+    def run(job_id: int) -> None:
+        """Process a queued job this process owns, in its own session (called on a worker thread)"""
+        db = SessionLocal()
+        try:
+            # Claim the job in one statement, so a job submitted twice runs once
+            claimed = db.query(ImportJob).filter(
+                ImportJob.id == job_id,
+                ImportJob.status == ImportStatus.QUEUED,
+                ImportJob.worker_id == WORKER_ID
+            ).update(
+                {
+                    "status": ImportStatus.RUNNING,
+                    "started_at": datetime.utcnow(),
+                    "heartbeat_at": datetime.utcnow()
+                },
+                synchronize_session=False
+            )
+            db.commit()
+            if not claimed:
+                return
+
+            job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+
+            values = {"status": ImportStatus.COMPLETED}
+            try:
+                ImportJobService._process(db, job)
+            except LeaseLost:
+                # The new owner finishes the job and removes its file
+                logger.warning(f"Import job {job_id} was reclaimed by another process")
+                db.rollback()
+                return
+            except Exception as e:
+                logger.exception(f"Import job {job_id} failed")
+                db.rollback()
+                values = {"status": ImportStatus.FAILED, "error_message": str(e)}
+
+            values["finished_at"] = datetime.utcnow()
+            finished = db.query(ImportJob).filter(
+                ImportJob.id == job_id,
+                ImportJob.worker_id == WORKER_ID
+            ).update(values, synchronize_session=False)
+            db.commit()
+
+            if finished and job.file_path and os.path.exists(job.file_path):
+                os.remove(job.file_path)
+        finally:
+            db.close()
+
+    @staticmethod
+    def start() -> None:
+        """
+        Reclaim abandoned jobs now, then keep renewing this process's leases and
+        reclaiming expired ones every IMPORT_JOB_HEARTBEAT_SECONDS (call at startup)
+        """
+        global _lease_thread
+        with _lease_lock:
+            if _lease_thread is not None:
+                return
+            _lease_thread = threading.Thread(target=ImportJobService._lease_loop, name="import-leases", daemon=True)
+
+        ImportJobService.reclaim()
+        _lease_thread.start()
+
+    @staticmethod
+    def _lease_loop() -> None:
+        while True:
+            time.sleep(settings.IMPORT_JOB_HEARTBEAT_SECONDS)
+            try:
+                ImportJobService.renew()
+                ImportJobService.reclaim()
+            except Exception:
+                logger.exception("Could not renew or reclaim import jobs")
+
+    @staticmethod
+    def renew() -> None:
+        """Refresh the lease on every unfinished job this process owns"""
+        db = SessionLocal()
+        try:
+            db.query(ImportJob).filter(
+                ImportJob.worker_id == WORKER_ID,
+                ImportJob.status.in_(ACTIVE_STATUSES)
+            ).update({"heartbeat_at": datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def reclaim() -> None:
+        """
+        Take over unfinished jobs whose owner stopped renewing its lease
+
+        Each job is claimed with a conditional UPDATE, so only one process takes
+        it. Queued jobs are scheduled again. Running transaction imports are
+        queued again too; they are idempotent, so rows already committed are
+        skipped. Running account imports are not, and are marked failed, as is
+        any job whose uploaded file is not on this host. Files are only deleted
+        by a process on the host that has them.
+        """
+        expired_before = datetime.utcnow() - timedelta(seconds=settings.IMPORT_JOB_LEASE_SECONDS)
+        db = SessionLocal()
+        queued = []
+        try:
+            jobs = db.query(ImportJob).filter(
+                ImportJob.status.in_(ACTIVE_STATUSES),
+                (ImportJob.heartbeat_at == None) | (ImportJob.heartbeat_at < expired_before)
+            ).order_by(ImportJob.id).all()
+
+            for job in jobs:
+                previous_worker = job.worker_id
+                claimed = db.query(ImportJob).filter(
+                    ImportJob.id == job.id,
+                    ImportJob.status == job.status,
+                    _same(ImportJob.worker_id, previous_worker),
+                    _same(ImportJob.heartbeat_at, job.heartbeat_at)
+                ).update(
+                    {"worker_id": WORKER_ID, "heartbeat_at": datetime.utcnow()},
+                    synchronize_session=False
+                )
+                db.commit()
+                if not claimed:
+                    continue
+
+                # Jobs from before leases existed have no owner; they were local
+                local = _host(previous_worker) in (None, HOST)
+                if not local:
+                    ImportJobService._fail(job, "Import was interrupted on another server; upload the file again", local)
+                elif job.status == ImportStatus.RUNNING and job.kind != ImportKind.TRANSACTIONS:
+                    ImportJobService._fail(job, "Import was interrupted by a server restart; upload the file again", local)
+                elif not job.file_path or not os.path.exists(job.file_path):
+                    ImportJobService._fail(job, "Uploaded file is no longer available; upload it again", local)
+                else:
+                    if job.status == ImportStatus.RUNNING:
+                        # Rows it already committed are skipped; resume refreshes their balance_after
+                        job.params = {**(job.params or {}), "resume": True}
+                    job.status = ImportStatus.QUEUED
+                    queued.append(job.id)
+                db.commit()
+        finally:
+            db.close()
+
+        if jobs:
+            logger.info(f"Reclaimed {len(jobs)} abandoned import jobs, {len(queued)} requeued")
+        for job_id in queued:
+            _executor.submit(ImportJobService.run, job_id)
+
+    @staticmethod
+    def _fail(job: ImportJob, message: str, local: bool) -> None:
+        job.status = ImportStatus.FAILED
+        job.error_message = message
+        job.finished_at = datetime.utcnow()
+        if local and job.file_path and os.path.exists(job.file_path):
+            os.remove(job.file_path)
+
+    @staticmethod
+    def _process(db: Session, job: ImportJob) -> None:
+        user = db.query(User).filter(User.id == job.user_id).first()
+        params = job.params or {}
+
+        with open(job.file_path, "rb") as f:
+            if job.kind == ImportKind.ACCOUNTS:
+                def account_progress(rows: int, imported: int, errors: List[str]):
+                    ImportJobService._record(db, job, rows, imported, 0, len(errors), errors)
+
+                AccountImportService.import_csv(db, f, user, params["family_id"], progress=account_progress)
+            else:
+                def transaction_progress(result: TransactionImportResult):
+                    ImportJobService._record(
+                        db, job, result.rows, result.imported, result.skipped, result.failed, result.errors
+                    )
+
+                result = TransactionImportService.import_csv(
+                    db,
+                    f,
+                    user,
+                    params.get("account_id"),
+                    use_copy=params.get("use_copy", False),
+                    resume=params.get("resume", False),
+                    progress=transaction_progress
+                )
+                # Rows after the last commit (e.g. trailing parse errors)
+                transaction_progress(result)
+
+    @staticmethod
+    def _record(
+        db: Session,
+        job: ImportJob,
+        rows: int,
+        imported: int,
+        skipped: int,
+        failed: int,
+        errors: List[str]
+    ) -> None:
+        """Store progress and renew the lease; raises LeaseLost if the job was reclaimed"""
+        updated = db.query(ImportJob).filter(
+            ImportJob.id == job.id,
+            ImportJob.worker_id == WORKER_ID
+        ).update(
+            {
+                "rows_done": rows,
+                "rows_imported": imported,
+                "rows_skipped": skipped,
+                "rows_failed": failed,
+                "errors": errors[:settings.TRANSACTION_IMPORT_MAX_ERRORS],
+                "heartbeat_at": datetime.utcnow()
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        if not updated:
+            raise LeaseLost()
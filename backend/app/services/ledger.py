@@ -0,0 +1,188 @@
+"""
+Ledger service - writing transactions and how they move account balances
+"""
+
+from typing import List, Optional
+from datetime import datetime
+from decimal import Decimal
+import hashlib
+
+from sqlalchemy import and_, case, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.account import Account
+from app.models.transaction import Transaction, TransactionKey, TransactionType
+from app.services.net_worth import NetWorthService
+from app.services.partitions import TransactionPartitionService
+from app.services.spend_summary import SpendSummaryService
+
+
+class LedgerService:
+    """Service for applying transaction amounts to account balances"""
+
+    @staticmethod
+    def balance_delta(transaction_type: TransactionType, amount) -> Decimal:
+        """Signed change a transaction makes to its account balance"""
+        amount = Decimal(str(amount))
+        if transaction_type == TransactionType.CREDIT:
+            return amount
+        if transaction_type == TransactionType.DEBIT:
+            return -amount
+        return Decimal("0")
+
+    @staticmethod
+    def fingerprint(
+        account_id: int,
+        transaction_date: datetime,
+        amount,
+        transaction_type: TransactionType,
+        description: Optional[str],
+        occurrence: int = 0
+    ) -> str:
+        """
+        Deterministic transaction_id for a transaction without a provider id
+
+        `occurrence` tells apart identical transactions in the same statement
+        (e.g. two equal purchases on one day), so re-importing the statement maps
+        each row back onto the same id.
+        """
+        content = "|".join([
+            str(account_id),
+            transaction_date.isoformat(),
+            str(Decimal(str(amount)).quantize(Decimal("0.01"))),
+            TransactionType(transaction_type).value,
+            (description or "").strip(),
+        ])
+        digest = hashlib.sha256(content.encode()).hexdigest()[:40]
+        return f"fp_{digest}_{occurrence}"
+
+    @staticmethod
+    def family_filter(family_id: int):
+        """
+        Criterion for a family's transactions on its active accounts
+
+        A range scan on ix_transactions_family_date_id rather than an IN list of
+        every account; the rare deactivated accounts are excluded with an anti-join.
+        """
+        return and_(
+            Transaction.family_id == family_id,
+            Transaction.account_id.notin_(
+                select(Account.id).where(Account.family_id == family_id, Account.is_active == False)
+            )
+        )
+
+    @staticmethod
+    def insert_new(db: Session, rows: List[dict]) -> List[dict]:
+        """
+        Insert transaction rows, skipping any whose transaction_id already exists
+
+        Claims the transaction_ids in transaction_keys with INSERT ... ON CONFLICT
+        DO NOTHING RETURNING and inserts only the claimed rows, so a re-import costs
+        two statements per batch. Returns the rows actually inserted, with their new
+        `id` filled in; only those should move balances. Inserted rows are also
+        added to the monthly category rollup.
+        """
+        if not rows:
+            return []
+
+        TransactionPartitionService.ensure(db, [row["transaction_date"] for row in rows])
+
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        keys = TransactionKey.__table__
+        claim = dialect.insert(keys).on_conflict_do_nothing(
+            index_elements=[keys.c.transaction_id]
+        ).returning(keys.c.transaction_id)
+
+        claimed = set(db.execute(claim, [
+            {"transaction_id": row["transaction_id"], "transaction_date": row["transaction_date"]}
+            for row in rows
+        ]).scalars().all())
+
+        new_rows = []
+        for row in rows:
+            # A transaction_id repeated within `rows` is only inserted once
+            if row["transaction_id"] in claimed:
+                claimed.discard(row["transaction_id"])
+                new_rows.append(row)
+        if not new_rows:
+            return []
+
+        table = Transaction.__table__
+        stmt = table.insert().returning(table.c.transaction_id, table.c.id)
+        returned = dict(db.execute(stmt, new_rows).all())
+
+        for row in new_rows:
+            row["id"] = returned[row["transaction_id"]]
+
+        SpendSummaryService.record(db, new_rows)
+        return new_rows
+
+    @staticmethod
+    def apply_balance_change(db: Session, account: Account, delta: Decimal) -> None:
+        """
+        Move an account balance by `delta` and keep the family net worth in step
+
+        A single UPDATE ... SET current_balance = current_balance + delta, so
+        concurrent writers never lose each other's changes and the account row
+        is locked only from here to the caller's commit.
+        """
+        if not delta:
+            return
+
+        new_balance = db.execute(
+            update(Account)
+            .where(Account.id == account.id)
+            .values(current_balance=func.coalesce(Account.current_balance, 0) + delta)
+            .returning(Account.current_balance)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+        set_committed_value(account, "current_balance", new_balance)
+
+        # The balance before is what the database held, not what was loaded earlier
+        after = NetWorthService.snapshot(account)
+        before = after._replace(balance=after.balance - delta) if after else None
+        NetWorthService.record_change(db, before, after)
+
+    @staticmethod
+    def update_balance_after(db: Session, account_id: int, since: datetime) -> None:
+        """
+        Recompute balance_after for an account's transactions dated `since` or later
+
+        Set-based: each row's balance_after is the current balance less the sum of
+        the deltas of every later transaction (a window over transaction_date, id
+        descending). Earlier rows are unaffected by inserts at or after `since`,
+        and the date bound prunes partitions. Call after the balance has moved.
+        """
+        columns = Transaction.__table__.c
+        delta = case(
+            (columns.transaction_type == TransactionType.CREDIT, columns.amount),
+            (columns.transaction_type == TransactionType.DEBIT, -columns.amount),
+            else_=0
+        )
+        later = func.sum(delta).over(
+            partition_by=columns.account_id,
+            order_by=(columns.transaction_date.desc(), columns.id.desc()),
+            rows=(None, -1)
+        )
+        running = select(
+            columns.id,
+            columns.transaction_date,
+            (func.coalesce(Account.current_balance, 0) - func.coalesce(later, 0)).label("balance_after")
+        ).join(
+            Account, Account.id == columns.account_id
+        ).where(
+            columns.account_id == account_id,
+            columns.transaction_date >= since
+        ).subquery()
+
+        db.execute(
+            Transaction.__table__.update()
+            .where(
+                columns.id == running.c.id,
+                columns.transaction_date == running.c.transaction_date
+            )
+            # Derived value, not an edit: leave updated_at alone
+            .values(balance_after=running.c.balance_after, updated_at=columns.updated_at)
+        )
@@ -0,0 +1,187 @@
+"""
+Net worth service - keeps the per-family net worth summary in step with account balances
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import func, case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.account import Account, AccountType, AccountStatus
+from app.models.net_worth import FamilyNetWorth
+
+# Account types whose balance is owed rather than owned
+LIABILITY_TYPES = (AccountType.CREDIT_CARD, AccountType.DEBT)
+
+# Manually created accounts are PENDING until synced but still count towards net worth
+COUNTED_STATUSES = (AccountStatus.LINKED, AccountStatus.PENDING)
+
+
+class AccountState(NamedTuple):
+    """Balance-relevant view of an account at one point in time"""
+    family_id: int
+    account_type: AccountType
+    balance: Decimal
+    last_synced_at: Optional[datetime]
+
+
+class NetWorthService:
+    """Service for maintaining the family_net_worth summary table"""
+
+    @staticmethod
+    def snapshot(account: Account) -> Optional[AccountState]:
+        """
+        Capture what an account contributes to its family's net worth
+
+        Returns None if the account does not count (inactive, errored, disconnected).
+        Call before and after mutating an account and pass both to record_change().
+        """
+        account_status = account.status or AccountStatus.PENDING
+        if account.is_active is False or account_status not in COUNTED_STATUSES:
+            return None
+
+        return AccountState(
+            family_id=account.family_id,
+            account_type=AccountType(account.account_type),
+            balance=Decimal(str(account.current_balance or 0)),
+            last_synced_at=account.last_synced_at
+        )
+
+    @staticmethod
+    def record_change(
+        db: Session,
+        before: Optional[AccountState],
+        after: Optional[AccountState]
+    ) -> None:
+        """
+        Apply the difference between two account states to the family summary
+
+        Runs inside the caller's transaction; the summary row is locked until commit.
+        """
+        if before == after:
+            return
+
+        family_ids = {state.family_id for state in (before, after) if state}
+        for family_id in sorted(family_ids):
+            summary = NetWorthService._lock_summary(db, family_id)
+            if summary is None:
+                # Summary was just rebuilt from the current account rows
+                continue
+
+            assets = Decimal(summary.total_assets or 0)
+            liabilities = Decimal(summary.total_liabilities or 0)
+            allocation = {k: Decimal(v) for k, v in (summary.allocation or {}).items()}
+
+            for state, sign in ((before, -1), (after, 1)):
+                if not state or state.family_id != family_id:
+                    continue
+
+                if state.account_type in LIABILITY_TYPES:
+                    liabilities += sign * abs(state.balance)
+                else:
+                    assets += sign * state.balance
+
+                if state.balance > 0:
+                    key = state.account_type.value
+                    allocation[key] = allocation.get(key, Decimal("0")) + sign * state.balance
+
+            # Remember the net change so it can be published once committed
+            changes = db.info.setdefault("net_worth_changes", {})
+            change = (assets - liabilities) - (Decimal(summary.total_assets or 0) - Decimal(summary.total_liabilities or 0))
+            changes[family_id] = changes.get(family_id, Decimal("0")) + change
+
+            summary.total_assets = assets
+            summary.total_liabilities = liabilities
+            # Reassign rather than mutate so the JSON column is flagged dirty
+            summary.allocation = {k: str(v) for k, v in allocation.items() if v != 0}
+
+            if after and after.family_id == family_id and after.last_synced_at:
+                if not summary.last_synced_at or after.last_synced_at > summary.last_synced_at:
+                    summary.last_synced_at = after.last_synced_at
+
+    @staticmethod
+    def rebuild(db: Session, family_id: int) -> FamilyNetWorth:
+        """Recompute a family summary from its account rows with one aggregate query"""
+        balance = func.coalesce(Account.current_balance, 0)
+        rows = db.query(
+            Account.account_type,
+            func.sum(balance),
+            func.sum(func.abs(balance)),
+            func.sum(case((balance > 0, balance), else_=0)),
+            func.max(Account.last_synced_at)
+        ).filter(
+            Account.family_id == family_id,
+            Account.is_active == True,
+            Account.status.in_(COUNTED_STATUSES)
+        ).group_by(Account.account_type).all()
+
+        assets = Decimal("0")
+        liabilities = Decimal("0")
+        allocation: Dict[str, str] = {}
+        last_synced_at = None
+
+        for account_type, total, total_abs, total_positive, synced_at in rows:
+            if account_type in LIABILITY_TYPES:
+                liabilities += Decimal(total_abs or 0)
+            else:
+                assets += Decimal(total or 0)
+
+            if total_positive:
+                allocation[account_type.value] = str(Decimal(total_positive))
+
+            if synced_at and (last_synced_at is None or synced_at > last_synced_at):
+                last_synced_at = synced_at
+
+        summary = db.query(FamilyNetWorth).filter(
+            FamilyNetWorth.family_id == family_id
+        ).first()
+
+        if not summary:
+            summary = FamilyNetWorth(family_id=family_id)
+            db.add(summary)
+
+        summary.total_assets = assets
+        summary.total_liabilities = liabilities
+        summary.allocation = allocation
+        summary.last_synced_at = last_synced_at
+
+        return summary
+
+    @staticmethod
+    def get_summaries(db: Session, family_ids: List[int]) -> List[FamilyNetWorth]:
+        """Get one summary row per family, backfilling any family that has none yet"""
+        summaries = db.query(FamilyNetWorth).filter(
+            FamilyNetWorth.family_id.in_(family_ids)
+        ).all()
+
+        missing = set(family_ids) - {s.family_id for s in summaries}
+        if not missing:
+            return summaries
+
+        try:
+            for family_id in missing:
+                NetWorthService.rebuild(db, family_id)
+            db.commit()
+        except IntegrityError:
+            # Another request backfilled the same family first
+            db.rollback()
+
+        return db.query(FamilyNetWorth).filter(
+            FamilyNetWorth.family_id.in_(family_ids)
+        ).all()
+
+    @staticmethod
+    def _lock_summary(db: Session, family_id: int) -> Optional[FamilyNetWorth]:
+        """Lock a family summary row for update, rebuilding it if it doesn't exist"""
+        summary = db.query(FamilyNetWorth).filter(
+            FamilyNetWorth.family_id == family_id
+        ).with_for_update().first()
+
+        if summary is None:
+            # Write pending account changes so the rebuild already includes them
+            db.flush()
+            NetWorthService.rebuild(db, family_id)
+
+        return summary
@@ -0,0 +1,190 @@
+"""
+Net worth history service - daily snapshots and downsampled series for charts
+"""
+
+from typing import List, Optional, Tuple
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import func, case
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.account import Account
+from app.models.family import Family
+from app.models.net_worth import NetWorthHistory
+from app.services.net_worth import NetWorthService, LIABILITY_TYPES, COUNTED_STATUSES
+
+
+class NetWorthHistoryService:
+    """Service for recording and reading net worth history"""
+
+    @staticmethod
+    def take_snapshot(db: Session, snapshot_date: Optional[date] = None) -> int:
+        """
+        Record today's family and member totals for every active family
+
+        Idempotent per day: re-running updates that day's rows in place.
+        Returns the number of rows written.
+        """
+        snapshot_date = snapshot_date or date.today()
+
+        family_ids = [f[0] for f in db.query(Family.id).filter(Family.is_active == True).all()]
+        if not family_ids:
+            return 0
+
+        rows = []
+
+        # Family totals come from the maintained summaries
+        for summary in NetWorthService.get_summaries(db, family_ids):
+            assets = summary.total_assets or Decimal("0")
+            liabilities = summary.total_liabilities or Decimal("0")
+            rows.append({
+                "family_id": summary.family_id,
+                "user_id": None,
+                "snapshot_date": snapshot_date,
+                "net_worth": assets - liabilities,
+                "total_assets": assets,
+                "total_liabilities": liabilities,
+            })
+
+        # Member totals in one GROUP BY (family_id, owner_id) query
+        balance = func.coalesce(Account.current_balance, 0)
+        is_liability = Account.account_type.in_(LIABILITY_TYPES)
+        member_totals = db.query(
+            Account.family_id,
+            Account.owner_id,
+            func.sum(case((is_liability, 0), else_=balance)),
+            func.sum(case((is_liability, func.abs(balance)), else_=0))
+        ).filter(
+            Account.family_id.in_(family_ids),
+            Account.is_active == True,
+            Account.status.in_(COUNTED_STATUSES)
+        ).group_by(Account.family_id, Account.owner_id).all()
+
+        for family_id, owner_id, assets, liabilities in member_totals:
+            assets = assets or Decimal("0")
+            liabilities = liabilities or Decimal("0")
+            rows.append({
+                "family_id": family_id,
+                "user_id": owner_id,
+                "snapshot_date": snapshot_date,
+                "net_worth": assets - liabilities,
+                "total_assets": assets,
+                "total_liabilities": liabilities,
+            })
+
+        # Upserts, so runs that overlap still leave one row per key; sorted so
+        # they lock rows in the same order
+        family_rows = sorted((row for row in rows if row["user_id"] is None), key=lambda row: row["family_id"])
+        member_rows = sorted(
+            (row for row in rows if row["user_id"] is not None),
+            key=lambda row: (row["family_id"], row["user_id"])
+        )
+
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        table = NetWorthHistory.__table__
+        for batch, index_elements, index_where in (
+            (family_rows, [table.c.family_id, table.c.snapshot_date], table.c.user_id.is_(None)),
+            (member_rows, [table.c.family_id, table.c.user_id, table.c.snapshot_date], table.c.user_id.isnot(None)),
+        ):
+            if not batch:
+                continue
+            stmt = dialect.insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                index_where=index_where,
+                set_={
+                    column: stmt.excluded[column]
+                    for column in ("net_worth", "total_assets", "total_liabilities")
+                }
+            )
+            db.execute(stmt, batch)
+
+        # Members with no counted accounts any more have no row for the day
+        written = {(row["family_id"], row["user_id"]) for row in rows}
+        stale = [
+            history_id
+            for history_id, family_id, user_id in db.query(
+                NetWorthHistory.id, NetWorthHistory.family_id, NetWorthHistory.user_id
+            ).filter(NetWorthHistory.snapshot_date == snapshot_date)
+            if (family_id, user_id) not in written
+        ]
+        if stale:
+            db.query(NetWorthHistory).filter(NetWorthHistory.id.in_(stale)).delete(synchronize_session=False)
+        db.commit()
+
+        return len(rows)
+
+    @staticmethod
+    def get_series(
+        db: Session,
+        family_id: int,
+        start_date: date,
+        end_date: date,
+        points: int,
+        user_id: Optional[int] = None
+    ) -> List[Tuple[date, Decimal, Decimal, Decimal]]:
+        """
+        Daily (date, net_worth, assets, liabilities) rows for a family or member,
+        downsampled to at most `points` rows
+        """
+        rows = db.query(
+            NetWorthHistory.snapshot_date,
+            NetWorthHistory.net_worth,
+            NetWorthHistory.total_assets,
+            NetWorthHistory.total_liabilities
+        ).filter(
+            NetWorthHistory.family_id == family_id,
+            NetWorthHistory.user_id == user_id if user_id else NetWorthHistory.user_id.is_(None),
+            NetWorthHistory.snapshot_date >= start_date,
+            NetWorthHistory.snapshot_date <= end_date
+        ).order_by(NetWorthHistory.snapshot_date).all()
+
+        return downsample_lttb([tuple(r) for r in rows], points)
+
+
+def downsample_lttb(rows: List[tuple], threshold: int) -> List[tuple]:
+    """
+    Largest-Triangle-Three-Buckets downsampling on (date, value, ...) rows
+
+    Keeps the first and last rows and, from each bucket in between, the row that
+    best preserves the visual shape (peaks and troughs) of the value series.
+    """
+    if threshold >= len(rows) or threshold < 3:
+        return rows
+
+    def x(row):
+        return row[0].toordinal()
+
+    def y(row):
+        return float(row[1])
+
+    sampled = [rows[0]]
+    bucket_size = (len(rows) - 2) / (threshold - 2)
+    previous = rows[0]
+
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        # Average point of the next bucket is the triangle's third vertex
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, len(rows))
+        next_bucket = rows[next_start:next_end] or [rows[-1]]
+        avg_x = sum(x(r) for r in next_bucket) / len(next_bucket)
+        avg_y = sum(y(r) for r in next_bucket) / len(next_bucket)
+
+        best, best_area = None, -1.0
+        for row in rows[start:end]:
+            area = abs(
+                (x(previous) - avg_x) * (y(row) - y(previous))
+                - (x(previous) - x(row)) * (avg_y - y(previous))
+            )
+            if area > best_area:
+                best, best_area = row, area
+
+        sampled.append(best)
+        previous = best
+
+    sampled.append(rows[-1])
+    return sampled
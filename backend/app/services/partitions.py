@@ -0,0 +1,71 @@
+"""
+Partition service - keeps a monthly transactions partition ready before rows arrive
+"""
+
+from typing import Iterable, Set
+from datetime import date
+import logging
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.transaction import PARTITION_MONTHS_AHEAD
+from app.services.spend_summary import month_start
+
+logger = logging.getLogger(__name__)
+
+# Months this process already knows have a partition
+_known_months: Set[date] = set()
+_lock = threading.Lock()
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class TransactionPartitionService:
+    """Service for creating monthly transactions partitions on demand"""
+
+    @staticmethod
+    def ensure(db: Session, dates: Iterable) -> None:
+        """
+        Make sure the partitions these transaction dates fall in exist
+
+        Call before inserting. Partitions are created on a separate autocommit
+        connection so the DDL never holds locks for the rest of the caller's
+        transaction. Failing here is not fatal: rows then land in
+        transactions_default and move once their month's partition is created.
+        """
+        bind = db.get_bind()
+        if bind.dialect.name != "postgresql":
+            return
+
+        with _lock:
+            months = sorted({month_start(d) for d in dates} - _known_months)
+        if not months:
+            return
+
+        try:
+            with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                # Give up rather than queue behind a long lock on the default partition
+                conn.execute(text("SET lock_timeout = '5s'"))
+                for month in months:
+                    conn.execute(text("SELECT ensure_transactions_partition(:month)"), {"month": month})
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not create transactions partitions for {months}: {e}")
+            return
+
+        with _lock:
+            _known_months.update(months)
+
+    @staticmethod
+    def ensure_ahead(db: Session, months_ahead: int = PARTITION_MONTHS_AHEAD) -> None:
+        """Create partitions for the current month and the next `months_ahead` months"""
+        current = month_start(date.today())
+        TransactionPartitionService.ensure(
+            db,
+            [_add_months(current, n) for n in range(months_ahead + 1)]
+        )
@@ -0,0 +1,276 @@
+"""
+PDF report service - renders ReportLab reports in a process pool, off the event loop
+"""
+
+from typing import Callable, List, Optional, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from decimal import Decimal
+from itertools import islice
+import asyncio
+import csv
+import io
+import logging
+import multiprocessing
+import threading
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib import colors
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (name, account type, balance, currency)
+NetWorthRow = Tuple[str, str, Decimal, str]
+# (date, account name, transaction type, amount, category, description)
+TransactionRow = Tuple[str, str, str, Decimal, str, str]
+
+# Started on first use; workers are spawned so they never inherit the API's
+# open database connections or threads
+_executor: Optional[ProcessPoolExecutor] = None
+_pending = 0
+_lock = threading.Lock()
+
+
+class PdfRenderBusy(Exception):
+    """Too many reports are already rendering or queued"""
+
+
+class PdfRenderTimeout(Exception):
+    """A report took longer than PDF_RENDER_TIMEOUT_SECONDS"""
+
+
+SUMMARY_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.lightblue),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('TOPPADDING', (0, 0), (-1, -1), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BACKGROUND', (0, -1), (-1, -1), colors.lightgreen),
+])
+
+
+PAGE_MARGIN = 36
+TRANSACTION_ROW_HEIGHT = 16
+
+TRANSACTIONS_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+])
+
+
+def _header(title: str, generated_at: str) -> list:
+    styles = getSampleStyleSheet()
+    return [
+        Paragraph(title, styles['Title']),
+        Spacer(1, 12),
+        Paragraph(f"Generated on: {generated_at}", styles['Normal']),
+        Spacer(1, 20),
+    ]
+
+
+def _summary(rows: List[List[str]]) -> list:
+    table = Table(rows, colWidths=[200, 200])
+    table.setStyle(SUMMARY_STYLE)
+    return [table, Spacer(1, 20)]
+
+
+def render_net_worth_pdf(
+    rows: Sequence[NetWorthRow],
+    total_assets: Decimal,
+    total_liabilities: Decimal,
+    generated_at: str
+) -> bytes:
+    """Net worth report; runs in a worker process, so it only gets plain values"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    elements = _header("Net Worth Report", generated_at)
+    elements += _summary([
+        ["Total Assets", f"Rs. {total_assets:,.2f}"],
+        ["Total Liabilities", f"Rs. {total_liabilities:,.2f}"],
+        ["Net Worth", f"Rs. {total_assets - total_liabilities:,.2f}"]
+    ])
+
+    # Account details table
+    table_data = [["Account Name", "Account Type", "Balance", "Currency"]]
+    for name, account_type, balance, currency in rows:
+        table_data.append([name, account_type, f"Rs. {balance:,.2f}", currency])
+
+    # Total row
+    table_data.append(["TOTAL", "", f"Rs. {total_assets + total_liabilities:,.2f}", "INR"])
+
+    table = Table(table_data)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -2), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ]))
+    elements.append(table)
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def _transactions_table(rows: List[List[str]]) -> Table:
+    """One page's slice of the transactions table, header row included"""
+    table = Table(
+        [["Date", "Account", "Type", "Amount", "Category", "Description"]] + rows,
+        colWidths=[80, 100, 60, 100, 80, 150],
+        rowHeights=TRANSACTION_ROW_HEIGHT
+    )
+    table.setStyle(TRANSACTIONS_STYLE)
+    return table
+
+
+def _transaction_cells(row: Sequence[str]) -> List[str]:
+    transaction_date, account_name, transaction_type, amount, category, description = row
+    if len(account_name) > 20:
+        account_name = account_name[:17] + "..."
+    if len(description) > 30:
+        description = description[:27] + "..."
+    return [
+        transaction_date,
+        account_name,
+        transaction_type.upper(),
+        f"Rs. {Decimal(amount):,.2f}",
+        category.upper(),
+        description
+    ]
+
+
+def render_transactions_pdf(
+    rows_path: str,
+    output_path: str,
+    total_debit: Decimal,
+    total_credit: Decimal,
+    generated_at: str
+) -> str:
+    """
+    Transactions report, drawn a page at a time; runs in a worker process
+
+    Rows are read from `rows_path`, a CSV of TransactionRow values, one page
+    worth at a time, and each page's table is laid out and drawn on its own,
+    so layout memory depends on the page size and not the number of rows.
+    ReportLab still keeps each finished (compressed) page until the file is
+    saved. Returns `output_path`.
+    """
+    page_width, page_height = letter
+    usable_width = page_width - 2 * PAGE_MARGIN
+    canvas = Canvas(output_path, pagesize=letter, pageCompression=1)
+
+    # First page: title and summary above the first slice of the table
+    top = page_height - PAGE_MARGIN
+    for flowable in _header("Transactions Report", generated_at) + _summary([
+        ["Total Debits", f"Rs. {total_debit:,.2f}"],
+        ["Total Credits", f"Rs. {total_credit:,.2f}"],
+        ["Net Amount", f"Rs. {total_credit - total_debit:,.2f}"]
+    ]):
+        width, height = flowable.wrapOn(canvas, usable_width, top - PAGE_MARGIN)
+        flowable.drawOn(canvas, PAGE_MARGIN + max(usable_width - width, 0) / 2, top - height)
+        top -= height
+
+    page = 1
+    with open(rows_path, newline="") as f:
+        reader = csv.reader(f)
+        while True:
+            # Room left on this page, less the header row
+            capacity = int((top - PAGE_MARGIN) // TRANSACTION_ROW_HEIGHT) - 1
+            chunk = [_transaction_cells(row) for row in islice(reader, capacity)]
+            if not chunk and page > 1:
+                break
+
+            table = _transactions_table(chunk)
+            width, height = table.wrapOn(canvas, usable_width, top - PAGE_MARGIN)
+            table.drawOn(canvas, PAGE_MARGIN + (usable_width - width) / 2, top - height)
+
+            canvas.setFont("Helvetica", 8)
+            canvas.drawRightString(page_width - PAGE_MARGIN, PAGE_MARGIN / 2, f"Page {page}")
+            canvas.showPage()
+
+            if len(chunk) < capacity:
+                break
+            page += 1
+            top = page_height - PAGE_MARGIN
+
+    canvas.save()
+    return output_path
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PDF_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def _release(_future) -> None:
+    global _pending
+    with _lock:
+        _pending -= 1
+
+
+class PdfReportService:
+    """Service for rendering PDF reports without blocking the event loop"""
+
+    @staticmethod
+    async def render(renderer, *args, discard: Optional[Callable] = None):
+        """
+        Run `renderer(*args)` in the PDF process pool and return its result
+
+        Raises PdfRenderBusy when PDF_RENDER_MAX_PENDING reports are already
+        rendering or queued, and PdfRenderTimeout after PDF_RENDER_TIMEOUT_SECONDS.
+        A report that times out while rendering still counts towards the limit
+        until its worker finishes it; `discard` is then called with its result,
+        e.g. to delete the file it wrote.
+        """
+        global _executor, _pending
+        with _lock:
+            if _pending >= settings.PDF_RENDER_MAX_PENDING:
+                raise PdfRenderBusy()
+            try:
+                future = _get_executor().submit(renderer, *args)
+            except BrokenProcessPool:
+                # A worker died; replace the pool and retry once
+                _executor.shutdown(wait=False)
+                _executor = None
+                future = _get_executor().submit(renderer, *args)
+            _pending += 1
+        future.add_done_callback(_release)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=settings.PDF_RENDER_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"{renderer.__name__} timed out after {settings.PDF_RENDER_TIMEOUT_SECONDS}s")
+            if discard:
+                future.add_done_callback(
+                    lambda done: discard(done.result()) if not done.cancelled() and done.exception() is None else None
+                )
+            raise PdfRenderTimeout()
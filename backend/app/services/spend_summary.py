@@ -0,0 +1,223 @@
+"""
+Spend summary service - monthly category rollups and grouped spend totals
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, case
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.account import Account
+from app.models.transaction import Transaction, TransactionType, TransactionCategory, MonthlyCategoryRollup
+
+# Dimensions a summary can be grouped by; "member" is the account owner
+GROUP_BY_FIELDS = ("month", "category", "account", "member")
+
+
+def month_start(value) -> date:
+    """First day of the month a date or datetime falls in"""
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _value(transaction, name: str):
+    """Read a field from a Transaction or from an insert values dict"""
+    if isinstance(transaction, dict):
+        return transaction.get(name)
+    return getattr(transaction, name, None)
+
+
+class SpendSummaryService:
+    """Service for maintaining monthly_category_rollup and summarising spend"""
+
+    @staticmethod
+    def record(db: Session, transactions: Iterable, sign: int = 1) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) transactions from the monthly rollup
+
+        Accepts Transaction objects or insert values dicts. Inactive transactions
+        are never counted, so call with -1 before and +1 after changing a
+        transaction's category or is_active. Runs inside the caller's transaction.
+        """
+        changes: Dict[tuple, Tuple[Decimal, int]] = {}
+        for transaction in transactions:
+            if _value(transaction, "is_active") is False:
+                continue
+
+            key = (
+                _value(transaction, "account_id"),
+                month_start(_value(transaction, "transaction_date")),
+                TransactionCategory(_value(transaction, "category") or TransactionCategory.OTHER),
+                TransactionType(_value(transaction, "transaction_type")),
+            )
+            total, count = changes.get(key, (Decimal("0"), 0))
+            changes[key] = (total + sign * Decimal(str(_value(transaction, "amount"))), count + sign)
+
+        if not changes:
+            return
+
+        # Sorted so concurrent writers lock rollup rows in the same order
+        rows = [
+            {
+                "account_id": account_id,
+                "month": month,
+                "category": category,
+                "transaction_type": transaction_type,
+                "total": total,
+                "count": count,
+            }
+            for (account_id, month, category, transaction_type), (total, count) in sorted(
+                changes.items(), key=lambda item: (item[0][0], item[0][1], item[0][2].value, item[0][3].value)
+            )
+        ]
+
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        table = MonthlyCategoryRollup.__table__
+        stmt = dialect.insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.account_id, table.c.month, table.c.category, table.c.transaction_type],
+            set_={
+                "total": table.c.total + stmt.excluded.total,
+                "count": table.c.count + stmt.excluded.count,
+            }
+        )
+        db.execute(stmt, rows)
+
+    @staticmethod
+    def summarize(
+        db: Session,
+        account_ids,
+        group_by: List[str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[dict]:
+        """
+        Debit and credit totals per group over an inclusive date range
+
+        Whole months come from monthly_category_rollup; only the partial months at
+        either end of the range are aggregated from transactions. `account_ids` is
+        a list or subquery of the accounts to include.
+        """
+        totals: Dict[tuple, List] = {}
+        end = end_date + timedelta(days=1) if end_date else None
+
+        for segment_start, segment_end, month in SpendSummaryService._segments(start_date, end):
+            if month is None:
+                rows = SpendSummaryService._rollup_totals(db, account_ids, group_by, segment_start, segment_end)
+            else:
+                rows = SpendSummaryService._transaction_totals(db, account_ids, group_by, segment_start, segment_end, month)
+
+            for groups, debit, credit, count in rows:
+                key = tuple(groups[field] for field in group_by)
+                entry = totals.setdefault(key, [Decimal("0"), Decimal("0"), 0])
+                entry[0] += Decimal(debit or 0)
+                entry[1] += Decimal(credit or 0)
+                entry[2] += int(count or 0)
+
+        summary = []
+        for key in sorted(totals, key=lambda k: [(v is None, v) for v in k]):
+            debit, credit, count = totals[key]
+            if not count:
+                continue
+            row = dict(zip(group_by, key))
+            row.update(debit_total=debit, credit_total=credit, count=count)
+            summary.append(row)
+        return summary
+
+    @staticmethod
+    def _segments(start: Optional[date], end: Optional[date]) -> List[Tuple[Optional[date], Optional[date], Optional[date]]]:
+        """
+        Split [start, end) into (start, end, month) pieces
+
+        `month` is set for a partial month read from transactions and None for
+        the run of whole months read from the rollup.
+        """
+        segments = []
+        rollup_start = start if start is None or start.day == 1 else _next_month(start)
+        rollup_end = end if end is None or end.day == 1 else month_start(end)
+
+        if start and start.day != 1:
+            head_end = min(_next_month(start), end) if end else _next_month(start)
+            segments.append((start, head_end, month_start(start)))
+
+        if rollup_start is None or rollup_end is None or rollup_start < rollup_end:
+            segments.append((rollup_start, rollup_end, None))
+
+        if end and end.day != 1 and (rollup_start is None or rollup_end >= rollup_start):
+            tail_start = max(start, rollup_end) if start else rollup_end
+            segments.append((tail_start, end, rollup_end))
+
+        return segments
+
+    @staticmethod
+    def _rollup_totals(db: Session, account_ids, group_by: List[str], start: Optional[date], end: Optional[date]):
+        rollup = MonthlyCategoryRollup
+        columns = {
+            "month": rollup.month,
+            "category": rollup.category,
+            "account": rollup.account_id,
+            "member": Account.owner_id,
+        }
+        query = SpendSummaryService._grouped(
+            db, columns, group_by,
+            func.sum(case((rollup.transaction_type == TransactionType.DEBIT, rollup.total), else_=0)),
+            func.sum(case((rollup.transaction_type == TransactionType.CREDIT, rollup.total), else_=0)),
+            func.sum(rollup.count)
+        ).filter(rollup.account_id.in_(account_ids))
+
+        if "member" in group_by:
+            query = query.join(Account, Account.id == rollup.account_id)
+        if start:
+            query = query.filter(rollup.month >= start)
+        if end:
+            query = query.filter(rollup.month < end)
+
+        return [(dict(zip(group_by, row[:-3])),) + tuple(row[-3:]) for row in query.all()]
+
+    @staticmethod
+    def _transaction_totals(db: Session, account_ids, group_by: List[str], start: date, end: date, month: date):
+        columns = {
+            "month": None,
+            "category": Transaction.category,
+            "account": Transaction.account_id,
+            "member": Account.owner_id,
+        }
+        query = SpendSummaryService._grouped(
+            db, columns, group_by,
+            func.sum(case((Transaction.transaction_type == TransactionType.DEBIT, Transaction.amount), else_=0)),
+            func.sum(case((Transaction.transaction_type == TransactionType.CREDIT, Transaction.amount), else_=0)),
+            func.count(Transaction.id)
+        ).filter(
+            Transaction.account_id.in_(account_ids),
+            Transaction.is_active == True,
+            Transaction.transaction_date >= datetime.combine(start, time.min),
+            Transaction.transaction_date < datetime.combine(end, time.min)
+        )
+
+        if "member" in group_by:
+            query = query.join(Account, Account.id == Transaction.account_id)
+
+        # The whole segment lies in one month, so month is filled in here
+        fields = [field for field in group_by if field != "month"]
+        rows = []
+        for row in query.all():
+            groups = dict(zip(fields, row[:-3]))
+            groups["month"] = month
+            if "category" in groups:
+                groups["category"] = groups["category"] or TransactionCategory.OTHER
+            rows.append((groups,) + tuple(row[-3:]))
+        return rows
+
+    @staticmethod
+    def _grouped(db: Session, columns: dict, group_by: List[str], *aggregates):
+        keys = [columns[field] for field in group_by if columns[field] is not None]
+        query = db.query(*keys, *aggregates)
+        if keys:
+            query = query.group_by(*keys)
+        return query
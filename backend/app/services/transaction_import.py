@@ -0,0 +1,563 @@
+"""
+Transaction import service - streams CSV uploads into the database in fixed-size batches
+"""
+
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+import csv
+import io
+import logging
+import tempfile
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.models.account import Account
+from app.models.family import FamilyMember
+from app.models.transaction import Transaction, TransactionType, TransactionCategory
+from app.models.user import User
+from app.schemas.transaction import (
+    TransactionCreate,
+    TransactionImportResult,
+    TransactionBatchItemResult,
+    TransactionBatchResult
+)
+from app.services.categorization import CategorizationService, CategoryMatcher
+from app.services.dashboard_events import DashboardEventService
+from app.services.ledger import LedgerService
+from app.services.partitions import TransactionPartitionService
+
+logger = logging.getLogger(__name__)
+
+
+class RowError(ValueError):
+    """A CSV row that cannot be imported"""
+
+
+class TransactionImportService:
+    """Service for bulk-importing transactions from CSV"""
+
+    @staticmethod
+    def import_csv(
+        db: Session,
+        stream: BinaryIO,
+        user: User,
+        account_id: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        use_copy: bool = False,
+        progress: Optional[Callable[[TransactionImportResult], None]] = None,
+        resume: bool = False
+    ) -> TransactionImportResult:
+        """
+        Import a CSV of transactions, validating and loading rows as they are read
+
+        The upload is decoded incrementally, so memory use does not grow with the
+        file. By default rows are inserted and committed in batches. With `use_copy`
+        (PostgreSQL only) valid rows are streamed into a staging table with COPY and
+        merged into transactions in one statement and one commit. Rows that fail to
+        parse are reported in the result and do not stop the import.
+
+        Rows without a category are labelled by CategorizationService from the
+        family's rules and the built-in ones.
+
+        Imports are idempotent: rows whose transaction_id (or, without one, content
+        fingerprint) already exists are skipped and do not move balances.
+
+        `progress` is called with the running totals after every commit.
+
+        balance_after is refreshed once at the end, and also when the import stops
+        early, for the batches already committed. `resume` is for rerunning an
+        import that was interrupted: its committed rows are now skipped, so
+        balance_after is refreshed from the earliest row of the file instead.
+        """
+        if use_copy:
+            if db.get_bind().dialect.name != "postgresql":
+                raise ValueError("COPY import requires PostgreSQL")
+            importer = _CopyImporter(db, user, account_id)
+        else:
+            importer = _Importer(db, user, account_id, batch_size or settings.TRANSACTION_IMPORT_BATCH_SIZE)
+        importer.progress = progress
+
+        decoded = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+        try:
+            for row_num, row in enumerate(csv.DictReader(decoded), start=2):  # Start at 2 (1 is header)
+                importer.rows += 1
+                try:
+                    values = importer.parse_row(row_num, row)
+                except RowError as e:
+                    importer.error(f"Row {row_num}: {e}")
+                    continue
+                if resume:
+                    importer.track_since({values["account_id"]: values["transaction_date"]})
+                importer.add(row_num, values)
+            importer.finish()
+        finally:
+            # Leave the underlying upload open for its owner to close
+            decoded.detach()
+            if importer.since:
+                # Stopped early: committed batches still need balance_after
+                importer.db.rollback()
+                try:
+                    importer.update_balance_after()
+                except Exception:
+                    logger.exception("Could not refresh balance_after after a failed import")
+                    importer.db.rollback()
+
+        return importer.result()
+
+    @staticmethod
+    def create_batch(db: Session, user: User, items: List[TransactionCreate]) -> TransactionBatchResult:
+        """
+        Create many transactions in one insert and one commit
+
+        Access is checked once per distinct account and each account balance moves
+        once. Items that leave out category are auto-categorized. Items that already exist (same transaction_id or content fingerprint)
+        are reported as "exists"; items for inaccessible accounts, or whose
+        transaction_id is already used on another account, as "error".
+        """
+        importer = _Importer(db, user, None)
+        results: List[Optional[TransactionBatchItemResult]] = [None] * len(items)
+        rows: List[dict] = []
+        row_indexes: List[int] = []
+
+        for index, item in enumerate(items):
+            try:
+                importer.check_access(item.account_id)
+            except RowError as e:
+                results[index] = TransactionBatchItemResult(index=index, status="error", error=str(e))
+                continue
+
+            transaction_id = item.transaction_id or importer.fingerprint_id(
+                item.account_id, item.transaction_date, item.amount, item.transaction_type, item.description
+            )
+
+            rows.append({
+                "account_id": item.account_id,
+                "family_id": importer.accounts[item.account_id].family_id,
+                "transaction_id": transaction_id,
+                "transaction_date": item.transaction_date,
+                "amount": item.amount,
+                "transaction_type": item.transaction_type,
+                # Only auto-categorize when the client left category out
+                "category": item.category if "category" in item.model_fields_set else None,
+                "description": item.description,
+                "merchant_name": item.merchant_name,
+                "transaction_metadata": item.metadata,
+            })
+            row_indexes.append(index)
+
+        CategorizationService.categorize_rows(db, rows, importer.matchers)
+        inserted = LedgerService.insert_new(db, rows)
+
+        # Ids of rows that were already there, in one query; a transaction_id
+        # recorded on another account is an error, not a match
+        existing = {}
+        missing = [row["transaction_id"] for row in rows if "id" not in row]
+        if missing:
+            existing = {
+                transaction_id: (account_id, id)
+                for transaction_id, account_id, id in db.query(
+                    Transaction.transaction_id, Transaction.account_id, Transaction.id
+                ).filter(Transaction.transaction_id.in_(missing)).all()
+            }
+
+        conflicts = 0
+        for index, row in zip(row_indexes, rows):
+            if "id" in row:
+                results[index] = TransactionBatchItemResult(
+                    index=index, status="created", id=row["id"], transaction_id=row["transaction_id"]
+                )
+                continue
+
+            account_id, id = existing.get(row["transaction_id"], (None, None))
+            if account_id != row["account_id"]:
+                conflicts += 1
+                results[index] = TransactionBatchItemResult(
+                    index=index,
+                    status="error",
+                    transaction_id=row["transaction_id"],
+                    error="transaction_id already exists on another account"
+                )
+                continue
+
+            results[index] = TransactionBatchItemResult(
+                index=index, status="exists", id=id, transaction_id=row["transaction_id"]
+            )
+
+        deltas, since = _Importer.changes(inserted)
+        importer.commit(deltas, since, len(inserted), [Transaction(**values) for values in inserted])
+        importer.finish()
+
+        return TransactionBatchResult(
+            created=len(inserted),
+            existing=len(rows) - len(inserted) - conflicts,
+            failed=len(items) - len(rows) + conflicts,
+            results=results
+        )
+
+
+class _Importer:
+    """State for one import run: the access cache, counters and reported errors"""
+
+    def __init__(self, db: Session, user: User, account_id: Optional[int], batch_size: int = 0):
+        self.db = db
+        self.user = user
+        self.account_id = account_id
+        self.batch_size = batch_size
+        self.batch: List[Tuple[int, dict]] = []
+        self.progress: Optional[Callable[[TransactionImportResult], None]] = None
+        self.started = time.monotonic()
+        self.accounts: Dict[int, Account] = {}
+        self.denied: Dict[int, str] = {}
+        # Fingerprint -> times seen in this file, for rows without a transaction_id
+        self.fingerprints: Dict[str, int] = {}
+        # Compiled category rules per family, loaded on first use
+        self.matchers: Dict[int, CategoryMatcher] = {}
+        # Earliest new transaction date per account, for balance_after at the end
+        self.since: Dict[int, datetime] = {}
+        self.rows = 0
+        self.imported = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors: List[str] = []
+
+    def result(self) -> TransactionImportResult:
+        duration = time.monotonic() - self.started
+        return TransactionImportResult(
+            rows=self.rows,
+            imported=self.imported,
+            skipped=self.skipped,
+            failed=self.failed,
+            errors=list(self.errors),
+            duration_seconds=round(duration, 3),
+            rows_per_second=round(self.rows / duration, 1) if duration > 0 else float(self.rows)
+        )
+
+    def error(self, message: str, rows: int = 1) -> None:
+        self.failed += rows
+        if len(self.errors) < settings.TRANSACTION_IMPORT_MAX_ERRORS:
+            self.errors.append(message)
+
+    def parse_row(self, row_num: int, row: dict) -> dict:
+        """Validate one CSV row into insert values for the transactions table"""
+        account_id_str = (row.get('account_id') or '').strip()
+        try:
+            account_id = self.account_id or (int(account_id_str) if account_id_str else None)
+        except ValueError:
+            raise RowError(f"Invalid account_id '{account_id_str}'")
+        if not account_id:
+            raise RowError("Missing account_id")
+
+        self.check_access(account_id)
+
+        date_str = (row.get('date') or '').strip()
+        try:
+            transaction_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        except ValueError:
+            try:
+                transaction_date = datetime.strptime(date_str, '%Y-%m-%d')
+            except ValueError:
+                raise RowError(f"Invalid date format '{date_str}'")
+
+        amount_str = (row.get('amount') or '0').strip()
+        try:
+            amount = Decimal(amount_str)
+        except InvalidOperation:
+            raise RowError(f"Invalid amount '{amount_str}'")
+        if not amount.is_finite():
+            raise RowError(f"Invalid amount '{amount_str}'")
+
+        transaction_type_str = (row.get('type') or 'debit').strip().lower()
+        try:
+            transaction_type = TransactionType(transaction_type_str)
+        except ValueError:
+            raise RowError(f"Invalid transaction type '{transaction_type_str}'")
+
+        # A missing category is filled in by auto-categorization before insert
+        category_str = (row.get('category') or '').strip().lower()
+        try:
+            category = TransactionCategory(category_str) if category_str else None
+        except ValueError:
+            raise RowError(f"Invalid category '{category_str}'")
+
+        description = (row.get('description') or '').strip()
+        transaction_id = (row.get('transaction_id') or '').strip() or self.fingerprint_id(
+            account_id, transaction_date, amount, transaction_type, description
+        )
+
+        return {
+            "account_id": account_id,
+            "family_id": self.accounts[account_id].family_id,
+            "transaction_id": transaction_id,
+            "transaction_date": transaction_date,
+            "amount": amount,
+            "transaction_type": transaction_type,
+            "category": category,
+            "description": description or None,
+        }
+
+    def fingerprint_id(self, *content) -> str:
+        """Fingerprint id for a row without one; identical rows are numbered in order seen"""
+        base = LedgerService.fingerprint(*content)
+        occurrence = self.fingerprints.get(base, 0)
+        self.fingerprints[base] = occurrence + 1
+        return LedgerService.fingerprint(*content, occurrence=occurrence) if occurrence else base
+
+    def check_access(self, account_id: int) -> None:
+        """Check the user can write to an account, querying once per distinct account"""
+        if account_id in self.accounts:
+            return
+        if account_id in self.denied:
+            raise RowError(self.denied[account_id])
+
+        account = self.db.query(Account).filter(Account.id == account_id).first()
+        if not account:
+            self.denied[account_id] = "Account not found"
+            raise RowError(self.denied[account_id])
+
+        member = self.db.query(FamilyMember).filter(
+            FamilyMember.family_id == account.family_id,
+            FamilyMember.user_id == self.user.id,
+            FamilyMember.is_active == True
+        ).first()
+
+        if not member:
+            self.denied[account_id] = "You don't have access to this account"
+            raise RowError(self.denied[account_id])
+
+        self.accounts[account_id] = account
+
+    def add(self, row_num: int, values: dict) -> None:
+        self.batch.append((row_num, values))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def finish(self) -> None:
+        if self.batch:
+            self.flush()
+        self.update_balance_after()
+
+    def update_balance_after(self) -> None:
+        """
+        Refresh balance_after once for the whole import, from each account's
+        earliest new transaction
+
+        Done after the last batch rather than per batch: a statement imported
+        newest-first would otherwise rewrite the same later rows every batch.
+        """
+        if not self.since:
+            return
+        for account_id in sorted(self.since):
+            LedgerService.update_balance_after(self.db, account_id, self.since[account_id])
+        self.db.commit()
+        self.since = {}
+
+    def track_since(self, since: Dict[int, datetime]) -> None:
+        """Lower each account's balance_after refresh point to the given dates"""
+        for account_id, date in since.items():
+            if account_id not in self.since or date < self.since[account_id]:
+                self.since[account_id] = date
+
+    def flush(self) -> None:
+        """Insert the current batch, apply its balance changes and commit"""
+        batch, self.batch = self.batch, []
+        rows = [values for _, values in batch]
+        CategorizationService.categorize_rows(self.db, rows, self.matchers)
+        inserted = LedgerService.insert_new(self.db, rows)
+        # Already imported (or repeated in this file): nothing to change
+        self.skipped += len(batch) - len(inserted)
+
+        deltas, since = self.changes(inserted)
+        self.commit(deltas, since, len(inserted), [Transaction(**values) for values in inserted])
+
+    @staticmethod
+    def changes(inserted: List[dict]) -> Tuple[Dict[int, Decimal], Dict[int, datetime]]:
+        """Balance delta and earliest transaction date per account of inserted rows"""
+        deltas: Dict[int, Decimal] = {}
+        since: Dict[int, datetime] = {}
+        for values in inserted:
+            account_id = values["account_id"]
+            delta = LedgerService.balance_delta(values["transaction_type"], values["amount"])
+            deltas[account_id] = deltas.get(account_id, Decimal("0")) + delta
+            if account_id not in since or values["transaction_date"] < since[account_id]:
+                since[account_id] = values["transaction_date"]
+        return deltas, since
+
+    def commit(
+        self,
+        deltas: Dict[int, Decimal],
+        since: Dict[int, datetime],
+        inserted: int,
+        transactions: List[Transaction]
+    ) -> None:
+        """
+        Apply one balance change per account, commit and notify dashboards
+
+        balance_after is left to update_balance_after() once the import is done.
+        """
+        # Same account order in every writer, so concurrent batches can't deadlock
+        for account_id in sorted(deltas):
+            LedgerService.apply_balance_change(self.db, self.accounts[account_id], deltas[account_id])
+        self.track_since(since)
+
+        self.db.commit()
+        self.imported += inserted
+
+        account_families = {
+            account_id: account.family_id
+            for account_id, account in self.accounts.items()
+            if account_id in deltas
+        }
+        cache.bump_family_version(*account_families.values())
+        DashboardEventService.publish_changes(self.db, account_families, transactions)
+
+        if self.progress:
+            self.progress(self.result())
+
+
+class _CopyImporter(_Importer):
+    """
+    PostgreSQL bulk path: COPY validated rows into a temp staging table, then merge
+
+    Validated rows are spooled to a temporary file (spilling to disk past
+    TRANSACTION_IMPORT_COPY_SPOOL_BYTES) and sent with a single COPY FROM STDIN.
+    """
+
+    STAGING_COLUMNS = (
+        "row_num", "account_id", "family_id", "transaction_id", "transaction_date",
+        "amount", "transaction_type", "category", "description"
+    )
+
+    def __init__(self, db: Session, user: User, account_id: Optional[int]):
+        super().__init__(db, user, account_id)
+        self.spool = tempfile.SpooledTemporaryFile(
+            max_size=settings.TRANSACTION_IMPORT_COPY_SPOOL_BYTES,
+            mode="w+",
+            newline=""
+        )
+        self.writer = csv.writer(self.spool)
+        self.staged = 0
+
+    def add(self, row_num: int, values: dict) -> None:
+        CategorizationService.categorize_rows(self.db, [values], self.matchers)
+        # Enums are stored by name in PostgreSQL; an empty unquoted field is NULL
+        self.writer.writerow([
+            row_num,
+            values["account_id"],
+            values["family_id"],
+            values["transaction_id"],
+            values["transaction_date"].isoformat(sep=" "),
+            values["amount"],
+            values["transaction_type"].name,
+            values["category"].name,
+            values["description"],
+        ])
+        self.staged += 1
+
+    def finish(self) -> None:
+        try:
+            if self.staged:
+                self.load()
+        finally:
+            self.spool.close()
+        self.update_balance_after()
+
+    def load(self) -> None:
+        self.db.execute(text("""
+            CREATE TEMP TABLE transaction_import_staging (
+                row_num integer NOT NULL,
+                account_id integer NOT NULL,
+                family_id integer NOT NULL,
+                transaction_id varchar(255) NOT NULL,
+                transaction_date timestamp NOT NULL,
+                amount numeric(15, 2) NOT NULL,
+                transaction_type text NOT NULL,
+                category text NOT NULL,
+                description text
+            ) ON COMMIT DROP
+        """))
+
+        self.spool.seek(0)
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY transaction_import_staging ({', '.join(self.STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                self.spool
+            )
+        finally:
+            cursor.close()
+
+        months = self.db.execute(text(
+            "SELECT DISTINCT date_trunc('month', transaction_date) FROM transaction_import_staging"
+        )).scalars().all()
+        TransactionPartitionService.ensure(self.db, months)
+
+        columns = Transaction.__table__.c
+        transaction_type = columns.transaction_type.type.name
+        category = columns.category.type.name
+
+        # One set-based insert; the first row wins for transaction_ids repeated in the
+        # file and rows whose transaction_id is already in transaction_keys are skipped.
+        # The inserted rows are rolled up by month in the same statement.
+        totals = self.db.execute(text(f"""
+            WITH staged AS (
+                SELECT DISTINCT ON (transaction_id) *
+                FROM transaction_import_staging
+                ORDER BY transaction_id, row_num
+            ),
+            claimed AS (
+                INSERT INTO transaction_keys (transaction_id, transaction_date)
+                SELECT transaction_id, transaction_date FROM staged
+                ON CONFLICT (transaction_id) DO NOTHING
+                RETURNING transaction_id
+            ),
+            inserted AS (
+                INSERT INTO transactions (
+                    account_id, family_id, transaction_id, transaction_date, amount, currency,
+                    transaction_type, category, description, created_at, updated_at, is_active
+                )
+                SELECT
+                    account_id, family_id, transaction_id, transaction_date, amount, 'INR',
+                    transaction_type::{transaction_type}, category::{category}, description,
+                    now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc', true
+                FROM staged
+                JOIN claimed USING (transaction_id)
+                RETURNING account_id, transaction_date, amount, transaction_type, category
+            ),
+            rolled_up AS (
+                INSERT INTO monthly_category_rollup (account_id, month, category, transaction_type, total, count)
+                SELECT account_id, date_trunc('month', transaction_date)::date, category, transaction_type, sum(amount), count(*)
+                FROM inserted
+                GROUP BY 1, 2, 3, 4
+                ORDER BY 1, 2, 3, 4
+                ON CONFLICT (account_id, month, category, transaction_type) DO UPDATE SET
+                    total = monthly_category_rollup.total + EXCLUDED.total,
+                    count = monthly_category_rollup.count + EXCLUDED.count
+            )
+            SELECT
+                account_id,
+                count(*),
+                sum(CASE transaction_type
+                    WHEN 'CREDIT' THEN amount
+                    WHEN 'DEBIT' THEN -amount
+                    ELSE 0
+                END),
+                min(transaction_date)
+            FROM inserted
+            GROUP BY account_id
+        """)).all()
+
+        inserted = sum(count for _, count, _, _ in totals)
+        self.skipped += self.staged - inserted
+
+        self.commit(
+            {account_id: Decimal(delta) for account_id, _, delta, _ in totals},
+            {account_id: since for account_id, _, _, since in totals},
+            inserted,
+            []
+        )
@@ -0,0 +1,17 @@
+"""
+Backfill account_events from existing account metadata
+Run this once after creating the account_events table
+"""
+
+from app.core.database import SessionLocal
+from app.models import *  # noqa
+from app.services.account_events import AccountEventService
+
+if __name__ == "__main__":
+    print("Backfilling account events...")
+    db = SessionLocal()
+    try:
+        created = AccountEventService.rebuild_all(db)
+    finally:
+        db.close()
+    print(f"Created {created} account events.")
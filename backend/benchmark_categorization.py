@@ -0,0 +1,65 @@
+"""
+Benchmark auto-categorization throughput
+Labels synthetic bank descriptions with the built-in rules plus a set of family rules
+and exits non-zero if fewer than --min-rate descriptions are labelled per second.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from app.models.transaction import TransactionCategory
+from app.services.categorization import BUILTIN_RULES, CategorizationService
+
+TEMPLATES = [
+    "UPI/{ref}/{keyword}/paytm@{bank}",
+    "POS {ref} {keyword} BANGALORE IN",
+    "NEFT-{bank}{ref}-{keyword} PVT LTD",
+    "ACH D- {keyword} {ref}",
+    "IMPS/P2A/{ref}/{name}/{bank}",
+    "Payment to {name} for order {ref}",
+]
+BANKS = ["HDFC", "ICICI", "SBIN", "UTIB", "KKBK"]
+NAMES = ["RAHUL SHARMA", "PRIYA NAIR", "ANIL KUMAR", "MEERA IYER", "VIKRAM SINGH"]
+
+
+def descriptions(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    keywords = [keyword for rules in BUILTIN_RULES.values() for keyword in rules]
+    return [
+        rng.choice(TEMPLATES).format(
+            ref=rng.randrange(10 ** 11, 10 ** 12),
+            keyword=rng.choice(keywords).upper(),
+            bank=rng.choice(BANKS),
+            name=rng.choice(NAMES)
+        )
+        for _ in range(count)
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark auto-categorization throughput")
+    parser.add_argument("--count", type=int, default=200000, help="Descriptions to label")
+    parser.add_argument("--family-rules", type=int, default=200, help="Synthetic family rules to compile in")
+    parser.add_argument("--min-rate", type=float, default=100000, help="Fail below this many descriptions per second")
+    args = parser.parse_args()
+
+    categories = list(TransactionCategory)
+    family_rules = [(f"merchant {n}", categories[n % len(categories)]) for n in range(args.family_rules)]
+
+    started = time.perf_counter()
+    matcher = CategorizationService.build_matcher(family_rules)
+    compiled = time.perf_counter() - started
+    print(f"Compiled {len(matcher.rules)} rules in {compiled * 1000:.1f} ms")
+
+    texts = descriptions(args.count)
+    started = time.perf_counter()
+    labels = matcher.categorize_many(texts)
+    duration = time.perf_counter() - started
+
+    rate = len(texts) / duration
+    labelled = sum(1 for label in labels if label is not None)
+    print(f"Labelled {labelled}/{len(texts)} descriptions in {duration:.2f} s ({rate:,.0f} per second)")
+    if rate < args.min_rate:
+        sys.exit(f"Categorization is below {args.min_rate:,.0f} descriptions per second")
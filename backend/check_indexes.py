@@ -0,0 +1,184 @@
+"""
+Check that the hot list and access-check queries use index scans
+Seeds a throwaway schema on the configured PostgreSQL database, runs EXPLAIN on each
+query shape and rolls everything back. Exits non-zero if a query is not using an index
+or a recent-window transactions query is not pruned to its monthly partitions.
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select, tuple_, text
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import *  # noqa
+from app.models.account import Account
+from app.models.family import FamilyMember
+from app.models.transaction import Transaction
+from app.services.ledger import LedgerService
+
+FAMILIES = 2000
+ACCOUNTS_PER_FAMILY = 5
+TRANSACTIONS_PER_ACCOUNT = 20
+
+SEED_SQL = [
+    """INSERT INTO users (email, phone, hashed_password, is_active)
+       SELECT 'user' || g || '@check.local', 'check' || g, 'x', true
+       FROM generate_series(1, :families) g""",
+    """INSERT INTO families (name, created_by, is_active)
+       SELECT 'family ' || g, g, true
+       FROM generate_series(1, :families) g""",
+    """INSERT INTO family_members (family_id, user_id, role, is_active)
+       SELECT g, g, 'OWNER', true FROM generate_series(1, :families) g
+       UNION ALL
+       SELECT g, g % :families + 1, 'VIEWER', g % 10 <> 0 FROM generate_series(1, :families) g""",
+    """INSERT INTO accounts (family_id, owner_id, name, account_type, provider, status, current_balance, is_active)
+       SELECT g % :families + 1, g % :families + 1, 'account ' || g, 'SAVINGS', 'MANUAL', 'LINKED', 1000, g % 20 <> 0
+       FROM generate_series(1, :accounts) g""",
+    """INSERT INTO transactions (account_id, family_id, transaction_id, transaction_date, amount, transaction_type, category, is_active)
+       SELECT g % :accounts + 1, (g % :accounts + 1) % :families + 1, 'check_' || g, now() - g * interval '7 minutes',
+              10, 'DEBIT', 'OTHER', g % 50 <> 0
+       FROM generate_series(1, :transactions) g""",
+]
+
+
+def query_shapes():
+    """(description, statement, indexes any of which satisfies the check)"""
+    return [
+        (
+            "family access check",
+            select(FamilyMember).where(
+                FamilyMember.family_id == 1,
+                FamilyMember.user_id == 1,
+                FamilyMember.is_active == True
+            ),
+            {"ix_family_members_user_family_active"},
+        ),
+        (
+            "families of a user",
+            select(FamilyMember.family_id).where(FamilyMember.user_id == 1, FamilyMember.is_active == True),
+            {"ix_family_members_user_family_active"},
+        ),
+        (
+            "family members",
+            select(FamilyMember).where(FamilyMember.family_id == 1, FamilyMember.is_active == True),
+            {"ix_family_members_family_active"},
+        ),
+        (
+            "accounts of families",
+            select(Account).where(Account.family_id.in_([1, 2, 3]), Account.is_active == True),
+            {"ix_accounts_family_active"},
+        ),
+        (
+            "account transactions page",
+            select(Transaction).where(
+                Transaction.account_id == 1,
+                Transaction.is_active == True
+            ).order_by(Transaction.transaction_date.desc(), Transaction.id.desc()).limit(50),
+            {"ix_transactions_account_date_id"},
+        ),
+        (
+            "account transactions after cursor",
+            select(Transaction).where(
+                Transaction.account_id == 1,
+                Transaction.is_active == True,
+                tuple_(Transaction.transaction_date, Transaction.id) < tuple_(datetime.utcnow(), 10 ** 9)
+            ).order_by(Transaction.transaction_date.desc(), Transaction.id.desc()).limit(50),
+            {"ix_transactions_account_date_id"},
+        ),
+        (
+            "family transactions page",
+            select(Transaction).where(
+                LedgerService.family_filter(1),
+                Transaction.is_active == True
+            ).order_by(Transaction.transaction_date.desc(), Transaction.id.desc()).limit(50),
+            {"ix_transactions_family_date_id"},
+        ),
+    ]
+
+
+def pruning_shapes():
+    """(description, statement, most transactions partitions the plan may scan)"""
+    return [
+        (
+            "last 7 days",
+            select(Transaction).where(
+                Transaction.transaction_date >= datetime.utcnow() - timedelta(days=7),
+                Transaction.is_active == True
+            ).order_by(Transaction.transaction_date.desc()).limit(50),
+            2,
+        ),
+    ]
+
+
+def scanned_tables(plan: dict) -> set:
+    """Names of every table scanned anywhere in an EXPLAIN (FORMAT JSON) plan"""
+    names = {plan["Relation Name"]} if "Relation Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= scanned_tables(child)
+    return names
+
+
+def used_indexes(plan: dict) -> set:
+    """Names of every index scanned anywhere in an EXPLAIN (FORMAT JSON) plan"""
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= used_indexes(child)
+    return names
+
+
+if __name__ == "__main__":
+    engine = create_engine(settings.DATABASE_URL)
+    if engine.dialect.name != "postgresql":
+        sys.exit("check_indexes.py needs DATABASE_URL to point at PostgreSQL")
+
+    failures = 0
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            # Everything happens in a private schema inside one transaction and is rolled back
+            conn.execute(text("CREATE SCHEMA index_check"))
+            conn.execute(text("SET LOCAL search_path TO index_check"))
+            Base.metadata.create_all(conn)
+
+            print("Seeding...")
+            accounts = FAMILIES * ACCOUNTS_PER_FAMILY
+            for sql in SEED_SQL:
+                conn.execute(text(sql), {
+                    "families": FAMILIES,
+                    "accounts": accounts,
+                    "transactions": accounts * TRANSACTIONS_PER_ACCOUNT,
+                })
+            conn.execute(text("ANALYZE"))
+
+            # Indexes on transactions partitions are reported under their own names
+            parent_indexes = dict(conn.execute(text("""
+                SELECT child.relname, parent.relname
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                WHERE child.relkind = 'i'
+            """)).all())
+
+            def explain(statement) -> dict:
+                compiled = statement.compile(conn, compile_kwargs={"render_postcompile": True})
+                return conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()[0]["Plan"]
+
+            for description, statement, expected in query_shapes():
+                used = {parent_indexes.get(name, name) for name in used_indexes(explain(statement))}
+                ok = bool(used & expected)
+                failures += not ok
+                print(f"{'ok  ' if ok else 'FAIL'} {description}: {', '.join(sorted(used)) or 'no index scan'}")
+
+            for description, statement, max_partitions in pruning_shapes():
+                partitions = {t for t in scanned_tables(explain(statement)) if t.startswith("transactions_")}
+                ok = 0 < len(partitions) <= max_partitions
+                failures += not ok
+                print(f"{'ok  ' if ok else 'FAIL'} {description}: {', '.join(sorted(partitions))}")
+        finally:
+            trans.rollback()
+
+    if failures:
+        sys.exit(f"{failures} queries are not using the expected indexes or partitions")
+    print("All checked queries use index scans and recent windows are pruned.")
@@ -0,0 +1,21 @@
+"""
+Create the monthly transactions partitions for the coming months
+Run this daily (e.g. from cron) so inserts never wait on partition creation
+"""
+
+import sys
+
+from app.core.database import SessionLocal
+from app.models import *  # noqa
+from app.models.transaction import PARTITION_MONTHS_AHEAD
+from app.services.partitions import TransactionPartitionService
+
+if __name__ == "__main__":
+    months_ahead = int(sys.argv[1]) if len(sys.argv) > 1 else PARTITION_MONTHS_AHEAD
+    print(f"Ensuring transactions partitions for the next {months_ahead} months...")
+    db = SessionLocal()
+    try:
+        TransactionPartitionService.ensure_ahead(db, months_ahead)
+    finally:
+        db.close()
+    print("Done.")
@@ -0,0 +1,45 @@
+"""
+Import a transaction CSV from the command line
+Usage: python import_transactions.py <file.csv> <user email> [--account-id ID] [--batch]
+Uses PostgreSQL COPY unless --batch is given; the user must have access to every account in the file
+"""
+
+import argparse
+import sys
+
+from app.core.database import SessionLocal
+from app.models import *  # noqa
+from app.models.user import User
+from app.services.transaction_import import TransactionImportService
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import transactions from a CSV file")
+    parser.add_argument("path", help="CSV file with account_id, date, amount, type, category, description, transaction_id")
+    parser.add_argument("email", help="Email of the user the import runs as")
+    parser.add_argument("--account-id", type=int, default=None, help="Import every row into this account")
+    parser.add_argument("--batch", action="store_true", help="Use batched inserts instead of COPY")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == args.email).first()
+        if not user:
+            sys.exit(f"No user with email {args.email}")
+
+        print(f"Importing {args.path} as {user.email}...")
+        with open(args.path, "rb") as f:
+            result = TransactionImportService.import_csv(
+                db,
+                f,
+                user,
+                args.account_id,
+                use_copy=not args.batch
+            )
+    finally:
+        db.close()
+
+    print(f"Imported {result.imported} of {result.rows} rows ({result.skipped} already present) in {result.duration_seconds}s ({result.rows_per_second} rows/s).")
+    for error in result.errors:
+        print(f"  {error}")
+    if result.failed > len(result.errors):
+        print(f"  ... and {result.failed - len(result.errors)} more errors")
@@ -1,13 +1,30 @@
 """
 Initialize database - create all tables
 Run this script to create the database schema
+
+An existing database is migrated to the latest Alembic revision first, so
+create_all only adds tables no migration covers. A new database gets the full
+schema from create_all and is stamped at the latest revision.
 """
 
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
 from app.core.database import Base, engine
 from app.models import *  # noqa
 
 if __name__ == "__main__":
+    alembic_cfg = Config("alembic.ini")
+    existing = inspect(engine).has_table("transactions")
+
+    if existing:
+        print("Running database migrations...")
+        command.upgrade(alembic_cfg, "head")
+
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
 
+    if not existing:
+        command.stamp(alembic_cfg, "head")
+    print("Database tables created successfully!")
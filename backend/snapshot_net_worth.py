@@ -0,0 +1,21 @@
+"""
+Record the daily net worth snapshot for every family
+Run this once a day (e.g. from cron) to build the dashboard history
+"""
+
+import sys
+from datetime import date
+
+from app.core.database import SessionLocal
+from app.models import *  # noqa
+from app.services.net_worth_history import NetWorthHistoryService
+
+if __name__ == "__main__":
+    snapshot_date = date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else date.today()
+    print(f"Recording net worth snapshot for {snapshot_date}...")
+    db = SessionLocal()
+    try:
+        rows = NetWorthHistoryService.take_snapshot(db, snapshot_date)
+    finally:
+        db.close()
+    print(f"Recorded {rows} history rows.")
@@ -0,0 +1,30 @@
+"""
+Keyword rules are matched wherever they occur, overlapping matches included
+"""
+
+import pytest
+
+from app.models.transaction import TransactionCategory
+from app.services.categorization import CategorizationService
+
+
+@pytest.mark.parametrize("family_rule, text, expected", [
+    # The built-in "hp gas" overlaps the family rule
+    ("gas station", "HP GAS STATION", TransactionCategory.TRANSPORT),
+    # The built-in "paytm money" starts at the same word as the family rule
+    ("money transfer", "paytm money transfer", TransactionCategory.TRANSFER),
+    # A family rule that is a shorter prefix of a built-in keyword
+    ("paytm", "PAYTM MONEY SIP", TransactionCategory.SHOPPING),
+])
+def test_family_rule_wins_over_overlapping_builtin(family_rule, text, expected):
+    matcher = CategorizationService.build_matcher([(family_rule, expected)])
+
+    assert matcher.categorize(text) == expected
+
+
+def test_builtin_rules_rank_by_category_order():
+    matcher = CategorizationService.build_matcher()
+
+    assert matcher.categorize("NEFT SALARY ACME") == TransactionCategory.SALARY
+    assert matcher.categorize("HP GAS STATION") == TransactionCategory.BILLS
+    assert matcher.categorize("hpgas") is None
@@ -0,0 +1,151 @@
+"""
+The dashboard issues the same number of queries whatever the family size
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models import *  # noqa
+from app.models.user import User
+from app.models.family import Family, FamilyMember, FamilyRole
+from app.models.account import Account, AccountEvent, AccountEventType, AccountStatus, AccountType
+from app.models.transaction import Transaction, TransactionType
+from app.services.dashboard import DASHBOARD_SECTIONS, DashboardService
+
+# transactions is partitioned in PostgreSQL, with (id, transaction_date) as its
+# key; SQLite can't autoincrement a composite key, so it gets a plain table here
+TRANSACTIONS_DDL = """
+CREATE TABLE transactions (
+    id INTEGER PRIMARY KEY,
+    account_id INTEGER NOT NULL REFERENCES accounts (id),
+    family_id INTEGER NOT NULL REFERENCES families (id),
+    transaction_id VARCHAR(255) NOT NULL,
+    transaction_date DATETIME NOT NULL,
+    amount NUMERIC(15, 2) NOT NULL,
+    currency VARCHAR(3),
+    transaction_type VARCHAR(6) NOT NULL,
+    category VARCHAR(13),
+    description TEXT,
+    merchant_name VARCHAR(255),
+    reference_number VARCHAR(255),
+    balance_after NUMERIC(15, 2),
+    transaction_metadata TEXT,
+    search_vector TEXT,
+    created_at DATETIME,
+    updated_at DATETIME,
+    is_active BOOLEAN
+)
+"""
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[table for table in Base.metadata.sorted_tables if table.name != "transactions"]
+    )
+    with engine.begin() as conn:
+        conn.exec_driver_sql(TRANSACTIONS_DDL)
+
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _create_family(db, name: str, members: int, accounts_per_member: int) -> int:
+    """A family whose every account has a recent transaction, a large one and a due date"""
+    now = datetime.utcnow()
+    users = [
+        User(email=f"{name}-{i}@example.com", phone=f"{name}-{i}", hashed_password="x", full_name=f"{name} {i}")
+        for i in range(members)
+    ]
+    db.add_all(users)
+    db.flush()
+
+    family = Family(name=name, created_by=users[0].id)
+    db.add(family)
+    db.flush()
+
+    for i, user in enumerate(users):
+        db.add(FamilyMember(
+            family_id=family.id,
+            user_id=user.id,
+            role=FamilyRole.OWNER if i == 0 else FamilyRole.VIEWER
+        ))
+        for j in range(accounts_per_member):
+            account = Account(
+                family_id=family.id,
+                owner_id=user.id,
+                name=f"{name} card {i}.{j}",
+                account_type=AccountType.CREDIT_CARD,
+                status=AccountStatus.LINKED,
+                current_balance=Decimal("100000")
+            )
+            db.add(account)
+            db.flush()
+
+            db.add(AccountEvent(
+                account_id=account.id,
+                family_id=family.id,
+                event_type=AccountEventType.CREDIT_CARD_DUE,
+                event_date=now + timedelta(days=2)
+            ))
+            for k, (amount, days_ago) in enumerate(((Decimal("500"), 3), (Decimal("75000"), 0))):
+                db.add(Transaction(
+                    account_id=account.id,
+                    family_id=family.id,
+                    transaction_id=f"{name}-{account.id}-{k}",
+                    transaction_date=now - timedelta(days=days_ago, hours=1),
+                    amount=amount,
+                    transaction_type=TransactionType.DEBIT
+                ))
+
+    db.commit()
+    return family.id
+
+
+def _count_queries(db, family_ids) -> int:
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        response = DashboardService.build(db, family_ids, DASHBOARD_SECTIONS)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert response.member_net_worth
+    assert response.top_movers
+    assert response.alerts
+    return len(statements)
+
+
+def test_dashboard_query_count_does_not_grow_with_family_size(db):
+    small = _create_family(db, "small", members=1, accounts_per_member=1)
+    large = _create_family(db, "large", members=10, accounts_per_member=3)
+
+    # The first build backfills each family's net worth summary
+    DashboardService.build(db, [small, large], DASHBOARD_SECTIONS)
+
+    small_queries = _count_queries(db, [small])
+    large_queries = _count_queries(db, [large])
+    both_queries = _count_queries(db, [small, large])
+
+    assert small_queries == large_queries == both_queries
@@ -1,5 +1,5 @@
-import { useState } from 'react'
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useEffect, useRef, useState } from 'react'
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { api } from '../lib/api'
 import { format } from 'date-fns'
 import toast from 'react-hot-toast'
@@ -32,13 +32,38 @@ export default function Transactions() {
     },
   })
 
-  const { data, isLoading } = useQuery({
+  const {
+    data: pages,
+    isLoading,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
     queryKey: ['transactions'],
-    queryFn: async () => {
-      const response = await api.get('/transactions?limit=50')
-      return response.data
+    queryFn: async ({ pageParam }) => {
+      const response = await api.get('/transactions', {
+        params: { limit: 50, cursor: pageParam },
+      })
+      return response.data as { items: any[]; next_cursor: string | null }
     },
+    initialPageParam: '',
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
   })
+  const data = pages?.pages.flatMap((page) => page.items)
+
+  // Load the next page when the sentinel below the grid scrolls into view
+  const loadMoreRef = useRef<HTMLDivElement>(null)
+  useEffect(() => {
+    const sentinel = loadMoreRef.current
+    if (!sentinel || !hasNextPage) return
+    const observer = new IntersectionObserver((entries) => {
+      if (entries[0].isIntersecting && !isFetchingNextPage) {
+        fetchNextPage()
+      }
+    }, { rootMargin: '200px' })
+    observer.observe(sentinel)
+    return () => observer.disconnect()
+  }, [hasNextPage, isFetchingNextPage, fetchNextPage])
 
   const createTransactionMutation = useMutation({
     mutationFn: async (transactionData: any) => {
@@ -76,11 +101,14 @@ export default function Transactions() {
       })
       return response.data
     },
-    onSuccess: () => {
+    onSuccess: (data) => {
       queryClient.invalidateQueries({ queryKey: ['transactions'] })
       queryClient.invalidateQueries({ queryKey: ['accounts'] })
       queryClient.invalidateQueries({ queryKey: ['dashboard'] })
-      toast.success('CSV imported successfully')
+      toast.success(`Imported ${data.imported} of ${data.rows} transactions${data.skipped ? ` (${data.skipped} already imported)` : ''}`)
+      if (data.failed > 0) {
+        toast.error(`${data.failed} rows failed: ${data.errors[0]}`)
+      }
       setShowCSVUpload(false)
     },
     onError: (error: any) => {
@@ -473,7 +501,7 @@ export default function Transactions() {
                 All Transactions
               </h2>
               <p className="text-sidebar-foreground/70 text-sm mt-1">
-                {data?.length || 0} transaction{data?.length !== 1 ? 's' : ''}
+                {data?.length || 0}{hasNextPage ? '+' : ''} transaction{data?.length !== 1 ? 's' : ''}
               </p>
             </div>
           </div>
@@ -520,6 +548,9 @@ export default function Transactions() {
                   )
                 })}
               </div>
+              <div ref={loadMoreRef} className="flex justify-center pt-4">
+                {isFetchingNextPage && <Loader2 className="h-5 w-5 animate-spin text-muted-foreground" />}
+              </div>
             </div>
           ) : (
             <div className="p-12 text-center">